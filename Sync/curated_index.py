@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Cached index of Curated-Context front-matter and wikilinks.
+
+Syncs that need the vault (team membership, GitHub handles, ...) read it
+through this index instead of opening and YAML-parsing stubs on every run.
+Each markdown file's entry is keyed by its path relative to
+Curated-Context and records:
+
+    mtime_ns, size   Stat of the file when it was parsed
+    front_matter     Parsed YAML front-matter (dates as ISO strings)
+    links            Every [[wikilink]] target, in order (alias and heading dropped)
+    sections         [heading, targets] per "## Heading", in document order;
+                     targets is the first wikilink of each line, up to any alias
+
+The index is persisted to Synced-Data/_curated_index.json. refresh() stats
+every file and re-parses only those whose mtime or size changed, so a run
+over an unchanged vault opens no stubs at all. Lookups by path are
+dictionary reads.
+"""
+
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from utils import CURATED_DIR, DATA_DIR, load_json, save_json
+
+INDEX_FILE = DATA_DIR / "_curated_index.json"
+
+# Bump when the shape of an entry changes, to force a full re-parse
+INDEX_VERSION = 2
+
+WIKILINK_RE = re.compile(r"\[\[([^\]|#]+)")
+
+# Section entries keep a "#Heading" suffix, as team stubs were always read
+SECTION_LINK_RE = re.compile(r"\[\[([^\]|]+)")
+
+# libyaml's loader when PyYAML was built with it; same results, several times faster
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def parse_front_matter(text: str) -> dict[str, Any]:
+    """Parse YAML front-matter from a markdown file."""
+    text = text.strip()
+    if not text.startswith("---"):
+        return {}
+    parts = text.split("---", 2)
+    if len(parts) < 3:
+        return {}
+    try:
+        return yaml.load(parts[1], Loader=YAML_LOADER) or {}
+    except yaml.YAMLError:
+        return {}
+
+
+def _json_safe(value: Any) -> Any:
+    """Convert YAML dates (and dates nested in lists/dicts) to ISO strings."""
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_json_safe(v) for v in value]
+    return value
+
+
+def parse_markdown(text: str) -> dict[str, Any]:
+    """Extract the indexed fields (front_matter, links, sections) from a markdown file."""
+    front_matter = parse_front_matter(text)
+    if not isinstance(front_matter, dict):
+        front_matter = {}
+    links: list[str] = []
+    sections: list[tuple[str, list[str]]] = []
+    section: list[str] | None = None
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("## "):
+            section = []
+            sections.append((stripped[3:].strip(), section))
+            continue
+        links.extend(t.strip() for t in WIKILINK_RE.findall(line))
+        if section is not None:
+            match = SECTION_LINK_RE.search(line)
+            if match:
+                section.append(match.group(1).strip())
+    return {"front_matter": _json_safe(front_matter), "links": links, "sections": sections}
+
+
+class CuratedIndex:
+    """Front-matter and wikilinks of every Curated-Context markdown file, cached by mtime."""
+
+    def __init__(self, root: Path | None = None, index_path: Path | None = None):
+        self.root = root or CURATED_DIR
+        self.index_path = index_path or INDEX_FILE
+        self.entries: dict[str, dict[str, Any]] = {}
+        if self.index_path.exists():
+            cached = load_json(self.index_path)
+            if cached.get("version") == INDEX_VERSION and cached.get("root") == str(self.root):
+                self.entries = cached.get("entries", {})
+        self.parsed = self.removed = 0
+
+    def _scan(self) -> dict[str, os.stat_result]:
+        """Stat every markdown file under root, skipping hidden directories."""
+        found: dict[str, os.stat_result] = {}
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                listing = os.scandir(directory)
+            except FileNotFoundError:
+                continue
+            with listing:
+                for entry in listing:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir():
+                        stack.append(Path(entry.path))
+                    elif entry.name.endswith(".md"):
+                        rel = Path(entry.path).relative_to(self.root).as_posix()
+                        found[rel] = entry.stat()
+        return found
+
+    def refresh(self) -> "CuratedIndex":
+        """Re-parse new and changed files, drop deleted ones, and save if anything changed."""
+        found = self._scan()
+        for rel in set(self.entries) - set(found):
+            del self.entries[rel]
+            self.removed += 1
+        for rel, stat in found.items():
+            entry = self.entries.get(rel)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                continue
+            try:
+                text = (self.root / rel).read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                # Deleted or unreadable since the scan; the next refresh picks it up
+                if self.entries.pop(rel, None) is not None:
+                    self.removed += 1
+                continue
+            self.entries[rel] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                                 **parse_markdown(text)}
+            self.parsed += 1
+        if self.parsed or self.removed:
+            self.save()
+        return self
+
+    def save(self) -> None:
+        """Write the index."""
+        save_json({
+            "version": INDEX_VERSION,
+            "root": str(self.root),
+            "entries": dict(sorted(self.entries.items())),
+        }, self.index_path, machine=True)
+
+    def get(self, rel_path: str) -> dict[str, Any] | None:
+        """Return the entry for a file (path relative to Curated-Context), or None."""
+        return self.entries.get(rel_path)
+
+    def front_matter(self, rel_path: str) -> dict[str, Any] | None:
+        """Return a file's front-matter, or None if the file isn't in the vault."""
+        entry = self.entries.get(rel_path)
+        return entry["front_matter"] if entry else None
+
+    def team_members(self, team_name: str) -> list[str] | None:
+        """
+        Member names listed in Teams/{team_name}.md from the first heading
+        starting "## Members" (e.g. "## Members (5)") to the next other "## "
+        heading; None if there's no stub.
+        """
+        entry = self.entries.get(f"Teams/{team_name}.md")
+        if not entry:
+            return None
+        members: list[str] = []
+        started = False
+        for heading, targets in entry["sections"]:
+            if heading.startswith("Members"):
+                started = True
+                members.extend(targets)
+            elif started:
+                break
+        return members
+
+    def person(self, name: str) -> dict[str, Any] | None:
+        """Front-matter of People/{name}.md, or None if there's no stub."""
+        return self.front_matter(f"People/{name}.md")
+
+    def report(self) -> str:
+        """Summarise what refresh() did."""
+        return (f"Curated index: {len(self.entries)} files, "
+                f"{self.parsed} parsed, {self.removed} removed")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Local store of merged GitHub PRs.
+
+The per-PR JSON files written by sync_github.py are kept between runs and
+patched incrementally, with a watermark per member in _meta.json:
+
+    Synced-Data/GitHub/
+    ├── _meta.json              # Org, teams and per-member watermarks
+    ├── index.json              # Lookback window, rendered from the store
+    ├── INDEX.md                # Lookback window, rendered from the store
+    └── pull-requests/
+        └── {owner_repo}_{N}.json   # One merged PR per file, keyed by repo and number
+
+Each member's watermark records the UTC date of their last successful
+fetch and the earliest merge date the store fully covers for them. Later
+runs search only `merged:>=watermark` (the watermark day itself is
+searched again, and re-fetched PRs replace their stored copies). A member
+without a watermark, or whose coverage starts after the requested
+lookback, gets the whole window fetched.
+
+index.json and INDEX.md are a render-time view over the store: PRs merged
+within the lookback by current team members, with author names and teams
+taken from the current Curated-Context stubs. PRs merged before the
+retention cutoff are evicted.
+"""
+
+from pathlib import Path
+from typing import Any
+
+from utils import load_json, save_json
+
+META_FILE = "_meta.json"
+PR_DIR = "pull-requests"
+
+
+def pr_key(pr: dict[str, Any]) -> str:
+    """Store key (and file stem) of a PR: owner_repo_number."""
+    return f"{pr['repo'].replace('/', '_')}_{pr['number']}"
+
+
+def merged_date(pr: dict[str, Any]) -> str:
+    """UTC date (YYYY-MM-DD) a PR was merged."""
+    return (pr.get("merged_at") or "")[:10]
+
+
+class GitHubPRStore:
+    """Merged PRs on disk, with per-member fetch watermarks."""
+
+    def __init__(self, github_dir: Path):
+        self.github_dir = github_dir
+        self.pr_dir = github_dir / PR_DIR
+        self.meta_path = github_dir / META_FILE
+        self.meta: dict[str, Any] = {}
+        if self.meta_path.exists():
+            self.meta = load_json(self.meta_path)
+        self.watermarks: dict[str, dict[str, str]] = self.meta.get("watermarks", {})
+        self.prs: dict[str, dict[str, Any]] = {}
+        if self.pr_dir.exists():
+            for path in self.pr_dir.glob("*.json"):
+                self.prs[path.stem] = load_json(path)
+
+    def fetch_since(self, handle: str, cutoff_date: str) -> str:
+        """Return the merge date to search from for handle, given the lookback cutoff."""
+        state = self.watermarks.get(handle.lower())
+        if state and state["since"] <= cutoff_date:
+            return max(state["watermark"], cutoff_date)
+        return cutoff_date
+
+    def advance(self, handle: str, cutoff_date: str, synced_date: str) -> None:
+        """Record a successful fetch for handle covering cutoff_date through synced_date."""
+        key = handle.lower()
+        state = self.watermarks.get(key)
+        since = state["since"] if state and state["since"] <= cutoff_date else cutoff_date
+        self.watermarks[key] = {"since": since, "watermark": synced_date}
+
+    def put(self, pr: dict[str, Any]) -> bool:
+        """Add or replace a PR and write its file; return True if it wasn't stored before."""
+        key = pr_key(pr)
+        is_new = key not in self.prs
+        self.prs[key] = pr
+        save_json(pr, self.pr_dir / f"{key}.json", machine=True)
+        return is_new
+
+    def clear(self) -> None:
+        """Drop every PR and watermark (e.g. the org changed)."""
+        for key in list(self.prs):
+            (self.pr_dir / f"{key}.json").unlink(missing_ok=True)
+        self.prs.clear()
+        self.watermarks.clear()
+
+    def evict_before(self, retention_date: str) -> int:
+        """
+        Remove PRs merged before retention_date and clamp coverage to it.
+
+        Watermarks older than retention_date are dropped. Returns the number
+        of PRs removed.
+        """
+        stale = [key for key, pr in self.prs.items() if merged_date(pr) < retention_date]
+        for key in stale:
+            del self.prs[key]
+            (self.pr_dir / f"{key}.json").unlink(missing_ok=True)
+        for handle, state in list(self.watermarks.items()):
+            if state["watermark"] < retention_date:
+                del self.watermarks[handle]
+            else:
+                state["since"] = max(state["since"], retention_date)
+        return len(stale)
+
+    def window(self, cutoff_date: str,
+               members: dict[str, dict[str, str]]) -> list[dict[str, Any]]:
+        """
+        Return stored PRs merged on or after cutoff_date by members, newest first.
+
+        members maps lowercased GitHub handles to {"name", "team"}; each
+        returned PR carries the member's current author_name and team.
+        """
+        prs = []
+        for pr in self.prs.values():
+            member = members.get(pr.get("author", "").lower())
+            if member and merged_date(pr) >= cutoff_date:
+                prs.append({**pr, "author_name": member["name"], "team": member["team"]})
+        # Full key so ties render in the same order whatever order files load in
+        prs.sort(key=lambda p: (p.get("merged_at") or "", p["repo"], p["number"]), reverse=True)
+        return prs
+
+    def save(self, **meta: Any) -> None:
+        """Update _meta.json with meta and the watermarks."""
+        self.meta.update(meta)
+        self.meta["watermarks"] = dict(sorted(self.watermarks.items()))
+        save_json(self.meta, self.meta_path)
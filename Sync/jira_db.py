@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Optional SQLite database of synced Jira issues.
+
+When `jira.database` is enabled in config.json, sync_jira.py mirrors every
+issue it stores into Synced-Data/Jira/issues.db alongside the per-issue
+JSON files, so questions like "in-progress epics assigned to X" are one
+indexed query instead of a scan over thousands of files:
+
+    issues      One row per issue; status, status_category, assignee,
+                level, parent and updated are indexed. `data` holds the
+                full parsed issue as written to issues/KEY.json.
+    comments    One row per comment
+    links       One row per issue link (both directions, as parsed)
+    labels      One row per issue label
+    issues_fts  FTS5 index over summary, description and comment bodies
+
+The parent graph is the issues.parent column; subtree() walks it with a
+recursive query. The database is rebuilt from the JSON files whenever its
+schema version changes or it falls out of step with the file store, so it
+can be deleted at any time. If SQLite was built without FTS5, search
+falls back to substring matching.
+
+Usage:
+    python jira_db.py search TEXT [--limit N]
+    python jira_db.py list [--status S] [--category C] [--assignee NAME]
+                           [--type T] [--level N] [--parent KEY] [--label L]
+                           [--updated-since DATE] [--limit N]
+    python jira_db.py show KEY
+    python jira_db.py tree KEY [--depth N]
+    python jira_db.py rebuild
+
+Add --json to print results as JSON.
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from utils import JIRA_DIR, json_dumps, json_loads, load_json
+
+DB_FILE = "issues.db"
+
+# Bump when the schema or the columns derived from parsed issues change
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE issues (
+    key TEXT PRIMARY KEY,
+    id TEXT,
+    project TEXT,
+    summary TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    status TEXT COLLATE NOCASE,
+    status_category TEXT COLLATE NOCASE,
+    issue_type TEXT COLLATE NOCASE,
+    priority TEXT,
+    assignee TEXT COLLATE NOCASE,
+    assignee_account_id TEXT,
+    reporter TEXT,
+    created TEXT,
+    updated TEXT,
+    resolved TEXT,
+    level INTEGER NOT NULL DEFAULT 0,
+    parent TEXT,
+    jira_url TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX idx_issues_status ON issues(status);
+CREATE INDEX idx_issues_status_category ON issues(status_category);
+CREATE INDEX idx_issues_assignee ON issues(assignee);
+CREATE INDEX idx_issues_level ON issues(level);
+CREATE INDEX idx_issues_parent ON issues(parent);
+CREATE INDEX idx_issues_updated ON issues(updated);
+
+CREATE TABLE comments (
+    issue_key TEXT NOT NULL,
+    id TEXT,
+    author TEXT,
+    created TEXT,
+    updated TEXT,
+    body TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX idx_comments_issue ON comments(issue_key);
+
+CREATE TABLE links (
+    issue_key TEXT NOT NULL,
+    type TEXT,
+    direction TEXT,
+    target_key TEXT,
+    target_summary TEXT
+);
+CREATE INDEX idx_links_issue ON links(issue_key);
+CREATE INDEX idx_links_target ON links(target_key);
+
+CREATE TABLE labels (
+    issue_key TEXT NOT NULL,
+    label TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX idx_labels_issue ON labels(issue_key);
+CREATE INDEX idx_labels_label ON labels(label);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE issues_fts USING fts5(
+    summary, description, comments, tokenize = 'unicode61'
+);
+"""
+
+TABLES = ["issues", "comments", "links", "labels", "issues_fts"]
+
+# Columns returned by list/search/tree, in display order
+SUMMARY_COLUMNS = ["key", "level", "issue_type", "status", "status_category",
+                   "assignee", "parent", "updated", "summary"]
+
+
+def select_columns(table: str = "") -> str:
+    """SUMMARY_COLUMNS as a select list, optionally qualified with a table alias."""
+    return ", ".join(f"{table}.{c}" if table else c for c in SUMMARY_COLUMNS)
+
+
+def fts_query(text: str) -> str:
+    """Quote each word of free text so FTS5 treats it as a plain term (keys contain '-')."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+class JiraIssueDB:
+    """SQLite mirror of the parsed issue store, with indexed lookups and full-text search."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.fts = True
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._create()
+        else:
+            self.fts = self._has_table("issues_fts")
+
+    def _has_table(self, name: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+    def _create(self) -> None:
+        """Drop any older schema and create the current one (empty)."""
+        with self.conn:
+            for table in TABLES:
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.executescript(SCHEMA)
+            try:
+                self.conn.executescript(FTS_SCHEMA)
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5
+                self.fts = False
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def count(self) -> int:
+        """Number of issues in the database."""
+        return self.conn.execute("SELECT COUNT(*) FROM issues").fetchone()[0]
+
+    def catalog(self) -> dict[str, tuple[str | None, int]]:
+        """Map each stored key to its (updated, level), to check the database against the file store."""
+        return {row[0]: (row[1], row[2])
+                for row in self.conn.execute("SELECT key, updated, level FROM issues")}
+
+    def upsert(self, issue: dict[str, Any]) -> None:
+        """Insert or replace a parsed issue and its comments, links and labels."""
+        key = issue["key"]
+        self.delete(key)
+        status = issue.get("status") or {}
+        assignee = issue.get("assignee") or {}
+        description = issue.get("description_text") or ""
+        cursor = self.conn.execute(
+            "INSERT INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+                key,
+                issue.get("id"),
+                issue.get("project"),
+                issue.get("summary") or "",
+                description,
+                status.get("name"),
+                status.get("category"),
+                (issue.get("issue_type") or {}).get("name"),
+                issue.get("priority"),
+                assignee.get("name"),
+                assignee.get("account_id"),
+                (issue.get("reporter") or {}).get("name"),
+                issue.get("created"),
+                issue.get("updated"),
+                issue.get("resolved"),
+                issue.get("hierarchy_level", 0),
+                (issue.get("parent") or {}).get("key"),
+                issue.get("jira_url"),
+                json_dumps(issue, compact=True).decode(),
+            ))
+        comments = issue.get("comments") or []
+        self.conn.executemany("INSERT INTO comments VALUES (?, ?, ?, ?, ?, ?)", [
+            (key, c.get("id"), c.get("author"), c.get("created"), c.get("updated"), c.get("body") or "")
+            for c in comments
+        ])
+        self.conn.executemany("INSERT INTO links VALUES (?, ?, ?, ?, ?)", [
+            (key, link.get("type"), link.get("direction"), link.get("key"), link.get("summary"))
+            for link in issue.get("links") or []
+        ])
+        self.conn.executemany("INSERT INTO labels VALUES (?, ?)", [
+            (key, label) for label in issue.get("labels") or []
+        ])
+        if self.fts:
+            # Shares the issue row's rowid, so deletes don't need a scan
+            self.conn.execute("INSERT INTO issues_fts(rowid, summary, description, comments) "
+                              "VALUES (?, ?, ?, ?)", (
+                cursor.lastrowid, issue.get("summary") or "", description,
+                "\n\n".join(c.get("body") or "" for c in comments),
+            ))
+
+    def delete(self, key: str) -> None:
+        """Remove an issue and its child rows (no-op if it isn't stored)."""
+        row = self.conn.execute("SELECT rowid FROM issues WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return
+        self.conn.execute("DELETE FROM issues WHERE rowid = ?", (row[0],))
+        if self.fts:
+            self.conn.execute("DELETE FROM issues_fts WHERE rowid = ?", (row[0],))
+        for table in ("comments", "links", "labels"):
+            self.conn.execute(f"DELETE FROM {table} WHERE issue_key = ?", (key,))
+
+    def rebuild(self, issues: Iterable[dict[str, Any]]) -> int:
+        """Replace the whole database with issues; return how many were loaded."""
+        self._create()
+        count = 0
+        with self.conn:
+            for issue in issues:
+                self.upsert(issue)
+                count += 1
+        return count
+
+    def commit(self) -> None:
+        """Commit pending upserts and deletes."""
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Commit and close the connection."""
+        self.conn.commit()
+        self.conn.close()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the parsed issue stored for key, or None."""
+        row = self.conn.execute("SELECT data FROM issues WHERE key = ?", (key,)).fetchone()
+        return json_loads(row[0]) if row else None
+
+    def query(self, status: str | None = None, category: str | None = None,
+              assignee: str | None = None, issue_type: str | None = None,
+              level: int | None = None, parent: str | None = None,
+              label: str | None = None, updated_since: str | None = None,
+              limit: int | None = None) -> list[dict[str, Any]]:
+        """
+        List issues matching every given filter, most recently updated first.
+
+        Text filters are exact but case-insensitive; assignee matches the
+        display name or account id. updated_since is an ISO date or timestamp.
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        for column, value in (("status", status), ("status_category", category),
+                              ("issue_type", issue_type), ("level", level),
+                              ("parent", parent)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if assignee is not None:
+            clauses.append("(assignee = ? OR assignee_account_id = ?)")
+            params += [assignee, assignee]
+        if label is not None:
+            clauses.append("key IN (SELECT issue_key FROM labels WHERE label = ?)")
+            params.append(label)
+        if updated_since is not None:
+            clauses.append("updated >= ?")
+            params.append(updated_since)
+        sql = f"SELECT {select_columns()} FROM issues"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY updated DESC, key"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def search(self, text: str, limit: int = 20) -> list[dict[str, Any]]:
+        """Full-text search over summaries, descriptions and comments, best matches first."""
+        if not text.split():
+            return []
+        if self.fts:
+            sql = f"""
+                SELECT {select_columns("i")},
+                       snippet(issues_fts, -1, '[', ']', '...', 12) AS snippet
+                FROM issues_fts JOIN issues i ON i.rowid = issues_fts.rowid
+                WHERE issues_fts MATCH ?
+                ORDER BY rank LIMIT ?
+            """
+            rows = self.conn.execute(sql, (fts_query(text), limit))
+        else:
+            # Every word must appear somewhere in the issue
+            clauses = []
+            params: list[Any] = []
+            for word in text.split():
+                clauses.append("(summary LIKE ? OR description LIKE ? OR key IN "
+                               "(SELECT issue_key FROM comments WHERE body LIKE ?))")
+                params += [f"%{word}%"] * 3
+            sql = (f"SELECT {select_columns()}, '' AS snippet FROM issues WHERE "
+                   + " AND ".join(clauses) + " ORDER BY updated DESC LIMIT ?")
+            rows = self.conn.execute(sql, params + [limit])
+        return [dict(row) for row in rows]
+
+    def subtree(self, key: str, max_depth: int | None = None) -> list[dict[str, Any]]:
+        """Return key and its descendants in depth-first order, each with its depth below key."""
+        sql = f"""
+            WITH RECURSIVE tree(key, depth, path) AS (
+                SELECT key, 0, key FROM issues WHERE key = ?
+                UNION ALL
+                SELECT i.key, tree.depth + 1, tree.path || '/' || i.key
+                FROM issues i JOIN tree ON i.parent = tree.key
+                WHERE ? IS NULL OR tree.depth < ?
+            )
+            SELECT {select_columns("i")}, tree.depth
+            FROM tree JOIN issues i ON i.key = tree.key
+            ORDER BY tree.path
+        """
+        return [dict(row) for row in self.conn.execute(sql, (key, max_depth, max_depth))]
+
+
+def load_issue_files(jira_dir: Path = JIRA_DIR) -> Iterable[dict[str, Any]]:
+    """Yield every parsed issue from the per-file JSON store."""
+    for path in sorted((jira_dir / "issues").glob("*.json")):
+        yield load_json(path)
+
+
+def format_row(row: dict[str, Any]) -> str:
+    """One-line summary of an issue row."""
+    assignee = row.get("assignee") or "Unassigned"
+    return f"{row['key']:<12} [{row.get('status') or '?'}] {row.get('summary', '')} ({assignee})"
+
+
+def print_issue(issue: dict[str, Any]) -> None:
+    """Print a stored issue with its description, links and comments."""
+    print(f"{issue['key']}: {issue.get('summary', '')}")
+    print(f"  Type: {issue.get('issue_type', {}).get('name')}  "
+          f"Status: {issue.get('status', {}).get('name')}  "
+          f"Level: {issue.get('hierarchy_level')}")
+    print(f"  Assignee: {(issue.get('assignee') or {}).get('name', 'Unassigned')}  "
+          f"Updated: {issue.get('updated')}")
+    if issue.get("parent"):
+        print(f"  Parent: {issue['parent']['key']}")
+    print(f"  {issue.get('jira_url', '')}")
+    if issue.get("description_text"):
+        print()
+        print(issue["description_text"])
+    if issue.get("links"):
+        print("\nLinks:")
+        for link in issue["links"]:
+            print(f"  {link['direction']} {link['key']}: {link.get('summary', '')}")
+    for comment in issue.get("comments", []):
+        print(f"\n--- {comment.get('author')} ({comment.get('created')})")
+        print(comment.get("body", ""))
+
+
+def main() -> None:
+    """Query the Jira issue database."""
+    parser = argparse.ArgumentParser(description="Query the synced Jira issue database")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="Full-text search summaries, descriptions and comments")
+    search.add_argument("text", nargs="+")
+    search.add_argument("--limit", type=int, default=20)
+
+    lister = commands.add_parser("list", help="List issues by field")
+    lister.add_argument("--status", help="Status name, e.g. 'In Progress'")
+    lister.add_argument("--category", help="Status category: 'To Do', 'In Progress' or 'Done'")
+    lister.add_argument("--assignee", help="Assignee display name or account id")
+    lister.add_argument("--type", dest="issue_type", help="Issue type, e.g. Epic")
+    lister.add_argument("--level", type=int, help="Hierarchy level (0 = root)")
+    lister.add_argument("--parent", help="Parent issue key")
+    lister.add_argument("--label")
+    lister.add_argument("--updated-since", help="ISO date, e.g. 2026-01-31")
+    lister.add_argument("--limit", type=int)
+
+    show = commands.add_parser("show", help="Show one issue with its comments")
+    show.add_argument("key")
+
+    tree = commands.add_parser("tree", help="Show an issue and its descendants")
+    tree.add_argument("key")
+    tree.add_argument("--depth", type=int, help="Maximum depth below KEY")
+
+    commands.add_parser("rebuild", help="Rebuild the database from issues/*.json")
+    args = parser.parse_args()
+
+    db_path = JIRA_DIR / DB_FILE
+    if args.command != "rebuild" and not db_path.exists():
+        print(f"ERROR: {db_path} not found. Set \"database\": true under \"jira\" in "
+              "config.json and run sync_jira.py, or run 'python jira_db.py rebuild'",
+              file=sys.stderr)
+        sys.exit(1)
+
+    db = JiraIssueDB(db_path)
+    started = time.perf_counter()
+    if args.command == "rebuild":
+        count = db.rebuild(load_issue_files())
+        print(f"Loaded {count} issues into {db_path}")
+        db.close()
+        return
+    if args.command == "show":
+        result: Any = db.get(args.key)
+        if result is None:
+            print(f"ERROR: {args.key} not in database", file=sys.stderr)
+            sys.exit(1)
+    elif args.command == "search":
+        result = db.search(" ".join(args.text), args.limit)
+    elif args.command == "tree":
+        result = db.subtree(args.key, args.depth)
+    else:
+        result = db.query(status=args.status, category=args.category,
+                          assignee=args.assignee, issue_type=args.issue_type,
+                          level=args.level, parent=args.parent, label=args.label,
+                          updated_since=args.updated_since, limit=args.limit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    db.close()
+
+    if args.json:
+        sys.stdout.write(json_dumps(result).decode() + "\n")
+    elif args.command == "show":
+        print_issue(result)
+    else:
+        for row in result:
+            indent = "  " * row.get("depth", 0)
+            print(indent + format_row(row))
+            if row.get("snippet"):
+                print(f"{indent}    {' '.join(row['snippet'].split())}")
+        print(f"\n{len(result)} issues ({elapsed_ms:.1f}ms)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Local Jira issue store.
+
+The per-issue JSON files written by sync_jira.py double as the store that
+incremental syncs patch, so index.json and INDEX.md can be rebuilt from
+disk without the network:
+
+    Synced-Data/Jira/
+    ├── _meta.json          # Roots, filter and watermark of the last sync
+    ├── _issue_cache.json   # Compact record per stored issue (see below)
+    ├── index.json          # Generated from the store
+    ├── INDEX.md            # Generated from the store
+    └── issues/
+        └── KEY.json        # One parsed issue per file
+
+_issue_cache.json holds, per issue, its `updated` timestamp, level, parent
+and the handful of fields the indexes show. It is the store's in-memory
+catalog: syncs check an incoming issue against it and skip parsing and
+rewriting issues whose `updated` and level haven't changed, and indexes
+are generated from it without opening the issue files. Entries are
+evicted with their issues. The whole cache is treated as stale when the
+requested field list changes.
+
+When the optional SQLite database (jira_db.py) is attached, every put and
+remove is mirrored into it and committed with save().
+
+Hierarchy levels are derived from parent links, so an issue that moves
+within the tree only needs its own file refreshed; relevel() fixes up its
+descendants and drops anything no longer reachable from the roots.
+"""
+
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any
+
+from jira_db import JiraIssueDB
+from utils import load_json, save_json
+
+META_FILE = "_meta.json"
+CACHE_FILE = "_issue_cache.json"
+ISSUES_DIR = "issues"
+
+# Bump when parse_issue output changes shape, to force a re-parse
+CACHE_VERSION = 1
+
+
+def issue_sort_key(entry: dict[str, Any]) -> tuple[int, str, int]:
+    """Order cache entries by hierarchy level, then project and issue number."""
+    project, _, number = (entry.get("key") or "").rpartition("-")
+    return (entry.get("level", 0), project, int(number) if number.isdigit() else 0)
+
+
+def parent_key(issue: dict[str, Any]) -> str | None:
+    """Return the key of a parsed issue's parent, if it has one."""
+    parent = issue.get("parent")
+    return parent.get("key") if parent else None
+
+
+def cache_entry(issue: dict[str, Any]) -> dict[str, Any]:
+    """Reduce a parsed issue to its cache entry."""
+    return {
+        "key": issue["key"],
+        "updated": issue.get("updated"),
+        "level": issue.get("hierarchy_level", 0),
+        "parent": parent_key(issue),
+        "summary": issue.get("summary", ""),
+        "status": issue.get("status", {}).get("name", ""),
+        "status_category": issue.get("status", {}).get("category", "Unknown"),
+        "assignee": (issue.get("assignee") or {}).get("name"),
+    }
+
+
+class JiraIssueStore:
+    """Parsed issues on disk, with a compact catalog of them in memory."""
+
+    def __init__(self, jira_dir: Path, fields: list[str] | None = None):
+        """fields is the requested Jira field list; None keeps the cache's own."""
+        self.jira_dir = jira_dir
+        self.issues_dir = jira_dir / ISSUES_DIR
+        self.meta_path = jira_dir / META_FILE
+        self.cache_path = jira_dir / CACHE_FILE
+        self.fields = fields
+        self.meta: dict[str, Any] = {}
+        if self.meta_path.exists():
+            self.meta = load_json(self.meta_path)
+
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.stale = True
+        if self.cache_path.exists():
+            cache = load_json(self.cache_path)
+            self.entries = cache.get("entries", {})
+            if fields is None:
+                self.fields = cache.get("fields")
+            self.stale = (cache.get("version") != CACHE_VERSION
+                          or cache.get("fields") != self.fields)
+        elif self.issues_dir.exists():
+            # Store written before the cache existed: build it once
+            self.load()
+        self.hits = self.misses = self.evicted = 0
+        self._dirty = False
+        self.db: JiraIssueDB | None = None
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        """Read every stored issue file, rebuild the catalog from them and return them."""
+        issues: dict[str, dict[str, Any]] = {}
+        if self.issues_dir.exists():
+            for path in self.issues_dir.glob("*.json"):
+                issue = load_json(path)
+                issues[issue.get("key") or path.stem] = issue
+        self.entries = {key: cache_entry(issue) for key, issue in issues.items()}
+        self._dirty = True
+        return issues
+
+    def attach_db(self, db: JiraIssueDB) -> int:
+        """
+        Mirror writes into db from now on.
+
+        If db doesn't hold exactly the stored issues (new, deleted, or left
+        behind while the database was disabled), it is rebuilt from the
+        issue files first. Returns the number of issues loaded (0 if it was
+        already in step).
+        """
+        self.db = db
+        expected = {key: (e["updated"], e["level"]) for key, e in self.entries.items()}
+        if db.catalog() == expected:
+            return 0
+        return db.rebuild(self.load().values())
+
+    def get(self, key: str) -> dict[str, Any]:
+        """Read one stored issue."""
+        return load_json(self.issues_dir / f"{key}.json")
+
+    def is_fresh(self, key: str, updated: str | None, level: int) -> bool:
+        """True if the stored copy of key is current, so it needn't be parsed or written."""
+        entry = self.entries.get(key)
+        fresh = (not self.stale and entry is not None and updated is not None
+                 and entry["updated"] == updated and entry["level"] == level)
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return fresh
+
+    def put(self, issue: dict[str, Any]) -> None:
+        """Add or replace an issue and write its file."""
+        self.entries[issue["key"]] = cache_entry(issue)
+        self._dirty = True
+        save_json(issue, self.issues_dir / f"{issue['key']}.json", machine=True)
+        if self.db:
+            self.db.upsert(issue)
+
+    def remove(self, key: str) -> None:
+        """Drop an issue, its cache entry and its file."""
+        if self.entries.pop(key, None) is not None:
+            self.evicted += 1
+            self._dirty = True
+        (self.issues_dir / f"{key}.json").unlink(missing_ok=True)
+        if self.db:
+            self.db.delete(key)
+
+    def retain(self, keys: set[str]) -> list[str]:
+        """Remove every stored issue not in keys; return the removed keys."""
+        stale = set(self.entries) - keys
+        if self.issues_dir.exists():
+            stale |= {p.stem for p in self.issues_dir.glob("*.json")} - keys
+        for key in stale:
+            self.remove(key)
+        return sorted(stale)
+
+    def relevel(self, root_keys: list[str], filter_prefix: str | None = None,
+                max_depth: int = 10, remove: bool = True) -> list[str]:
+        """
+        Recompute hierarchy levels from parent links, starting at the roots.
+
+        Issues whose level changed are rewritten. Issues no longer reachable
+        from a root (parent moved out of scope or deleted), deeper than
+        max_depth, or level-1 issues not matching filter_prefix are removed,
+        unless remove is False (the sync couldn't see the whole tree).
+        Returns the removed keys.
+        """
+        children: dict[str, list[str]] = defaultdict(list)
+        for key, entry in self.entries.items():
+            if entry["parent"]:
+                children[entry["parent"]].append(key)
+
+        levels: dict[str, int] = {}
+        queue = deque((key, 0) for key in root_keys if key in self.entries)
+        while queue:
+            key, level = queue.popleft()
+            if key in levels or level > max_depth:
+                continue
+            if level == 1 and filter_prefix and not key.startswith(filter_prefix):
+                continue
+            levels[key] = level
+            queue.extend((child, level + 1) for child in children.get(key, []))
+
+        for key, level in levels.items():
+            if self.entries[key]["level"] != level:
+                issue = self.get(key)
+                issue["hierarchy_level"] = level
+                self.put(issue)
+
+        return self.retain(set(levels)) if remove else []
+
+    def sorted_entries(self) -> list[dict[str, Any]]:
+        """Return the cache entries ordered by level and key."""
+        return sorted(self.entries.values(), key=issue_sort_key)
+
+    def save(self, **meta: Any) -> None:
+        """Write the cache (if it changed), update _meta.json and commit the database."""
+        if self._dirty or self.stale:
+            save_json({
+                "version": CACHE_VERSION,
+                "fields": self.fields,
+                "entries": self.entries,
+            }, self.cache_path, machine=True)
+            self._dirty = self.stale = False
+        self.meta.update(meta)
+        save_json(self.meta, self.meta_path)
+        if self.db:
+            self.db.commit()
+
+    def cache_report(self) -> str:
+        """Summarise cache activity for this run."""
+        return f"Parse cache: {self.hits} hits, {self.misses} misses, {self.evicted} evicted"
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Daily data ingress in one process.
+
+Runs the Jira, GitHub, Slack and Calendar syncs concurrently in a single
+interpreter, instead of one process after another. The syncs share one
+config.json load (see utils.shared_config), the pooled HTTP sessions and a
+single batched fsync. Steps that depend on synced data run once their
+inputs have finished, whether those succeeded or not:
+
+    jira, github, slack, calendar   Independent sources, run concurrently
+    search                          After jira, github and slack: one update
+                                    of the search and join index
+    vault_graph                     Refresh of the wikilink graph
+
+Each step's output is captured and written to daily.log as one block when
+the step finishes, so concurrent steps don't interleave. (Output from
+threads a step starts itself, other than through the async engine, goes to
+the log as it happens.) Every step gets a status (OK, SKIP, FAIL(...))
+and a duration; they are written to Synced-Data/_daily_status.json and to
+the summary line at the end of the run. A Slack token failure is reported
+by sync_slack itself instead of found by searching the log.
+
+Usage:
+    python run_daily.py [--only STEP ...] [--skip STEP ...] [--sequential]
+
+Options:
+    --only STEP         Run only these steps (dependencies outside them are ignored)
+    --skip STEP         Run everything except these steps
+    --sequential        Run one step at a time, in dependency order
+
+Exit status is 1 if the Jira sync failed, as with run_daily.sh; other
+failures (expired tokens, no Calendar access) are reported but not fatal.
+"""
+
+import argparse
+import contextlib
+import contextvars
+import io
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable
+
+from utils import (
+    DATA_DIR,
+    SYNC_DIR,
+    batched_fsync,
+    iso_now,
+    save_json,
+    shared_config,
+    track_writes,
+)
+
+LOG_FILE = SYNC_DIR / "daily.log"
+STATUS_FILE = DATA_DIR / "_daily_status.json"
+CALENDAR_SCRIPT = SYNC_DIR.parent / "Scripts" / "calendar-today.py"
+
+# Buffer the current step's output goes to; copied into async engine worker threads
+_step_output: contextvars.ContextVar[io.StringIO | None] = contextvars.ContextVar(
+    "step_output", default=None)
+
+
+class StepOutput(io.TextIOBase):
+    """
+    Stand-in for sys.stdout/sys.stderr that sends each step's output to its
+    own buffer, and anything else straight to the log.
+    """
+
+    def __init__(self, log_file: io.TextIOBase):
+        self.log_file = log_file
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        buffer = _step_output.get()
+        if buffer is not None:
+            return buffer.write(text)
+        with self._lock:
+            self.log_file.write(text)
+            self.log_file.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        if _step_output.get() is None:
+            with self._lock:
+                self.log_file.flush()
+
+    def log(self, line: str) -> None:
+        """Write a line to the log from the orchestrator itself."""
+        with self._lock:
+            self.log_file.write(line + "\n")
+            self.log_file.flush()
+
+
+class Step:
+    """One unit of the daily run: a function called in this process, or an external command."""
+
+    def __init__(self, name: str, title: str, run: Callable[[], Any] | None = None,
+                 command: list[str] | None = None, after: tuple[str, ...] = (),
+                 status: Callable[[Any], str] | None = None, critical: bool = False,
+                 skip: str | None = None):
+        self.name = name
+        self.title = title
+        self.run = run
+        self.command = command
+        self.after = after
+        self.status = status
+        self.critical = critical
+        self.skip = skip
+
+    def execute(self) -> dict[str, Any]:
+        """Run the step with its output captured; return its status, timing, result and output."""
+        buffer = io.StringIO()
+        _step_output.set(buffer)
+        track_writes()
+        started_at = iso_now()
+        started = time.perf_counter()
+        result: Any = None
+        try:
+            if self.skip:
+                buffer.write(f"Skipped: {self.skip}\n")
+                status = "SKIP"
+            elif self.command:
+                proc = subprocess.run(self.command, cwd=SYNC_DIR, capture_output=True, text=True)
+                buffer.write(proc.stdout + proc.stderr)
+                status = "OK" if proc.returncode == 0 else f"FAIL(exit={proc.returncode})"
+            else:
+                result = self.run()
+                status = self.status(result) if self.status else "OK"
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (1 if e.code else 0)
+            status = "OK" if code == 0 else f"FAIL(exit={code})"
+        except Exception as e:
+            traceback.print_exc(file=buffer)
+            status = f"FAIL({type(e).__name__})"
+        return {
+            "status": status,
+            "started": started_at,
+            "seconds": round(time.perf_counter() - started, 2),
+            "result": result,
+            "output": buffer.getvalue(),
+        }
+
+
+def slack_status(result: dict[str, Any]) -> str:
+    """OK, or FAIL(expired_token) if sync_slack stopped on an invalid session token."""
+    return "FAIL(expired_token)" if result.get("token_expired") else "OK"
+
+
+def define_steps(index_after_syncs: bool, search_enabled: bool) -> list[Step]:
+    """The daily steps, in the order run_daily.sh ran them."""
+    sync_args = ["--no-index"] if index_after_syncs else []
+
+    def jira() -> Any:
+        import sync_jira
+        return sync_jira.main(sync_args)
+
+    def github() -> Any:
+        import sync_github
+        return sync_github.main(sync_args)
+
+    def slack() -> Any:
+        import sync_slack
+        return sync_slack.main(sync_args)
+
+    def search() -> Any:
+        from search_index import SearchIndex
+        index = SearchIndex().update()
+        print(index.report())
+        index.close()
+        return {"parsed": index.parsed, "removed": index.removed}
+
+    def vault_graph() -> Any:
+        from vault_graph import VaultGraph
+        graph = VaultGraph().refresh()
+        print(graph.report())
+        graph.close()
+        return {"parsed": graph.parsed, "removed": graph.removed}
+
+    return [
+        Step("jira", "Jira sync", jira, critical=True),
+        Step("github", "GitHub sync", github),
+        Step("slack", "Slack sync", slack, status=slack_status),
+        Step("calendar", "Calendar fetch", command=["python3", str(CALENDAR_SCRIPT)],
+             skip=None if CALENDAR_SCRIPT.exists() else f"{CALENDAR_SCRIPT} not found"),
+        Step("search", "Search index update", search, after=("jira", "github", "slack"),
+             skip=None if search_enabled else "search.enabled is false in config.json"),
+        Step("vault_graph", "Vault graph refresh", vault_graph),
+    ]
+
+
+def run_steps(steps: list[Step], workers: int, log: Callable[[str], None]) -> dict[str, dict[str, Any]]:
+    """
+    Run steps concurrently (up to workers at a time), each once the steps
+    it comes after have finished. Each step's output is logged as one block.
+    """
+    names = {step.name for step in steps}
+    pending = {step.name: step for step in steps}
+    done: dict[str, dict[str, Any]] = {}
+    running: dict[Future, Step] = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="daily") as pool:
+        while pending or running:
+            for step in list(pending.values()):
+                if len(running) >= workers:
+                    break
+                if all(dep in done or dep not in names for dep in step.after):
+                    del pending[step.name]
+                    log(f"--- {step.title} started: {datetime.now():%Y-%m-%d %H:%M:%S} ---")
+                    running[pool.submit(contextvars.copy_context().run, step.execute)] = step
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                step = running.pop(future)
+                outcome = future.result()
+                done[step.name] = outcome
+                log(f"=== {step.title} output ===\n{outcome.pop('output').rstrip()}")
+                log(f"{step.title} finished: {datetime.now():%Y-%m-%d %H:%M:%S} "
+                    f"({outcome['status']}, {outcome['seconds']:.1f}s)\n")
+    return done
+
+
+def main() -> None:
+    """Run the daily syncs and post-sync steps."""
+    parser = argparse.ArgumentParser(description="Run the daily syncs in one process")
+    parser.add_argument("--only", nargs="+", metavar="STEP", help="Run only these steps")
+    parser.add_argument("--skip", nargs="+", metavar="STEP", default=[], help="Skip these steps")
+    parser.add_argument("--sequential", action="store_true", help="Run one step at a time")
+    args = parser.parse_args()
+
+    def selected(name: str) -> bool:
+        return (not args.only or name in args.only) and name not in args.skip
+
+    log_file = open(LOG_FILE, "a", encoding="utf-8")
+    output = StepOutput(log_file)
+    log = output.log
+    log("")
+    log("=" * 40)
+    log(f"DAILY SYNC started: {datetime.now():%Y-%m-%d %H:%M:%S}")
+    log("=" * 40)
+
+    started_at = iso_now()
+    started = time.perf_counter()
+    with shared_config() as config, batched_fsync(), \
+            contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        search_enabled = config.get("search", {}).get("enabled", True)
+        steps = define_steps(selected("search") and search_enabled, search_enabled)
+        steps = [step for step in steps if selected(step.name)]
+        results = run_steps(steps, 1 if args.sequential else len(steps) or 1, log)
+    elapsed = time.perf_counter() - started
+
+    statuses = {step.name: results[step.name]["status"] for step in steps}
+    summary = ("DAILY SYNC COMPLETE: " + " ".join(f"{n}={s}" for n, s in statuses.items())
+               + f" ({elapsed:.1f}s wall, {sum(r['seconds'] for r in results.values()):.1f}s in steps)")
+    log(summary)
+    log(f"Finished: {datetime.now():%Y-%m-%d %H:%M:%S}")
+    log("=" * 40)
+    log("")
+    log_file.close()
+    save_json({
+        "started": started_at,
+        "finished": iso_now(),
+        "seconds": round(elapsed, 2),
+        "steps": {step.name: results[step.name] for step in steps},
+    }, STATUS_FILE)
+    print(summary)
+
+    if any(step.critical and not statuses[step.name].startswith("OK") for step in steps):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
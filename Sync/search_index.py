@@ -0,0 +1,723 @@
+#!/usr/bin/env python3
+"""
+Local full-text search over synced data and curated notes.
+
+Prompts that need context ("what happened with the exhaust port this
+week?") can pull the few most relevant passages from here instead of
+reading whole directories. Everything is one SQLite database,
+Synced-Data/_search.db, with a document per searchable item:
+
+    slack     One per message and per thread reply (days/*.jsonl)
+    jira      One per issue (summary + description) and per comment
+    github    One per merged PR (title, repo and labels)
+    curated   One per Curated-Context markdown note
+
+Each document has a date, the people involved and the Jira keys it
+mentions, which the filters use. Titles and bodies go into an FTS5 index
+over the docs table (Porter stemming, no second copy of the text), ranked
+with BM25 and titles weighted above bodies.
+
+The index is kept per file: the files table records the mtime and size of
+every source file indexed (as source/relative-path), and update() re-reads only the files that were
+added or changed since, replacing their documents. Files that were deleted
+take their documents with them. Each sync script updates its own source
+after writing, and `search` brings the curated notes up to date before
+querying. The database can be deleted at any time; the next update
+rebuilds it. If SQLite was built without FTS5, search falls back to
+substring matching ordered by date.
+
+The same per-file update also maintains a join index across sources:
+each Jira issue's status, assignee, parent and links sit in the issues and
+issue_links tables, and the keys table maps every Jira key to the PRs,
+Slack messages, comments and notes that mention it. `about KEY` gathers
+all of that for one key, and `person NAME` lists the keys a person is
+involved with, each as a handful of indexed lookups.
+
+Usage:
+    python search_index.py search TEXT [--source S] [--since DATE] [--until DATE]
+                                       [--person NAME] [--key KEY] [--any] [--limit K]
+    python search_index.py about KEY
+    python search_index.py person NAME
+    python search_index.py update [--source S]
+    python search_index.py rebuild
+
+Add --json to print results as JSON.
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from curated_index import WIKILINK_RE, CuratedIndex, parse_front_matter
+from slack_store import SlackMessageStore
+from utils import (
+    CURATED_DIR,
+    DATA_DIR,
+    GITHUB_DIR,
+    JIRA_DIR,
+    JIRA_KEY_RE,
+    SLACK_DIR,
+    json_dumps,
+    load_json,
+)
+
+INDEX_FILE = DATA_DIR / "_search.db"
+
+# Seconds to wait for another writer (a concurrent sync's update) to finish
+BUSY_TIMEOUT = 60.0
+
+# Bump when the schema or the documents built from source files change
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+
+CREATE TABLE docs (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    source TEXT NOT NULL,
+    ref TEXT NOT NULL,
+    date TEXT,
+    title TEXT NOT NULL DEFAULT '',
+    body TEXT NOT NULL DEFAULT '',
+    url TEXT
+);
+CREATE INDEX idx_docs_file ON docs(file);
+CREATE INDEX idx_docs_date ON docs(date);
+
+CREATE TABLE people (
+    doc_id INTEGER NOT NULL,
+    name TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX idx_people_doc ON people(doc_id);
+CREATE INDEX idx_people_name ON people(name);
+
+CREATE TABLE keys (
+    doc_id INTEGER NOT NULL,
+    key TEXT NOT NULL
+);
+CREATE INDEX idx_keys_doc ON keys(doc_id);
+CREATE INDEX idx_keys_key ON keys(key);
+
+CREATE TABLE issues (
+    doc_id INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    summary TEXT,
+    status TEXT,
+    assignee TEXT COLLATE NOCASE,
+    parent TEXT,
+    url TEXT
+);
+CREATE INDEX idx_issues_doc ON issues(doc_id);
+CREATE INDEX idx_issues_key ON issues(key);
+CREATE INDEX idx_issues_parent ON issues(parent);
+CREATE INDEX idx_issues_assignee ON issues(assignee);
+
+CREATE TABLE issue_links (
+    doc_id INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    direction TEXT,
+    target TEXT NOT NULL
+);
+CREATE INDEX idx_issue_links_doc ON issue_links(doc_id);
+CREATE INDEX idx_issue_links_key ON issue_links(key);
+CREATE INDEX idx_issue_links_target ON issue_links(target);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE docs_fts USING fts5(
+    title, body, content = 'docs', content_rowid = 'id', tokenize = 'porter unicode61'
+);
+INSERT INTO docs_fts(docs_fts, rank) VALUES ('rank', 'bm25(%s, %s)');
+"""
+
+TABLES = ["files", "docs", "people", "keys", "issues", "issue_links", "docs_fts"]
+
+# BM25 weights of the title and body columns
+TITLE_WEIGHT = 4.0
+BODY_WEIGHT = 1.0
+
+# Columns returned by search, in display order
+RESULT_COLUMNS = ["source", "date", "title", "ref", "url"]
+
+ISO_DATE_RE = re.compile(r"(\d{4})-?(\d{2})-?(\d{2})")
+
+Document = dict[str, Any]
+
+
+def jira_key_list(*texts: str) -> list[str]:
+    """Distinct Jira keys mentioned in texts, in order of first mention."""
+    return list(dict.fromkeys(key for text in texts for key in JIRA_KEY_RE.findall(text or "")))
+
+
+def slack_documents(path: Path) -> list[Document]:
+    """Messages and thread replies of one Slack day segment."""
+    store = SlackMessageStore(path.parent.parent)
+    channel = store.index.get("channel") or path.parent.parent.name
+    docs = []
+    for msg in store.load_day(path.stem).values():
+        items = [(msg, f"#{channel}")]
+        items += [(reply, f"#{channel} (thread reply)") for reply in msg.get("replies", [])]
+        for item, title in items:
+            text = item.get("text") or ""
+            docs.append({
+                "ref": f"slack:{channel}:{item.get('ts', '')}",
+                "date": (item.get("timestamp") or "")[:10] or None,
+                "title": title,
+                "body": text,
+                "people": [item["user_name"]] if item.get("user_name") else [],
+                "keys": jira_key_list(text),
+            })
+    return docs
+
+
+def jira_documents(path: Path) -> list[Document]:
+    """An issue (summary and description, with its parent and links) and each of its comments."""
+    issue = load_json(path)
+    key = issue.get("key") or path.stem
+    people = [p["name"] for p in (issue.get("assignee"), issue.get("reporter")) if p and p.get("name")]
+    docs = [{
+        "ref": key,
+        "date": (issue.get("updated") or "")[:10] or None,
+        "title": f"{key} {issue.get('summary') or ''}",
+        "body": issue.get("description_text") or "",
+        "people": people,
+        "keys": jira_key_list(key, issue.get("description_text") or ""),
+        "url": issue.get("jira_url"),
+        "issue": {
+            "key": key,
+            "summary": issue.get("summary"),
+            "status": (issue.get("status") or {}).get("name"),
+            "assignee": (issue.get("assignee") or {}).get("name"),
+            "parent": (issue.get("parent") or {}).get("key"),
+            "url": issue.get("jira_url"),
+        },
+        "links": [(link.get("direction"), link["key"])
+                  for link in issue.get("links", []) if link.get("key")],
+    }]
+    for comment in issue.get("comments", []):
+        body = comment.get("body") or ""
+        docs.append({
+            "ref": f"{key}#comment-{comment.get('id')}",
+            "date": (comment.get("created") or "")[:10] or None,
+            "title": f"{key} comment",
+            "body": body,
+            "people": [comment["author"]] if comment.get("author") else [],
+            "keys": jira_key_list(key, body),
+            "url": issue.get("jira_url"),
+        })
+    return docs
+
+
+def github_documents(path: Path, handle_names: dict[str, str]) -> list[Document]:
+    """A merged PR; its author is indexed by handle and by name from their People stub."""
+    pr = load_json(path)
+    author = pr.get("author") or ""
+    people = [author] if author else []
+    name = pr.get("author_name") or handle_names.get(author.lower())
+    if name:
+        people.append(name)
+    return [{
+        "ref": f"{pr.get('repo')}#{pr.get('number')}",
+        "date": (pr.get("merged_at") or "")[:10] or None,
+        "title": pr.get("title") or "",
+        "body": " ".join([pr.get("repo") or ""] + list(pr.get("labels") or [])),
+        "people": people,
+        "keys": list(dict.fromkeys(pr.get("jira_keys") or jira_key_list(pr.get("title") or ""))),
+        "url": pr.get("url"),
+    }]
+
+
+def curated_documents(path: Path, rel: str) -> list[Document]:
+    """
+    A curated note. Its date is the front-matter `date`, else one in its
+    file name; its people are its own name (for People stubs) and every
+    name it links to.
+    """
+    text = path.read_text(encoding="utf-8", errors="replace")
+    front_matter = parse_front_matter(text)
+    if not isinstance(front_matter, dict):
+        front_matter = {}
+    date = front_matter.get("date")
+    match = ISO_DATE_RE.search(path.stem)
+    if date:
+        date = str(date)[:10]
+    elif match:
+        date = "-".join(match.groups())
+    links = [t.strip() for t in WIKILINK_RE.findall(text)]
+    own = [path.stem] if rel.startswith("People/") else []
+    return [{
+        "ref": f"Curated-Context/{rel}",
+        "date": date,
+        "title": path.stem,
+        "body": text,
+        "people": list(dict.fromkeys(own + [t for t in links if t])),
+        "keys": jira_key_list(text),
+    }]
+
+
+def fts_query(text: str, any_word: bool = False) -> str:
+    """Quote each word of free text so FTS5 treats it as a plain term (keys contain '-')."""
+    words = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+    return (" OR " if any_word else " ").join(words)
+
+
+class SearchIndex:
+    """BM25 full-text index over Slack, Jira, GitHub and Curated-Context, updated per file."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or INDEX_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._create()
+        self.fts = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'docs_fts'").fetchone() is not None
+        self._handle_names: dict[str, str] | None = None
+        self.parsed: dict[str, int] = {}
+        self.removed: dict[str, int] = {}
+
+    def _create(self, replace: bool = False) -> None:
+        """
+        Drop any older schema (or, with replace, the current one) and create
+        the current one (empty).
+
+        Runs as one write transaction, so syncs that open a new database at
+        the same time don't both create it (executescript would commit
+        between statements).
+        """
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version == SCHEMA_VERSION and not replace:
+                return  # Created by another connection while this one waited
+            for table in TABLES:
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            for statement in SCHEMA.split(";"):
+                self.conn.execute(statement)
+            try:
+                for statement in (FTS_SCHEMA % (TITLE_WEIGHT, BODY_WEIGHT)).split(";"):
+                    self.conn.execute(statement)
+            except sqlite3.OperationalError:
+                pass  # SQLite built without FTS5
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def handle_names(self) -> dict[str, str]:
+        """Lowercased GitHub handle -> person name, from the People stubs' front-matter."""
+        if self._handle_names is None:
+            index = CuratedIndex(CURATED_DIR).refresh()
+            self._handle_names = {
+                str(entry["front_matter"]["github"]).lower(): Path(rel).stem
+                for rel, entry in index.entries.items()
+                if rel.startswith("People/") and entry["front_matter"].get("github")
+            }
+        return self._handle_names
+
+    def sources(self) -> dict[str, tuple[Path, str, Callable[[Path, str], list[Document]]]]:
+        """Per source: the directory scanned, the file suffix indexed and its document builder."""
+        return {
+            "slack": (SLACK_DIR, ".jsonl", lambda path, rel: slack_documents(path)),
+            "jira": (JIRA_DIR / "issues", ".json", lambda path, rel: jira_documents(path)),
+            "github": (GITHUB_DIR / "pull-requests", ".json",
+                       lambda path, rel: github_documents(path, self.handle_names())),
+            "curated": (CURATED_DIR, ".md", curated_documents),
+        }
+
+    @staticmethod
+    def _scan(root: Path, suffix: str) -> dict[str, os.stat_result]:
+        """Stat every file with suffix under root (relative paths), skipping hidden entries."""
+        found: dict[str, os.stat_result] = {}
+        prefix = len(str(root)) + 1
+        stack = [str(root)]
+        while stack:
+            try:
+                listing = os.scandir(stack.pop())
+            except FileNotFoundError:
+                continue
+            with listing:
+                for entry in listing:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                    elif entry.name.endswith(suffix):
+                        found[entry.path[prefix:].replace(os.sep, "/")] = entry.stat()
+        return found
+
+    def update(self, sources: list[str] | None = None) -> "SearchIndex":
+        """Re-index new and changed files of sources (all by default) and drop deleted ones."""
+        all_sources = self.sources()
+        for source in sources or list(all_sources):
+            root, suffix, build = all_sources[source]
+            found = self._scan(root, suffix)
+            known = {row[0]: (row[1], row[2]) for row in self.conn.execute(
+                "SELECT path, mtime_ns, size FROM files WHERE source = ?", (source,))}
+            parsed = removed = 0
+            with self.conn:
+                for path in known.keys() - {f"{source}/{rel}" for rel in found}:
+                    self._delete_file(path)
+                    self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                    removed += 1
+                for rel, stat in found.items():
+                    path = f"{source}/{rel}"
+                    if known.get(path) == (stat.st_mtime_ns, stat.st_size):
+                        continue
+                    self._delete_file(path)
+                    for doc in build(root / rel, rel):
+                        self._insert(path, source, doc)
+                    self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                                      (path, source, stat.st_mtime_ns, stat.st_size))
+                    parsed += 1
+            self.parsed[source] = self.parsed.get(source, 0) + parsed
+            self.removed[source] = self.removed.get(source, 0) + removed
+        return self
+
+    def _delete_file(self, path: str) -> None:
+        """Remove the documents built from one file."""
+        rows = self.conn.execute("SELECT id, title, body FROM docs WHERE file = ?", (path,)).fetchall()
+        if not rows:
+            return
+        ids = [(row[0],) for row in rows]
+        if self.fts:
+            # External-content table: deletes must repeat the indexed values
+            self.conn.executemany("INSERT INTO docs_fts(docs_fts, rowid, title, body) "
+                                  "VALUES ('delete', ?, ?, ?)", [tuple(row) for row in rows])
+        self.conn.executemany("DELETE FROM people WHERE doc_id = ?", ids)
+        self.conn.executemany("DELETE FROM keys WHERE doc_id = ?", ids)
+        self.conn.executemany("DELETE FROM issues WHERE doc_id = ?", ids)
+        self.conn.executemany("DELETE FROM issue_links WHERE doc_id = ?", ids)
+        self.conn.execute("DELETE FROM docs WHERE file = ?", (path,))
+
+    def _insert(self, path: str, source: str, doc: Document) -> None:
+        """Add one document with its people and keys (and, for Jira issues, parent and links)."""
+        doc_id = self.conn.execute(
+            "INSERT INTO docs (file, source, ref, date, title, body, url) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, source, doc["ref"], doc.get("date"), doc["title"], doc["body"], doc.get("url")),
+        ).lastrowid
+        if self.fts:
+            self.conn.execute("INSERT INTO docs_fts(rowid, title, body) VALUES (?, ?, ?)",
+                              (doc_id, doc["title"], doc["body"]))
+        self.conn.executemany("INSERT INTO people VALUES (?, ?)",
+                              [(doc_id, name) for name in doc.get("people", [])])
+        self.conn.executemany("INSERT INTO keys VALUES (?, ?)",
+                              [(doc_id, key) for key in doc.get("keys", [])])
+        issue = doc.get("issue")
+        if issue:
+            self.conn.execute("INSERT INTO issues VALUES (?, ?, ?, ?, ?, ?, ?)", (
+                doc_id, issue["key"], issue["summary"], issue["status"],
+                issue["assignee"], issue["parent"], issue["url"]))
+            self.conn.executemany("INSERT INTO issue_links VALUES (?, ?, ?, ?)",
+                                  [(doc_id, issue["key"], direction, target)
+                                   for direction, target in doc.get("links", [])])
+
+    def rebuild(self) -> "SearchIndex":
+        """Drop everything and index every source from scratch."""
+        self._create(replace=True)
+        return self.update()
+
+    def close(self) -> None:
+        """Close the database."""
+        self.conn.close()
+
+    def search(self, text: str, limit: int = 10, sources: list[str] | None = None,
+               since: str | None = None, until: str | None = None,
+               person: str | None = None, key: str | None = None,
+               any_word: bool = False) -> list[dict[str, Any]]:
+        """
+        Top documents for text, best first, each with a snippet around the matches.
+
+        All words must match unless any_word is set (BM25 still ranks
+        documents matching more of them higher). since and until are
+        inclusive ISO dates. person matches any part of a name involved in
+        the document; key is an exact Jira key.
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        if sources:
+            clauses.append(f"d.source IN ({', '.join('?' * len(sources))})")
+            params += sources
+        if since:
+            clauses.append("d.date >= ?")
+            params.append(since[:10])
+        if until:
+            clauses.append("d.date <= ?")
+            params.append(until[:10])
+        if person:
+            clauses.append("d.id IN (SELECT doc_id FROM people WHERE name LIKE ?)")
+            params.append(f"%{person}%")
+        if key:
+            clauses.append("d.id IN (SELECT doc_id FROM keys WHERE key = ?)")
+            params.append(key.upper())
+        columns = ", ".join(f"d.{c}" for c in RESULT_COLUMNS)
+
+        if not text.split():
+            # Filters only: newest first
+            sql = f"SELECT {columns}, NULL AS score, substr(d.body, 1, 200) AS snippet FROM docs d"
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            rows = self.conn.execute(sql + " ORDER BY d.date DESC LIMIT ?", params + [limit])
+        elif self.fts:
+            sql = f"""
+                SELECT {columns},
+                       rank AS score,
+                       snippet(docs_fts, -1, '[', ']', '...', 24) AS snippet
+                FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid
+                WHERE docs_fts MATCH ?
+            """
+            for clause in clauses:
+                sql += f" AND {clause}"
+            rows = self.conn.execute(sql + " ORDER BY score LIMIT ?",
+                                     [fts_query(text, any_word)] + params + [limit])
+        else:
+            # Substring matching, newest first
+            words = text.split()
+            match = (" OR " if any_word else " AND ").join(
+                ["(d.title LIKE ? OR d.body LIKE ?)"] * len(words))
+            sql = (f"SELECT {columns}, NULL AS score, substr(d.body, 1, 200) AS snippet "
+                   f"FROM docs d WHERE ({match})")
+            for clause in clauses:
+                sql += f" AND {clause}"
+            word_params = [f"%{word}%" for word in words for _ in range(2)]
+            rows = self.conn.execute(sql + " ORDER BY d.date DESC LIMIT ?",
+                                     word_params + params + [limit])
+        return [dict(row) for row in rows]
+
+    def _issue(self, key: str) -> dict[str, Any]:
+        """Stored fields of an issue, or just its key if it isn't synced."""
+        row = self.conn.execute(
+            "SELECT key, summary, status, assignee, parent, url FROM issues WHERE key = ?", (key,)
+        ).fetchone()
+        return dict(row) if row else {"key": key}
+
+    def _mentions(self, key: str, sources: list[str]) -> list[dict[str, Any]]:
+        """Documents of sources that mention key, newest first (the issue's own excluded)."""
+        sql = f"""
+            SELECT {", ".join(f"d.{c}" for c in RESULT_COLUMNS)},
+                   (SELECT GROUP_CONCAT(name, ', ') FROM people WHERE doc_id = d.id) AS people,
+                   substr(d.body, 1, 200) AS excerpt
+            FROM keys k JOIN docs d ON d.id = k.doc_id
+            WHERE k.key = ? AND d.source IN ({", ".join("?" * len(sources))})
+              AND d.ref != ? AND d.ref NOT LIKE ?
+            ORDER BY d.date DESC, d.ref
+        """
+        return [dict(row) for row in self.conn.execute(sql, [key, *sources, key, f"{key}#%"])]
+
+    def about(self, key: str) -> dict[str, Any]:
+        """
+        Everything indexed about a Jira key: the issue, its parent chain
+        (nearest first), children and linked issues, the PRs and Slack
+        messages that mention it, and other Jira comments and curated notes
+        that do.
+        """
+        key = key.upper()
+        parents = self.conn.execute("""
+            WITH RECURSIVE chain(key, depth) AS (
+                SELECT parent, 1 FROM issues WHERE key = ? AND parent IS NOT NULL
+                UNION
+                SELECT i.parent, chain.depth + 1
+                FROM issues i JOIN chain ON i.key = chain.key
+                WHERE i.parent IS NOT NULL AND chain.depth < 50
+            )
+            SELECT key FROM chain ORDER BY depth
+        """, (key,)).fetchall()
+        children = self.conn.execute(
+            "SELECT key FROM issues WHERE parent = ? ORDER BY key", (key,)).fetchall()
+        # Jira lists a link on both issues; the other issue's copy (reverse,
+        # its direction read from the other side) is used if only it is synced
+        links: dict[str, tuple[str | None, bool]] = {}
+        for target, direction in self.conn.execute(
+                "SELECT target, direction FROM issue_links WHERE key = ?", (key,)):
+            links.setdefault(target, (direction, False))
+        for source, direction in self.conn.execute(
+                "SELECT key, direction FROM issue_links WHERE target = ?", (key,)):
+            links.setdefault(source, (direction, True))
+        return {
+            "issue": self._issue(key),
+            "parents": [self._issue(row[0]) for row in parents],
+            "children": [self._issue(row[0]) for row in children],
+            "links": [{**self._issue(target), "direction": direction, "reverse": reverse}
+                      for target, (direction, reverse) in sorted(links.items())],
+            "prs": self._mentions(key, ["github"]),
+            "slack": self._mentions(key, ["slack"]),
+            "mentions": self._mentions(key, ["jira", "curated"]),
+        }
+
+    def person(self, name: str) -> dict[str, Any]:
+        """
+        Jira keys a person is involved with: issues assigned to them, plus
+        every key mentioned in their PRs, Slack messages, comments and notes,
+        with a count per source. name matches any part of a name or handle.
+        """
+        pattern = f"%{name}%"
+        assigned = [dict(row) for row in self.conn.execute(
+            "SELECT key, summary, status, assignee, parent, url FROM issues "
+            "WHERE assignee LIKE ? ORDER BY key", (pattern,))]
+        keys: dict[str, dict[str, int]] = {}
+        for key, source, count in self.conn.execute("""
+            SELECT k.key, d.source, COUNT(DISTINCT d.id)
+            FROM people p JOIN docs d ON d.id = p.doc_id JOIN keys k ON k.doc_id = d.id
+            WHERE p.name LIKE ?
+            GROUP BY k.key, d.source
+        """, (pattern,)):
+            keys.setdefault(key, {})[source] = count
+        ranked = sorted(keys.items(), key=lambda item: (-sum(item[1].values()), item[0]))
+        return {
+            "assigned": assigned,
+            "keys": [{**self._issue(key), "sources": sources} for key, sources in ranked],
+        }
+
+    def report(self) -> str:
+        """Summarise the index and what update() did."""
+        docs = self.conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+        changes = ", ".join(f"{source} {self.parsed[source]} files re-indexed, "
+                            f"{self.removed[source]} removed" for source in self.parsed)
+        return f"Search index: {docs} documents ({changes or 'no update'})"
+
+
+def format_issue(issue: dict[str, Any]) -> str:
+    """One-line summary of an issue from about()/person(); unsynced keys show as the key alone."""
+    if "summary" not in issue:
+        return f"{issue['key']} (not synced)"
+    return f"{issue['key']} [{issue['status']}] {issue['summary']} ({issue['assignee'] or 'Unassigned'})"
+
+
+def print_about(result: dict[str, Any]) -> None:
+    """Print about() as text."""
+    print(format_issue(result["issue"]))
+    for label in ("parents", "children"):
+        if result[label]:
+            print(f"\n{label.capitalize()}:")
+            for issue in result[label]:
+                print(f"  {format_issue(issue)}")
+    if result["links"]:
+        print("\nLinks:")
+        for issue in result["links"]:
+            direction = issue["direction"] or "relates to"
+            if issue["reverse"]:
+                print(f"  {format_issue(issue)} {direction} {result['issue']['key']}")
+            else:
+                print(f"  {direction} {format_issue(issue)}")
+    for label, title in (("prs", "Pull requests"), ("slack", "Slack"), ("mentions", "Mentioned in")):
+        if result[label]:
+            print(f"\n{title} ({len(result[label])}):")
+            for doc in result[label]:
+                print(f"  {doc['date'] or '----------'}  {doc['title']}  ({doc['ref']})"
+                      + (f" - {doc['people']}" if doc["people"] else ""))
+                if label == "slack":
+                    print(f"      {' '.join(doc['excerpt'].split())}")
+
+
+def update_index(sources: list[str]) -> None:
+    """
+    Bring sources up to date in the search index after a sync wrote them.
+
+    Failures are reported, not raised: the sync's own data is already
+    written, and the next update (or `search_index.py update`) catches up.
+    """
+    started = time.perf_counter()
+    try:
+        index = SearchIndex()
+        try:
+            index.update(sources)
+            print(f"{index.report()} in {time.perf_counter() - started:.1f}s")
+        finally:
+            index.close()
+    except Exception as e:
+        print(f"WARNING: Search index update failed ({type(e).__name__}: {e}); "
+              f"run `python search_index.py update` to retry")
+
+
+def main() -> None:
+    """Search the local index."""
+    parser = argparse.ArgumentParser(description="Search synced data and curated notes")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+    source_names = ["slack", "jira", "github", "curated"]
+
+    search = commands.add_parser("search", help="Top-k documents for TEXT, ranked by BM25")
+    search.add_argument("text", nargs="*")
+    search.add_argument("--source", action="append", choices=source_names,
+                        help="Only this source (repeatable)")
+    search.add_argument("--since", help="ISO date, inclusive")
+    search.add_argument("--until", help="ISO date, inclusive")
+    search.add_argument("--person", help="Name (or part of one) or GitHub handle involved")
+    search.add_argument("--key", help="Jira key mentioned, e.g. DS-608")
+    search.add_argument("--any", action="store_true", help="Match any word instead of all")
+    search.add_argument("--limit", "-k", type=int, default=10)
+    search.add_argument("--no-refresh", action="store_true",
+                        help="Don't re-index changed curated notes first")
+
+    about = commands.add_parser("about", help="Everything indexed about a Jira key")
+    about.add_argument("key")
+    person = commands.add_parser("person", help="Jira keys a person is involved with")
+    person.add_argument("name")
+
+    update = commands.add_parser("update", help="Re-index changed files")
+    update.add_argument("--source", action="append", choices=source_names)
+    commands.add_parser("rebuild", help="Re-index everything from scratch")
+    args = parser.parse_args()
+
+    index = SearchIndex()
+    if args.command in ("update", "rebuild"):
+        started = time.perf_counter()
+        if args.command == "rebuild":
+            index.rebuild()
+        else:
+            index.update(args.source)
+        print(f"{index.report()} in {time.perf_counter() - started:.1f}s")
+        index.close()
+        return
+
+    if not getattr(args, "no_refresh", False):
+        index.update(["curated"])
+    started = time.perf_counter()
+    if args.command == "about":
+        result: Any = index.about(args.key)
+    elif args.command == "person":
+        result = index.person(args.name)
+    else:
+        result = index.search(" ".join(args.text), args.limit, args.source, args.since,
+                              args.until, args.person, args.key, args.any)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    index.close()
+
+    if args.json:
+        sys.stdout.write(json_dumps(result).decode() + "\n")
+        return
+    if args.command == "about":
+        print_about(result)
+        print(f"\n({elapsed_ms:.1f}ms)", file=sys.stderr)
+        return
+    if args.command == "person":
+        print(f"Assigned ({len(result['assigned'])}):")
+        for issue in result["assigned"]:
+            print(f"  {format_issue(issue)}")
+        print(f"\nInvolved with ({len(result['keys'])}):")
+        for issue in result["keys"]:
+            counts = ", ".join(f"{n} {source}" for source, n in sorted(issue["sources"].items()))
+            print(f"  {format_issue(issue)}  [{counts}]")
+        print(f"\n({elapsed_ms:.1f}ms)", file=sys.stderr)
+        return
+    for row in result:
+        print(f"[{row['source']}] {row['date'] or '----------'}  {row['title']}  ({row['ref']})")
+        snippet = " ".join((row["snippet"] or "").split())
+        if snippet:
+            print(f"    {snippet}")
+    print(f"\n{len(result)} results ({elapsed_ms:.1f}ms)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
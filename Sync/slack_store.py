@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Append-only Slack message store.
+
+Each channel directory holds one JSONL segment per UTC day plus a compact
+index, instead of a single messages.json rewritten on every run:
+
+    Synced-Data/Slack/{channel-name}/
+    ├── index.json             # Per-day message counts and ts ranges
+    └── days/
+        └── YYYY-MM-DD.jsonl   # One enriched message per line, keyed by ts
+
+Incremental syncs append only the messages they fetched. A message whose ts
+is already stored (an edit, or a thread that gained replies) is merged with
+the stored copy and appended again; on read the last line for a ts wins.
+Segments are compacted in place once superseded lines outnumber live ones.
+Segments missing from index.json (a run that stopped before saving it) are
+indexed again when the store is opened.
+
+The lookback window is a read-time view over the segments; run this module
+to print it in the old messages.json shape.
+
+Usage:
+    python slack_store.py CHANNEL_NAME [--days N]
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from utils import SLACK_DIR, iso_now, json_dumps, json_loads, load_json, save_json
+
+INDEX_FILE = "index.json"
+DAYS_DIR = "days"
+LEGACY_FILE = "messages.json"
+
+
+def ts_day(ts: str) -> str:
+    """Return the UTC day (YYYY-MM-DD) a Slack timestamp falls on."""
+    return datetime.fromtimestamp(float(ts), tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def merge_message(stored: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """
+    Merge a re-fetched message into its stored copy.
+
+    Top-level fields take the new values (edits, reactions, reply counts).
+    Replies are unioned by ts, since an incremental fetch only returns
+    replies posted after the last sync.
+    """
+    replies = {r["ts"]: r for r in stored.get("replies", [])}
+    replies.update((r["ts"], r) for r in new.get("replies", []))
+    merged = dict(new)
+    merged["replies"] = sorted(replies.values(), key=lambda r: float(r["ts"]))
+    return merged
+
+
+class SlackMessageStore:
+    """Per-day JSONL segments for one channel, merged by message ts."""
+
+    def __init__(self, channel_dir: Path, channel: str = "",
+                 channel_id: str = ""):
+        self.channel_dir = channel_dir
+        self.days_dir = channel_dir / DAYS_DIR
+        self.index_path = channel_dir / INDEX_FILE
+        self.index: dict[str, Any] = {
+            "channel": channel,
+            "channel_id": channel_id,
+            "days": {},
+        }
+        if self.index_path.exists():
+            self.index.update(load_json(self.index_path))
+        # Last day merged into, so a streaming sync that appends page after
+        # page to the same day doesn't re-read its segment every time
+        self._cached_day: tuple[str, dict[str, dict[str, Any]]] | None = None
+        if channel:
+            self.index["channel"] = channel
+        if channel_id:
+            self.index["channel_id"] = channel_id
+        self._index_orphans()
+
+    def _index_orphans(self) -> None:
+        """
+        Index any day segment that index.json doesn't list. A run that stops
+        between appending and save_index() leaves these behind, and merge()
+        alone wouldn't list them: their re-fetched messages are unchanged.
+        """
+        if not self.days_dir.is_dir():
+            return
+        for path in self.days_dir.glob("*.jsonl"):
+            day = path.stem
+            if day in self.index["days"]:
+                continue
+            with open(path, "rb") as f:
+                lines = sum(1 for line in f if line.strip())
+            records = self.load_day(day)
+            if records:
+                self.index["days"][day] = {"lines": lines}
+                self._index_day(day, records)
+
+    def _index_day(self, day: str, records: dict[str, dict[str, Any]]) -> None:
+        """Refresh a day's message count and ts range from its live records."""
+        entry = self.index["days"].setdefault(day, {"lines": len(records)})
+        entry["messages"] = len(records)
+        all_ts = sorted(records, key=float)
+        entry["first_ts"], entry["last_ts"] = all_ts[0], all_ts[-1]
+
+    def _segment(self, day: str) -> Path:
+        return self.days_dir / f"{day}.jsonl"
+
+    def load_day(self, day: str) -> dict[str, dict[str, Any]]:
+        """Return the live messages of one day, keyed by ts (last line wins)."""
+        records: dict[str, dict[str, Any]] = {}
+        path = self._segment(day)
+        if path.exists():
+            with open(path, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        record = json_loads(line)
+                        records[record["ts"]] = record
+        return records
+
+    def merge(self, messages: Iterable[dict[str, Any]]) -> tuple[int, int]:
+        """
+        Append new and changed messages to their day segments.
+
+        Unchanged re-fetches are skipped. Returns (added, updated) counts.
+        """
+        by_day: dict[str, list[dict[str, Any]]] = {}
+        for msg in messages:
+            if msg.get("ts"):
+                by_day.setdefault(ts_day(msg["ts"]), []).append(msg)
+
+        added = updated = 0
+        self.days_dir.mkdir(parents=True, exist_ok=True)
+
+        for day, day_messages in by_day.items():
+            if self._cached_day and self._cached_day[0] == day:
+                stored = self._cached_day[1]
+            else:
+                stored = self.load_day(day)
+            self._cached_day = (day, stored)
+            lines: list[bytes] = []
+            for msg in day_messages:
+                previous = stored.get(msg["ts"])
+                if previous is None:
+                    record = msg
+                    added += 1
+                else:
+                    record = merge_message(previous, msg)
+                    if record == previous:
+                        continue
+                    updated += 1
+                stored[msg["ts"]] = record
+                lines.append(json_dumps(record, compact=True) + b"\n")
+
+            if lines:
+                with open(self._segment(day), "ab") as f:
+                    f.writelines(lines)
+                self.index["days"].setdefault(day, {"lines": 0})["lines"] += len(lines)
+            if not stored:
+                continue
+            # Refreshed even when nothing was appended, in case a run stopped
+            # between appending to this day and save_index()
+            self._index_day(day, stored)
+            entry = self.index["days"][day]
+
+            # Superseded lines outnumber live ones: rewrite the segment
+            if entry["lines"] > 2 * entry["messages"]:
+                self._compact(day, stored)
+
+        return added, updated
+
+    def _compact(self, day: str, records: dict[str, dict[str, Any]]) -> None:
+        """Rewrite a day segment with one line per live message, in ts order."""
+        path = self._segment(day)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            for ts in sorted(records, key=float):
+                f.write(json_dumps(records[ts], compact=True) + b"\n")
+        os.replace(tmp_path, path)
+        self.index["days"][day]["lines"] = len(records)
+
+    def iter_window(self, since_unix: float) -> Iterator[dict[str, Any]]:
+        """Yield stored messages with ts >= since_unix, oldest first."""
+        since_day = datetime.fromtimestamp(
+            since_unix, tz=timezone.utc).strftime("%Y-%m-%d")
+        for day in sorted(self.index["days"]):
+            if day < since_day:
+                continue
+            records = self.load_day(day)
+            for ts in sorted(records, key=float):
+                if float(ts) >= since_unix:
+                    yield records[ts]
+
+    def read_window(self, lookback_days: int) -> dict[str, Any]:
+        """Return the lookback window in the legacy messages.json shape."""
+        since = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+        messages = list(self.iter_window(since.timestamp()))
+        return {
+            "channel": self.index["channel"],
+            "channel_id": self.index["channel_id"],
+            "messages": messages,
+            "message_count": len(messages),
+        }
+
+    def save_index(self) -> None:
+        """Write index.json."""
+        self.index["updated_at"] = iso_now()
+        self.index["total_messages"] = sum(
+            d["messages"] for d in self.index["days"].values())
+        save_json(self.index, self.index_path)
+
+    def migrate_legacy(self) -> int:
+        """
+        Import a pre-store messages.json into the segments, then remove it.
+
+        Returns the number of messages imported (0 if there was no file).
+        """
+        legacy = self.channel_dir / LEGACY_FILE
+        if not legacy.exists():
+            return 0
+        messages = load_json(legacy).get("messages", [])
+        added, updated = self.merge(messages)
+        self.save_index()
+        legacy.unlink()
+        return added + updated
+
+
+def main() -> None:
+    """Print a channel's lookback window as JSON."""
+    parser = argparse.ArgumentParser(
+        description="Print a channel's stored Slack messages as JSON")
+    parser.add_argument("channel", help="Channel name (directory under Synced-Data/Slack)")
+    parser.add_argument("--days", type=int, default=7,
+                        help="Lookback window in days (default: 7)")
+    args = parser.parse_args()
+
+    channel_dir = SLACK_DIR / args.channel
+    if not (channel_dir / INDEX_FILE).exists():
+        print(f"ERROR: No stored messages for channel '{args.channel}'",
+              file=sys.stderr)
+        sys.exit(1)
+
+    store = SlackMessageStore(channel_dir)
+    json.dump(store.read_window(args.days), sys.stdout, indent=2,
+              ensure_ascii=False)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,14 +5,26 @@ GitHub Activity Sync Script
 Fetches merged PRs authored by team members over a configurable lookback period.
 Team membership and GitHub handles are read from Curated-Context stubs.
 
-Uses the GitHub Search API with a Personal Access Token for authentication.
+Uses the GitHub Search API with a Personal Access Token for authentication,
+through REST search/issues or, with `"backend": "graphql"` in the github
+config section, the GraphQL API. GraphQL returns the repository, additions,
+deletions and review counts with each PR and has its own rate-limit budget.
+
+Runs are incremental: merged PRs are kept in a local store (see
+github_store.py) and each member is searched only from their last
+watermark. index.json and INDEX.md are rendered from the store.
 
 Usage:
-    python sync_github.py [--lookback DAYS] [--team TEAM_NAME] [--debug]
+    python sync_github.py [--lookback DAYS] [--team TEAM_NAME] [--full] [--async]
+                          [--backend rest|graphql] [--no-index] [--debug]
 
 Options:
     --lookback DAYS     Override the default 14-day lookback window
     --team TEAM_NAME    Sync only a specific team (for testing)
+    --full              Refetch the whole lookback window, ignoring watermarks
+    --async             Run the batched member searches concurrently (async engine)
+    --backend API       Search with the REST search API (default) or GraphQL
+    --no-index          Don't update the search index afterwards (run_daily.py does it once)
     --debug             Verbose output including API responses
 
 Required Environment Variables:
@@ -21,25 +33,38 @@ Required Environment Variables:
 """
 
 import argparse
+import functools
 import json
 import os
 import re
 import sys
+import threading
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
-import requests
-import yaml
 from dotenv import load_dotenv
 
+from curated_index import CuratedIndex
+from github_store import GitHubPRStore, pr_key
+from search_index import update_index
 from utils import (
     GITHUB_DIR,
     CURATED_DIR,
+    JIRA_KEY_RE,
+    AsyncEngine,
+    HTTPSession,
+    batched_fsync,
+    configure_http,
+    configure_storage,
+    get_session,
     load_config,
     save_config,
     save_json,
+    save_text,
+    write_stats,
     iso_now,
+    response_json,
     RateLimiter,
     with_retry,
 )
@@ -50,11 +75,59 @@ load_dotenv(Path(__file__).parent / ".env")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GITHUB_API_BASE = "https://api.github.com"
 
-# GitHub search API allows 30 requests/minute for authenticated users
-rate_limiter = RateLimiter(calls_per_second=0.5)
+# GitHub search API allows 30 requests/minute for authenticated users. The
+# bucket allows short bursts; X-RateLimit-Remaining/Reset on each response
+# pace the rest of the window and pause until reset when it runs out.
+rate_limiter = RateLimiter(calls_per_second=0.5, burst=10)
+
+# GitHub rejects search queries longer than 256 characters; members are
+# searched in batches of as many author: qualifiers as fit
+MAX_QUERY_LENGTH = 256
+
+# Search returns at most 1000 results per query, however many pages are read
+SEARCH_RESULT_CAP = 1000
+SEARCH_PAGE_SIZE = 100
+
+# GraphQL endpoint; set github.graphql_url in config.json to point at a
+# GitHub Enterprise server or a local stub
+GRAPHQL_URL = f"{GITHUB_API_BASE}/graphql"
+
+# The GraphQL API has its own hourly point budget (5000 for most tokens);
+# searches cost about a point per page. X-RateLimit-* headers on responses
+# pace requests; below this many points left, queries wait for the reset.
+graphql_rate_limiter = RateLimiter(calls_per_second=1.0, burst=10)
+GRAPHQL_MIN_REMAINING = 50
+
+PR_SEARCH_QUERY = """
+query($q: String!, $first: Int!, $after: String) {
+  rateLimit { cost remaining resetAt }
+  search(query: $q, type: ISSUE, first: $first, after: $after) {
+    issueCount
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on PullRequest {
+        number
+        title
+        url
+        createdAt
+        mergedAt
+        additions
+        deletions
+        author { login }
+        repository { nameWithOwner }
+        labels(first: 50) { nodes { name } }
+        comments { totalCount }
+        reviews { totalCount }
+      }
+    }
+  }
+}
+"""
 
-# Regex for Jira keys in PR titles
-JIRA_KEY_RE = re.compile(r"[A-Z][A-Z0-9]+-\d+")
+@functools.cache
+def github_session() -> HTTPSession:
+    """Return the pooled GitHub session, with auth headers set once."""
+    return get_session(GITHUB_API_BASE, headers=get_headers())
 
 
 def get_headers() -> dict[str, str]:
@@ -83,108 +156,287 @@ def github_search_prs(
     if debug:
         print(f"    API: {url}?q={query}&page={page}&per_page={per_page}")
 
-    response = requests.get(url, headers=get_headers(), params=params)
+    response = github_session().get(url, params=params)
+    rate_limiter.observe(response)
 
     if response.status_code == 422:
         print("    WARNING: Search query validation failed (422)")
         if debug:
             print(f"    Response: {response.text[:500]}")
-        return {"total_count": 0, "items": []}
+        return {"total_count": 0, "items": [], "failed": True}
 
     if response.status_code != 200:
         print(f"    ERROR: GitHub API returned {response.status_code}")
         if debug:
             print(f"    Response: {response.text[:500]}")
-        return {"total_count": 0, "items": []}
+        return {"total_count": 0, "items": [], "failed": True}
+
+    return response_json(response)
+
+
+class GraphQLBudget:
+    """Running total of GraphQL rate-limit points, from each response's rateLimit field."""
+
+    def __init__(self):
+        self.requests = 0
+        self.cost = 0
+        self.remaining: int | None = None
+        self.reset_at: str | None = None
+        self._lock = threading.Lock()
+
+    def observe(self, rate_limit: dict[str, Any] | None) -> None:
+        """Record one response's rateLimit {cost, remaining, resetAt}."""
+        if not rate_limit:
+            return
+        with self._lock:
+            self.requests += 1
+            self.cost += rate_limit.get("cost", 0)
+            self.remaining = rate_limit.get("remaining", self.remaining)
+            self.reset_at = rate_limit.get("resetAt", self.reset_at)
+        low = self.remaining is not None and self.remaining < GRAPHQL_MIN_REMAINING
+        if low and self.reset_at:
+            # Out of points: hold further queries until the hourly window resets
+            reset = datetime.fromisoformat(self.reset_at.replace("Z", "+00:00"))
+            wait = (reset - datetime.now(timezone.utc)).total_seconds()
+            if wait > 0:
+                print(f"    GraphQL budget low ({self.remaining} points), "
+                      f"pausing {wait:.0f}s until reset")
+                graphql_rate_limiter.defer(wait)
+
+    def report(self) -> str:
+        """Summarise point usage for this run."""
+        remaining = "unknown" if self.remaining is None else self.remaining
+        return (f"GraphQL: {self.requests} queries, {self.cost} points used, "
+                f"{remaining} remaining (resets {self.reset_at or 'unknown'})")
+
+
+graphql_budget = GraphQLBudget()
 
-    return response.json()
 
+@with_retry(max_attempts=3, initial_delay=2.0)
+def github_graphql(
+    query: str, variables: dict[str, Any], debug: bool = False
+) -> dict[str, Any]:
+    """Run a GraphQL query and return its data (empty on errors)."""
+    graphql_rate_limiter.wait()
+    if debug:
+        print(f"    GraphQL: {GRAPHQL_URL} q={variables.get('q')} after={variables.get('after')}")
 
-def parse_front_matter(text: str) -> dict[str, Any]:
-    """Parse YAML front-matter from a markdown file."""
-    text = text.strip()
-    if not text.startswith("---"):
-        return {}
-    parts = text.split("---", 2)
-    if len(parts) < 3:
-        return {}
-    try:
-        return yaml.safe_load(parts[1]) or {}
-    except yaml.YAMLError:
+    response = get_session(GRAPHQL_URL, headers=get_headers()).post(
+        GRAPHQL_URL, json={"query": query, "variables": variables}
+    )
+    graphql_rate_limiter.observe(response)
+
+    if response.status_code != 200:
+        print(f"    ERROR: GitHub GraphQL API returned {response.status_code}")
+        if debug:
+            print(f"    Response: {response.text[:500]}")
         return {}
 
+    body = response_json(response)
+    data = body.get("data") or {}
+    graphql_budget.observe(data.get("rateLimit"))
+    for error in body.get("errors") or []:
+        print(f"    WARNING: GraphQL error: {error.get('message', error)}")
+    return data
+
 
-def parse_team_members(team_name: str) -> list[str]:
+def parse_team_members(team_name: str, index: CuratedIndex) -> list[str]:
     """
-    Read a team stub and return the list of member names from the ## Members section.
+    Return the member names from the ## Members section of a team stub.
     Names are extracted from wikilinks: [[Full Name]] or [[Full Name|Alias]].
     """
-    team_file = CURATED_DIR / "Teams" / f"{team_name}.md"
-    if not team_file.exists():
-        print(f"  WARNING: Team stub not found: {team_file}")
+    members = index.team_members(team_name)
+    if members is None:
+        print(f"  WARNING: Team stub not found: {CURATED_DIR / 'Teams' / f'{team_name}.md'}")
         return []
-
-    content = team_file.read_text(encoding="utf-8")
-    members: list[str] = []
-    in_members_section = False
-
-    for line in content.splitlines():
-        if line.strip().startswith("## Members"):
-            in_members_section = True
-            continue
-        if in_members_section:
-            if line.strip().startswith("## "):
-                break
-            match = re.search(r"\[\[([^\]|]+)", line)
-            if match:
-                members.append(match.group(1).strip())
-
     return members
 
 
-def resolve_github_handle(member_name: str) -> dict[str, str | None]:
+def resolve_github_handle(member_name: str, index: CuratedIndex) -> dict[str, str | None]:
     """
-    Read a person stub and extract the github handle from front-matter.
+    Look up the github handle in a person stub's front-matter.
     Returns {"name": ..., "github": ...} or {"name": ..., "github": None}.
     """
-    person_file = CURATED_DIR / "People" / f"{member_name}.md"
-    if not person_file.exists():
-        print(f"    WARNING: Person stub not found: {person_file}")
+    fm = index.person(member_name)
+    if fm is None:
+        print(f"    WARNING: Person stub not found: {CURATED_DIR / 'People' / f'{member_name}.md'}")
         return {"name": member_name, "github": None}
-
-    content = person_file.read_text(encoding="utf-8")
-    fm = parse_front_matter(content)
     return {"name": member_name, "github": fm.get("github")}
 
 
-def fetch_merged_prs(
-    org: str, handle: str, cutoff_date: str, debug: bool = False
-) -> list[dict[str, Any]]:
+def author_batches(handles: list[str], base_query: str) -> list[list[str]]:
     """
-    Fetch all merged PRs for a user in the org since the cutoff date.
-    Handles pagination for users with many PRs.
+    Pack handles into groups whose combined author: qualifiers keep
+    base_query within GitHub's query length limit.
     """
-    all_items: list[dict[str, Any]] = []
+    batches: list[list[str]] = []
+    batch: list[str] = []
+    length = len(base_query)
+    for handle in handles:
+        qualifier = len(f" author:{handle}")
+        if batch and length + qualifier > MAX_QUERY_LENGTH:
+            batches.append(batch)
+            batch, length = [], len(base_query)
+        batch.append(handle)
+        length += qualifier
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def merged_range(cutoff_date: str, until: str | None) -> str:
+    """Search qualifier for PRs merged on or after cutoff_date (and up to until, if given)."""
+    return f"merged:{cutoff_date}..{until}" if until else f"merged:>={cutoff_date}"
+
+
+class SearchFailed(Exception):
+    """A search page couldn't be fetched, so the results are incomplete."""
+
+
+def rest_search_pages(
+    query: str, debug: bool = False
+) -> Iterator[tuple[int, list[dict[str, Any]]]]:
+    """Yield (total_count, items) for each page of a REST search."""
     page = 1
-    per_page = 100
+    while True:
+        data = github_search_prs(query, per_page=SEARCH_PAGE_SIZE, page=page, debug=debug)
+        if data.get("failed"):
+            raise SearchFailed(query)
+        items = data.get("items", [])
+        yield data.get("total_count", 0), items
+        if len(items) < SEARCH_PAGE_SIZE:
+            return
+        page += 1
 
-    query = f"is:pr is:merged org:{org} author:{handle} merged:>={cutoff_date}"
 
+def graphql_search_pages(
+    query: str, debug: bool = False
+) -> Iterator[tuple[int, list[dict[str, Any]]]]:
+    """Yield (issueCount, PR nodes) for each page of a GraphQL search, following cursors."""
+    cursor = None
     while True:
-        data = github_search_prs(query, per_page=per_page, page=page, debug=debug)
-        items = data.get("items", [])
-        all_items.extend(items)
+        data = github_graphql(
+            PR_SEARCH_QUERY,
+            {"q": query, "first": SEARCH_PAGE_SIZE, "after": cursor},
+            debug=debug,
+        )
+        search = data.get("search")
+        if search is None:
+            raise SearchFailed(query)
+        # Non-PR results come back as empty objects
+        nodes = [node for node in search.get("nodes") or [] if node]
+        yield search.get("issueCount", 0), nodes
+        page_info = search.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            return
+        cursor = page_info.get("endCursor")
 
-        if debug:
-            print(f"    Got {len(items)} items (total_count: {data.get('total_count', 0)})")
 
-        total_count = data.get("total_count", 0)
-        if len(all_items) >= total_count or len(items) < per_page:
-            break
+SEARCH_BACKENDS = {"rest": rest_search_pages, "graphql": graphql_search_pages}
 
-        page += 1
 
-    return all_items
+def pr_author_login(item: dict[str, Any]) -> str:
+    """Login of a search result's author (REST item or GraphQL node)."""
+    author = item.get("user") or item.get("author") or {}
+    return author.get("login", "")
+
+
+def fetch_merged_prs(
+    org: str, handles: list[str], cutoff_date: str, debug: bool = False,
+    until: str | None = None, backend: str = "rest",
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Fetch all merged PRs in the org since the cutoff date for a batch of users,
+    with one search for the whole batch (author: qualifiers are ORed).
+
+    Search returns at most 1000 results per query. A batch whose total_count
+    exceeds that is split in half and each half searched separately; a single
+    user over the cap has their date range split instead. A failed search
+    for a batch is retried the same way, in halves, so one bad handle (a
+    renamed or deleted account makes GitHub reject the whole query with
+    422) only loses that member. Returns the raw search results (REST
+    items or GraphQL nodes, per backend) keyed by handle. Handles whose
+    search failed are left out, so the caller can tell an empty result
+    from a missing one.
+    """
+    query = " ".join(
+        ["is:pr is:merged", f"org:{org}"]
+        + [f"author:{handle}" for handle in handles]
+        + [merged_range(cutoff_date, until)]
+    )
+
+    def split_batch() -> dict[str, list[dict[str, Any]]]:
+        mid = len(handles) // 2
+        return {
+            **fetch_merged_prs(org, handles[:mid], cutoff_date, debug, until, backend),
+            **fetch_merged_prs(org, handles[mid:], cutoff_date, debug, until, backend),
+        }
+
+    pages = SEARCH_BACKENDS[backend](query, debug=debug)
+    try:
+        total_count, items = next(pages)
+    except SearchFailed:
+        if len(handles) > 1:
+            print(f"    Search failed for {len(handles)} authors, retrying in halves")
+            return split_batch()
+        return {}
+
+    if total_count > SEARCH_RESULT_CAP:
+        if len(handles) > 1:
+            if debug:
+                print(f"    {total_count} results for {len(handles)} authors, splitting batch")
+            return split_batch()
+        start = datetime.strptime(cutoff_date, "%Y-%m-%d")
+        if until:
+            end = datetime.strptime(until, "%Y-%m-%d")
+        else:
+            end = datetime.now(timezone.utc).replace(tzinfo=None)
+        if end.date() > start.date():
+            mid_date = start + (end - start) / 2
+            if debug:
+                print(
+                    f"    {total_count} results for {handles[0]}, "
+                    f"splitting {cutoff_date}..{end:%Y-%m-%d}"
+                )
+            first = fetch_merged_prs(
+                org, handles, cutoff_date, debug, f"{mid_date:%Y-%m-%d}", backend
+            )
+            second = fetch_merged_prs(
+                org, handles, f"{mid_date + timedelta(days=1):%Y-%m-%d}", debug,
+                f"{end:%Y-%m-%d}", backend,
+            )
+            if handles[0] not in first or handles[0] not in second:
+                return {}
+            return {handles[0]: first[handles[0]] + second[handles[0]]}
+        print(f"    WARNING: {handles[0]} has {total_count} PRs merged on {cutoff_date}; "
+              f"only the first {SEARCH_RESULT_CAP} are available")
+
+    all_items: list[dict[str, Any]] = list(items)
+    if debug:
+        print(f"    Got {len(items)} items (total_count: {total_count})")
+    if len(all_items) < min(total_count, SEARCH_RESULT_CAP):
+        try:
+            for _, items in pages:
+                all_items.extend(items)
+                if debug:
+                    print(f"    Got {len(items)} items (total_count: {total_count})")
+                if len(all_items) >= min(total_count, SEARCH_RESULT_CAP):
+                    break
+        except SearchFailed:
+            if len(handles) > 1:
+                print(f"    Search failed for {len(handles)} authors, retrying in halves")
+                return split_batch()
+            return {}
+
+    # Fan results back out to authors (logins are case-insensitive)
+    by_login = {handle.lower(): handle for handle in handles}
+    prs: dict[str, list[dict[str, Any]]] = {handle: [] for handle in handles}
+    for item in all_items:
+        handle = by_login.get(pr_author_login(item).lower())
+        if handle:
+            prs[handle].append(item)
+    return prs
 
 
 def extract_pr_data(
@@ -221,6 +473,38 @@ def extract_pr_data(
     }
 
 
+def extract_graphql_pr_data(
+    node: dict[str, Any], author_name: str, team: str
+) -> dict[str, Any]:
+    """
+    Extract structured PR data from a GraphQL PullRequest node.
+
+    Same schema as extract_pr_data, plus additions, deletions and reviews.
+    """
+    title = node.get("title", "")
+    return {
+        "number": node.get("number"),
+        "repo": (node.get("repository") or {}).get("nameWithOwner", "").lower(),
+        "title": title,
+        "author": pr_author_login(node),
+        "author_name": author_name,
+        "team": team,
+        "state": "merged",
+        "created_at": node.get("createdAt"),
+        "merged_at": node.get("mergedAt"),
+        "url": node.get("url", ""),
+        "jira_keys": JIRA_KEY_RE.findall(title),
+        "labels": [label.get("name", "") for label in (node.get("labels") or {}).get("nodes", [])],
+        "comments": (node.get("comments") or {}).get("totalCount", 0),
+        "additions": node.get("additions"),
+        "deletions": node.get("deletions"),
+        "reviews": (node.get("reviews") or {}).get("totalCount", 0),
+    }
+
+
+PR_EXTRACTORS = {"rest": extract_pr_data, "graphql": extract_graphql_pr_data}
+
+
 def generate_index_md(
     org: str,
     lookback_days: int,
@@ -277,8 +561,8 @@ def generate_index_md(
     return "\n".join(lines)
 
 
-def main() -> None:
-    """Main entry point."""
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    """Main entry point. Returns PR counts for run_daily.py."""
     parser = argparse.ArgumentParser(description="Sync GitHub activity for team members")
     parser.add_argument(
         "--lookback",
@@ -290,16 +574,47 @@ def main() -> None:
         type=str,
         help="Sync only a specific team (for testing)",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Refetch the whole lookback window for every member, ignoring watermarks",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Run the batched member searches concurrently with the async engine",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(SEARCH_BACKENDS),
+        help="Search API to use (default: github.backend in config, else rest)",
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
         help="Verbose output including API responses",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Don't update the search index afterwards",
+    )
+    args = parser.parse_args(argv)
 
     config = load_config()
+    configure_http(config.get("http"))
+    configure_storage(config.get("storage"))
     gh_config = config.setdefault("github", {})
 
+    global GRAPHQL_URL
+    GRAPHQL_URL = gh_config.get("graphql_url", GRAPHQL_URL)
+    backend = args.backend or gh_config.get("backend", "rest")
+    if backend not in SEARCH_BACKENDS:
+        print(f"ERROR: Unknown github.backend '{backend}' "
+              f"(expected one of: {', '.join(SEARCH_BACKENDS)})")
+        sys.exit(1)
+
     org = gh_config.get("org", "galactic-empire")
     teams = gh_config.get("teams", [])
     lookback_days = args.lookback or gh_config.get("lookback_days", 14)
@@ -322,16 +637,19 @@ def main() -> None:
     print(f"  Org: {org}")
     print(f"  Teams: {', '.join(teams)}")
     print(f"  Lookback: {lookback_days} days (since {cutoff_date})")
+    print(f"  Backend: {backend}")
 
     # Phase 1: Resolve team members and GitHub handles
     all_members: list[dict[str, str | None]] = []
     member_team_map: dict[str, str] = {}  # github_handle -> team_name
     skipped = 0
 
+    index = CuratedIndex(CURATED_DIR).refresh()
+    print(f"  {index.report()}")
     for team_name in teams:
-        member_names = parse_team_members(team_name)
+        member_names = parse_team_members(team_name, index)
         for name in member_names:
-            info = resolve_github_handle(name)
+            info = resolve_github_handle(name, index)
             if info["github"]:
                 all_members.append(info)
                 member_team_map[info["github"]] = team_name
@@ -345,54 +663,111 @@ def main() -> None:
         print("ERROR: No members with GitHub handles found")
         sys.exit(1)
 
-    # Phase 2: Fetch merged PRs per member
-    all_prs: list[dict[str, Any]] = []
-    prs_by_team: dict[str, list[dict[str, Any]]] = {t: [] for t in teams}
-    member_summaries: list[dict[str, Any]] = []
-
+    # Phase 2: Fetch PRs merged since each member's watermark, several members per search
+    GITHUB_DIR.mkdir(parents=True, exist_ok=True)
+    store = GitHubPRStore(GITHUB_DIR)
+    store.pr_dir.mkdir(parents=True, exist_ok=True)
+    if store.meta.get("org") not in (None, org):
+        print(f"  Org changed from {store.meta['org']}: clearing the PR store")
+        store.clear()
+
+    synced_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    handles = list(dict.fromkeys(m["github"] for m in all_members))
+    handles_by_since: dict[str, list[str]] = {}
+    for handle in handles:
+        since = cutoff_date if args.full else store.fetch_since(handle, cutoff_date)
+        handles_by_since.setdefault(since, []).append(handle)
+
+    batches = [
+        (since, batch)
+        for since, group in sorted(handles_by_since.items())
+        for batch in author_batches(
+            group, f"is:pr is:merged org:{org} {merged_range(since, None)}"
+        )
+    ]
+    incremental = sum(len(g) for since, g in handles_by_since.items() if since > cutoff_date)
+    print(
+        f"  Fetching PRs for {len(all_members)} members in {len(batches)} batched searches "
+        f"({incremental} incremental, {len(handles) - incremental} full window)..."
+    )
+    if args.use_async:
+        engine = AsyncEngine(default_limit=gh_config.get("async_concurrency", 4))
+        results = engine.map(
+            GITHUB_API_BASE,
+            lambda job: fetch_merged_prs(
+                org, job[1], job[0], debug=args.debug, backend=backend
+            ),
+            batches,
+        )
+    else:
+        results = [
+            fetch_merged_prs(org, batch, since, debug=args.debug, backend=backend)
+            for since, batch in batches
+        ]
+    raw_prs_by_member: dict[str, list[dict[str, Any]]] = {}
+    for result in results:
+        raw_prs_by_member.update(result)
+
+    new_prs = failed = 0
     for member in all_members:
         handle = member["github"]
-        name = member["name"]
-        team = member_team_map[handle]
-
-        print(f"  Fetching PRs for {handle}...", end=" ", flush=True)
-        raw_prs = fetch_merged_prs(org, handle, cutoff_date, debug=args.debug)
-        print(f"{len(raw_prs)} PRs")
-
-        member_pr_list: list[dict[str, Any]] = []
+        raw_prs = raw_prs_by_member.get(handle)
+        if raw_prs is None:
+            print(f"  {handle}: search failed, keeping previous watermark")
+            failed += 1
+            continue
         for item in raw_prs:
-            pr_data = extract_pr_data(item, name, team)
-            all_prs.append(pr_data)
-            prs_by_team[team].append(pr_data)
-            member_pr_list.append(pr_data)
+            pr_data = PR_EXTRACTORS[backend](item, member["name"], member_team_map[handle])
+            new_prs += store.put(pr_data)
+        store.advance(handle, cutoff_date, synced_date)
 
+    retention_date = (
+        datetime.now(timezone.utc)
+        - timedelta(days=max(lookback_days, gh_config.get("lookback_days", 14)))
+    ).strftime("%Y-%m-%d")
+    evicted = store.evict_before(retention_date)
+    print(f"  New PRs: {new_prs}, evicted {evicted} merged before {retention_date}")
+    if backend == "graphql":
+        print(f"  {graphql_budget.report()}")
+
+    # Phase 3: Render the lookback window from the store
+    members = {
+        m["github"].lower(): {"name": m["name"], "team": member_team_map[m["github"]]}
+        for m in all_members
+    }
+    all_prs = store.window(cutoff_date, members)
+    prs_by_team: dict[str, list[dict[str, Any]]] = {t: [] for t in teams}
+    pr_counts: dict[str, int] = {}
+    for pr in all_prs:
+        prs_by_team[pr["team"]].append(pr)
+        pr_counts[pr["author"].lower()] = pr_counts.get(pr["author"].lower(), 0) + 1
+        if pr != store.prs[pr_key(pr)]:
+            # Member changed name or team since the PR was stored
+            store.put(pr)
+
+    member_summaries: list[dict[str, Any]] = []
+    for member in all_members:
+        handle = member["github"]
+        print(f"  {handle}: {pr_counts.get(handle.lower(), 0)} PRs")
         member_summaries.append({
             "github": handle,
-            "name": name,
-            "team": team,
-            "pr_count": len(member_pr_list),
+            "name": member["name"],
+            "team": member_team_map[handle],
+            "pr_count": pr_counts.get(handle.lower(), 0),
         })
 
     print(f"  Total PRs: {len(all_prs)}")
 
-    # Phase 3: Write output
-    GITHUB_DIR.mkdir(parents=True, exist_ok=True)
-    pr_dir = GITHUB_DIR / "pull-requests"
-    pr_dir.mkdir(parents=True, exist_ok=True)
-
     synced_at = iso_now()
-
-    # _meta.json
-    meta = {
-        "org": org,
-        "teams": teams,
-        "lookback_days": lookback_days,
-        "last_synced": synced_at,
-        "total_prs": len(all_prs),
-        "members_synced": len(all_members),
-        "members_skipped": skipped,
-    }
-    save_json(meta, GITHUB_DIR / "_meta.json")
+    store.save(
+        org=org,
+        teams=teams,
+        lookback_days=lookback_days,
+        last_synced=synced_at,
+        total_prs=len(all_prs),
+        members_synced=len(all_members) - failed,
+        members_skipped=skipped,
+    )
 
     # index.json (compact)
     index_data = {
@@ -413,7 +788,7 @@ def main() -> None:
                 "jira_keys": pr["jira_keys"],
                 "url": pr["url"],
             }
-            for pr in sorted(all_prs, key=lambda p: p.get("merged_at") or "", reverse=True)
+            for pr in all_prs
         ],
     }
     save_json(index_data, GITHUB_DIR / "index.json")
@@ -428,21 +803,21 @@ def main() -> None:
         total_prs=len(all_prs),
         total_members=len(all_members),
     )
-    (GITHUB_DIR / "INDEX.md").write_text(index_md, encoding="utf-8")
-
-    # Individual PR files
-    for pr in all_prs:
-        repo_slug = pr["repo"].replace("/", "_")
-        save_json(pr, pr_dir / f"{repo_slug}_{pr['number']}.json")
+    save_text(index_md, GITHUB_DIR / "INDEX.md")
 
     # Update config
     gh_config["last_synced"] = synced_at
     gh_config["total_prs"] = len(all_prs)
     save_config(config)
+    if config.get("search", {}).get("enabled", True) and not args.no_index:
+        update_index(["github"])
 
     print(f"  Output: Synced-Data/GitHub/")
+    print(f"  {write_stats().report()}")
     print("GitHub sync complete")
+    return {"prs": len(all_prs), "new_prs": new_prs, "members_failed": failed}
 
 
 if __name__ == "__main__":
-    main()
+    with batched_fsync():
+        main()
@@ -5,12 +5,25 @@ Jira Issue Hierarchy Sync Script
 Fetches the entire issue hierarchy under a root issue and stores as JSON files.
 Converts Atlassian Document Format (ADF) descriptions to Markdown.
 
+After the first full sync, runs are incremental: only issues updated since
+the last sync are fetched and patched into the local store (see
+jira_store.py), and deleted or re-parented issues are detected with a
+parent-only bulk fetch.
+
+With `"database": true` in the jira config section, issues are also kept
+in a SQLite database with full-text search (see jira_db.py).
+
 Usage:
-    python sync_jira.py [--root ISSUE_KEY] [--full]
+    python sync_jira.py [--root ISSUE_KEY] [--full] [--workers N] [--reindex] [--measure-fields]
+                        [--no-index]
 
 Options:
     --root ISSUE_KEY    Override root issue from config (e.g., GOAL-54)
-    --full              Force full sync (currently always does full sync)
+    --full              Refetch the whole hierarchy instead of only changes
+    --workers N         Concurrent Jira requests during traversal (default: 4)
+    --reindex           Regenerate index.json and INDEX.md from the local store (no network)
+    --measure-fields    Report bytes/decode time saved by requesting only parsed fields
+    --no-index          Don't update the search index afterwards (run_daily.py does it once)
 
 Required Environment Variables:
     JIRA_EMAIL          Your Atlassian account email
@@ -19,22 +32,41 @@ Required Environment Variables:
 """
 
 import argparse
+import asyncio
+import functools
+import math
 import os
+import re
 import sys
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 from collections import defaultdict
 
 import requests
 from dotenv import load_dotenv
 
+from jira_db import DB_FILE, JiraIssueDB
+from jira_store import JiraIssueStore
+from search_index import update_index
 from utils import (
     JIRA_DIR,
+    AsyncEngine,
+    HTTPSession,
+    batched_fsync,
+    configure_http,
+    configure_storage,
+    get_session,
     load_config,
     save_config,
     save_json,
+    save_text,
+    write_stats,
     iso_now,
+    json_loads,
+    response_json,
     RateLimiter,
     with_retry,
 )
@@ -46,8 +78,21 @@ JIRA_EMAIL = os.getenv("JIRA_EMAIL")
 JIRA_API_TOKEN = os.getenv("JIRA_API_TOKEN")
 JIRA_BASE_URL = os.getenv("JIRA_BASE_URL", "").rstrip("/")
 
-# Rate limiter (~10 requests per second)
-rate_limiter = RateLimiter(calls_per_second=10.0)
+# Rate limiter (~10 requests per second, short bursts allowed); slows down
+# when Jira signals X-RateLimit-NearLimit or Retry-After
+rate_limiter = RateLimiter(calls_per_second=10.0, burst=5)
+
+# Parent keys per "parent in (...)" search (larger batches hit HTTP 413)
+CHILD_BATCH_SIZE = 100
+
+# Concurrent Jira requests during traversal (override with jira.workers)
+DEFAULT_WORKERS = 4
+
+# Deepest hierarchy level fetched below the roots
+MAX_DEPTH = 10
+
+# Overlap added to the incremental window, for clock skew between us and Jira
+WATERMARK_MARGIN_MINUTES = 10
 
 
 def get_auth() -> tuple[str, str]:
@@ -60,17 +105,24 @@ def get_auth() -> tuple[str, str]:
     return (JIRA_EMAIL, JIRA_API_TOKEN)
 
 
+@functools.cache
+def jira_session() -> HTTPSession:
+    """Return the pooled Jira session, with auth and headers set once."""
+    return get_session(
+        JIRA_BASE_URL,
+        auth=get_auth(),
+        headers={"Accept": "application/json"},
+    )
+
+
 @with_retry(max_attempts=3, initial_delay=1.0)
 def jira_get(endpoint: str, params: dict[str, Any] | None = None) -> requests.Response:
     """Make a GET request to Jira API."""
     rate_limiter.wait()
     url = f"{JIRA_BASE_URL}/rest/api/3/{endpoint}"
-    return requests.get(
-        url,
-        auth=get_auth(),
-        headers={"Accept": "application/json"},
-        params=params or {},
-    )
+    response = jira_session().get(url, params=params or {})
+    rate_limiter.observe(response)
+    return response
 
 
 @with_retry(max_attempts=3, initial_delay=1.0)
@@ -81,93 +133,487 @@ def jira_post(endpoint: str, data: dict[str, Any] | None = None, debug: bool = F
     if debug:
         print(f"    POST {url}")
         print(f"    Body: {data}")
-    return requests.post(
-        url,
-        auth=get_auth(),
-        headers={"Accept": "application/json", "Content-Type": "application/json"},
-        json=data or {},
-    )
+    # json= sets Content-Type: application/json
+    response = jira_session().post(url, json=data or {})
+    rate_limiter.observe(response)
+    return response
+
+
+class FetchFailed(Exception):
+    """A Jira request failed, so the results are incomplete."""
 
 
 def fetch_issue(issue_key: str) -> dict[str, Any] | None:
-    """Fetch a single issue by key."""
+    """
+    Fetch a single issue by key.
+
+    Returns None if the issue doesn't exist or isn't visible (404/403);
+    raises FetchFailed on any other error, so a transient failure isn't
+    mistaken for a deleted issue.
+    """
     try:
-        response = jira_get(f"issue/{issue_key}")
+        response = jira_get(f"issue/{issue_key}", {"fields": ",".join(request_fields())})
         if response.status_code == 200:
-            return response.json()
-        elif response.status_code == 404:
-            print(f"    Issue {issue_key} not found (404)")
-            return None
-        elif response.status_code == 401:
-            print(f"    Authentication failed (401) - Check your JIRA_EMAIL and JIRA_API_TOKEN")
-            print(f"    Response: {response.text[:200]}")
-            return None
-        elif response.status_code == 403:
-            print(f"    Permission denied (403) - You may not have access to {issue_key}")
-            print(f"    Response: {response.text[:200]}")
-            return None
-        else:
-            print(f"    Error fetching {issue_key}: HTTP {response.status_code}")
-            print(f"    Response: {response.text[:200]}")
-            return None
+            return response_json(response)
     except Exception as e:
         print(f"    Error fetching {issue_key}: {e}")
+        raise FetchFailed(issue_key) from e
+    if response.status_code == 404:
+        print(f"    Issue {issue_key} not found (404)")
         return None
+    elif response.status_code == 403:
+        print(f"    Permission denied (403) - You may not have access to {issue_key}")
+        print(f"    Response: {response.text[:200]}")
+        return None
+    elif response.status_code == 401:
+        print(f"    Authentication failed (401) - Check your JIRA_EMAIL and JIRA_API_TOKEN")
+        print(f"    Response: {response.text[:200]}")
+    else:
+        print(f"    Error fetching {issue_key}: HTTP {response.status_code}")
+        print(f"    Response: {response.text[:200]}")
+    raise FetchFailed(issue_key)
+
+
+class FieldProjectionStats:
+    """
+    Measurement mode for field projection (--measure-fields).
 
+    Each projected search page is repeated with "*all" fields and both
+    responses are timed through json_loads, so the saving can be read off
+    per page. This doubles the search requests; use it for a one-off run.
+    """
 
-def fetch_children(parent_keys: list[str], filter_prefix: str | None = None) -> list[dict[str, Any]]:
-    """Fetch all children of given parent issues using JQL, optionally filtering by key prefix."""
-    if not parent_keys:
-        return []
+    def __init__(self):
+        self.pages = 0
+        self.bytes_all = self.bytes_projected = 0
+        self.decode_all = self.decode_projected = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _decode_time(content: bytes) -> float:
+        start = time.perf_counter()
+        json_loads(content)
+        return time.perf_counter() - start
+
+    def compare(self, payload: dict[str, Any], projected: requests.Response) -> None:
+        """Re-run a search page with every field and record both sizes and decode times."""
+        response = jira_post("search/jql", {**payload, "fields": ["*all"]})
+        if response.status_code != 200:
+            return
+        size_all, size_projected = len(response.content), len(projected.content)
+        decode_all = self._decode_time(response.content)
+        decode_projected = self._decode_time(projected.content)
+        with self._lock:
+            self.pages += 1
+            self.bytes_all += size_all
+            self.bytes_projected += size_projected
+            self.decode_all += decode_all
+            self.decode_projected += decode_projected
+            page = self.pages
+        saved = 1 - size_projected / size_all if size_all else 0.0
+        print(f"    [fields] page {page}: {size_all / 1024:.1f} KB -> {size_projected / 1024:.1f} KB "
+              f"(-{saved:.0%}), decode {decode_all * 1000:.1f} ms -> {decode_projected * 1000:.1f} ms")
+
+    def report(self) -> None:
+        """Print the totals over all measured pages."""
+        if not self.pages:
+            print("  Field projection: no search pages measured")
+            return
+        saved = 1 - self.bytes_projected / self.bytes_all if self.bytes_all else 0.0
+        print(f"  Field projection over {self.pages} pages: "
+              f"{self.bytes_all / 1024:.1f} KB -> {self.bytes_projected / 1024:.1f} KB (-{saved:.0%}), "
+              f"decode {self.decode_all * 1000:.1f} ms -> {self.decode_projected * 1000:.1f} ms")
+
+
+# Set by --measure-fields
+field_stats: FieldProjectionStats | None = None
+
+
+def fetch_children_batch(parent_keys: list[str], filter_prefix: str | None = None,
+                         updated_within_minutes: int | None = None) -> list[dict[str, Any]]:
+    """
+    Fetch all children of up to 100 parent issues with one paginated JQL search.
+
+    With updated_within_minutes, only children updated in that window are
+    returned (a relative JQL date, so clock zones don't matter). Raises
+    FetchFailed if any page can't be fetched.
+    """
+    children: list[dict[str, Any]] = []
+    parent_clause = ", ".join(parent_keys)
     
-    all_children: list[dict[str, Any]] = []
+    jql = f"parent in ({parent_clause})"
+    # Add key filter if specified
+    if filter_prefix:
+        jql += f" AND key ~ '{filter_prefix}*'"
+    if updated_within_minutes is not None:
+        jql += f" AND updated >= -{updated_within_minutes}m"
+    jql += " ORDER BY key ASC"
     
-    # Batch parent keys to avoid 413 errors (max ~100 per query)
-    batch_size = 100
-    for i in range(0, len(parent_keys), batch_size):
-        batch = parent_keys[i:i + batch_size]
-        parent_clause = ", ".join(batch)
+    next_page_token = None
+    max_results = 100
+    
+    while True:
+        payload = {
+            "jql": jql,
+            "maxResults": max_results,
+            "fields": request_fields(),
+        }
+        if next_page_token:
+            payload["nextPageToken"] = next_page_token
         
-        # Add key filter if specified
-        if filter_prefix:
-            jql = f"parent in ({parent_clause}) AND key ~ '{filter_prefix}*' ORDER BY key ASC"
-        else:
-            jql = f"parent in ({parent_clause}) ORDER BY key ASC"
+        try:
+            response = jira_post("search/jql", payload, debug=False)
+            data = response_json(response) if response.status_code == 200 else None
+        except Exception as e:
+            print(f"    Error fetching children: {e}")
+            raise FetchFailed(jql) from e
         
-        next_page_token = None
-        max_results = 100
+        if data is None:
+            print(f"    Error in search: HTTP {response.status_code}")
+            print(f"    Response: {response.text[:500]}")
+            raise FetchFailed(jql)
         
-        while True:
-            try:
-                payload = {
-                    "jql": jql,
-                    "maxResults": max_results,
-                    "fields": ["*all"],
-                }
-                if next_page_token:
-                    payload["nextPageToken"] = next_page_token
-                
-                response = jira_post("search/jql", payload, debug=False)
-                
-                if response.status_code != 200:
-                    print(f"    Error in search: HTTP {response.status_code}")
-                    print(f"    Response: {response.text[:500]}")
-                    break
-                
-                data = response.json()
-                issues = data.get("issues", [])
-                all_children.extend(issues)
-                
-                # Check for next page token
-                next_page_token = data.get("nextPageToken")
-                if not next_page_token:
-                    break
-                
-            except Exception as e:
-                print(f"    Error fetching children: {e}")
-                break
+        if field_stats:
+            field_stats.compare(payload, response)
+        
+        issues = data.get("issues", [])
+        children.extend(issues)
+        
+        # Check for next page token
+        next_page_token = data.get("nextPageToken")
+        if not next_page_token:
+            break
     
-    return all_children
+    return children
+
+
+def fetch_parent_keys(issue_keys: list[str]) -> dict[str, str | None] | None:
+    """
+    Bulk-fetch only the parent field of up to 100 issues.
+
+    Returns {key: parent key} for the issues that still exist and are
+    visible; deleted issues are missing. Returns None if the request failed.
+    """
+    try:
+        response = jira_post("issue/bulkfetch", {"issueIdsOrKeys": issue_keys, "fields": ["parent"]})
+        if response.status_code != 200:
+            print(f"    Error in bulk fetch: HTTP {response.status_code}")
+            print(f"    Response: {response.text[:500]}")
+            return None
+        return {
+            issue["key"]: (issue.get("fields", {}).get("parent") or {}).get("key")
+            for issue in response_json(response).get("issues", [])
+        }
+    except Exception as e:
+        print(f"    Error in bulk fetch: {e}")
+        return None
+
+
+# ADF -> Markdown. Handlers render into one list of strings. Nested nodes
+# are rendered by direct calls up to ADF_INLINE_NESTING levels deep; below
+# that, the remaining nodes go on an explicit stack of (op, arg, arg)
+# entries that adf_to_markdown drains, so deeply nested documents can't hit
+# the recursion limit. Nodes whose children need post-processing (list
+# items, table cells, quotes) have a close op that remembers where their
+# output starts and collapses that tail of the buffer; if any of their
+# content was deferred to the stack, the close op goes on the stack beneath
+# it. tests/test_adf_to_markdown.py checks that every golden case renders
+# the same both ways.
+
+ADFStack = list[tuple[Callable[..., None], Any, Any]]
+
+# Nesting levels rendered by direct calls before falling back to the stack
+ADF_INLINE_NESTING = 32
+
+
+def _adf_defer(stack: ADFStack, mark: int, pending: ADFStack) -> None:
+    """Put pending ops (in run order) beneath the entries pushed since mark."""
+    deferred = stack[mark:]
+    del stack[mark:]
+    stack.extend(reversed(pending))
+    stack.extend(deferred)
+
+
+def _adf_leaves(out: list[str], stack: ADFStack, content: list[Any], depth: int) -> bool:
+    """Render content if it is all leaf nodes (a typical paragraph); otherwise render nothing."""
+    start = len(out)
+    for child in content:
+        if isinstance(child, dict):
+            node_type = child.get("type", "")
+            if node_type == "text" and not child.get("marks"):
+                out.append(child.get("text", ""))
+                continue
+            handler = ADF_HANDLERS.get(node_type)
+            if handler not in ADF_LEAF_HANDLERS:
+                del out[start:]
+                return False
+            handler(out, stack, child, depth)
+        elif child:
+            out.append(str(child))
+    return True
+
+
+def _adf_children(out: list[str], stack: ADFStack, content: list[Any], depth: int, nest: int) -> None:
+    """Render content in order; once nest runs out or a child defers, the rest goes on the stack."""
+    for i, child in enumerate(content):
+        if isinstance(child, dict):
+            node_type = child.get("type", "")
+            if node_type == "text" and not child.get("marks"):
+                # Plain text is most of a document; skip the handler call
+                out.append(child.get("text", ""))
+                continue
+            handler = ADF_HANDLERS.get(node_type, _adf_visit)
+            if handler in ADF_LEAF_HANDLERS:
+                handler(out, stack, child, depth)
+                continue
+            if handler is _adf_paragraph and _adf_leaves(out, stack, child.get("content", []), depth):
+                out.append("\n\n")
+                continue
+            if not nest:
+                break
+            mark = len(stack)
+            handler(out, stack, child, depth, nest - 1)
+            if len(stack) != mark:
+                _adf_defer(stack, mark, [_adf_op(c, depth) for c in content[i + 1:]])
+                return
+        elif child:
+            out.append(str(child))
+    else:
+        return
+    stack.extend(_adf_op(child, depth) for child in reversed(content[i:]))
+
+
+def _adf_op(node: Any, depth: int) -> tuple[Callable[..., None], Any, Any]:
+    """Stack entry that renders node."""
+    handler = ADF_HANDLERS.get(node.get("type", ""), _adf_visit) if isinstance(node, dict) else _adf_visit
+    return (handler, node, depth)
+
+
+def _adf_open(out: list[str], stack: ADFStack, content: list[Any], depth: int, nest: int,
+              close: Callable[..., None], extra: Any) -> None:
+    """Render a container's content, then close it: now, or after whatever went on the stack."""
+    start, mark = len(out), len(stack)
+    _adf_children(out, stack, content, depth, nest)
+    if len(stack) == mark:
+        close(out, stack, start, extra)
+    else:
+        stack.insert(mark, (close, start, extra))
+
+
+def _adf_close_text(out: list[str], stack: ADFStack, _: int, text: str) -> None:
+    out.append(text)
+
+
+def _adf_visit(out: list[str], stack: ADFStack, node: Any, depth: int,
+               nest: int = ADF_INLINE_NESTING) -> None:
+    """Non-dict nodes and types without a handler."""
+    if not isinstance(node, dict):
+        if node:
+            out.append(str(node))
+        return
+    # Default: process children
+    content = node.get("content", [])
+    if content:
+        _adf_children(out, stack, content, depth, nest)
+
+
+def _adf_text(out: list[str], stack: ADFStack, node: dict[str, Any], depth: int) -> None:
+    result = node.get("text", "")
+    for mark in node.get("marks", []):
+        mark_type = mark.get("type", "")
+        if mark_type == "strong":
+            result = f"**{result}**"
+        elif mark_type == "em":
+            result = f"*{result}*"
+        elif mark_type == "code":
+            result = f"`{result}`"
+        elif mark_type == "link":
+            href = mark.get("attrs", {}).get("href", "")
+            result = f"[{result}]({href})"
+    out.append(result)
+
+
+def _adf_paragraph(out: list[str], stack: ADFStack, node: dict[str, Any], depth: int,
+                   nest: int = ADF_INLINE_NESTING) -> None:
+    _adf_open(out, stack, node.get("content", []), depth, nest, _adf_close_text, "\n\n")
+
+
+def _adf_heading(out: list[str], stack: ADFStack, node: dict[str, Any], depth: int,
+                 nest: int = ADF_INLINE_NESTING) -> None:
+    level = node.get("attrs", {}).get("level", 1)
+    out.append(f"{'#' * level} ")
+    _adf_open(out, stack, node.get("content", []), depth, nest, _adf_close_text, "\n\n")
+
+
+def _adf_close_list(out: list[str], stack: ADFStack, start: int, _: Any) -> None:
+    out[start:] = ["\n".join(out[start:]) + "\n\n"]
+
+
+def _adf_close_item(out: list[str], stack: ADFStack, start: int, prefix: str) -> None:
+    out[start:] = [prefix + "".join(out[start:]).strip()]
+
+
+def _adf_item(out: list[str], stack: ADFStack, item: dict[str, Any], spec: tuple[str, int],
+              nest: int = ADF_INLINE_NESTING) -> None:
+    prefix, depth = spec
+    _adf_open(out, stack, item.get("content", []), depth, nest, _adf_close_item, prefix)
+
+
+def _adf_list(out: list[str], stack: ADFStack, node: dict[str, Any], depth: int,
+              nest: int = ADF_INLINE_NESTING) -> None:
+    ordered = node.get("type") == "orderedList"
+    indent = "  " * depth
+    items = node.get("content", [])
+    start = len(out)
+    for i, item in enumerate(items):
+        prefix = f"{indent}{i + 1}. " if ordered else f"{indent}- "
+        item_start, mark = len(out), len(stack)
+        _adf_children(out, stack, item.get("content", []), depth + 1, nest)
+        if len(stack) == mark:
+            _adf_close_item(out, stack, item_start, prefix)
+            continue
+        stack.insert(mark, (_adf_close_item, item_start, prefix))
+        pending: ADFStack = [
+            (_adf_item, rest, (f"{indent}{n}. " if ordered else f"{indent}- ", depth + 1))
+            for n, rest in enumerate(items[i + 1:], i + 2)
+        ]
+        _adf_defer(stack, mark, pending + [(_adf_close_list, start, None)])
+        return
+    _adf_close_list(out, stack, start, None)
+
+
+def _adf_list_item(out: list[str], stack: ADFStack, node: dict[str, Any], depth: int,
+                   nest: int = ADF_INLINE_NESTING) -> None:
+    _adf_children(out, stack, node.get("content", []), depth, nest)
+
+
+def _adf_code_block(out: list[str], stack: ADFStack, node: dict[str, Any], depth: int,
+                    nest: int = ADF_INLINE_NESTING) -> None:
+    language = node.get("attrs", {}).get("language", "")
+    out.append(f"```{language}\n")
+    _adf_open(out, stack, node.get("content", []), depth, nest, _adf_close_text, "\n```\n\n")
+
+
+def _adf_close_blockquote(out: list[str], stack: ADFStack, start: int, _: Any) -> None:
+    lines = "".join(out[start:]).strip().split("\n")
+    quoted = "\n".join(f"> {line}" for line in lines)
+    out[start:] = [f"{quoted}\n\n"]
+
+
+def _adf_blockquote(out: list[str], stack: ADFStack, node: dict[str, Any], depth: int,
+                    nest: int = ADF_INLINE_NESTING) -> None:
+    _adf_open(out, stack, node.get("content", []), depth, nest, _adf_close_blockquote, None)
+
+
+def _adf_close_table(out: list[str], stack: ADFStack, start: int, _: Any) -> None:
+    rows = out[start:]
+    del out[start:]
+    if rows:
+        header = rows[0]
+        separator = "| " + " | ".join(["---"] * len(rows[0].split("|")[1:-1])) + " |"
+        body = "\n".join(rows[1:]) if len(rows) > 1 else ""
+        out.append(f"{header}\n{separator}\n{body}\n\n")
+
+
+def _adf_close_row(out: list[str], stack: ADFStack, start: int, _: Any) -> None:
+    out[start:] = ["| " + " | ".join(out[start:]) + " |"]
+
+
+def _adf_close_cell(out: list[str], stack: ADFStack, start: int, _: Any) -> None:
+    out[start:] = ["".join(out[start:]).strip().replace("|", "\\|")]
+
+
+def _adf_cell(out: list[str], stack: ADFStack, cell_node: dict[str, Any], depth: int,
+              nest: int = ADF_INLINE_NESTING) -> None:
+    _adf_open(out, stack, cell_node.get("content", []), depth, nest, _adf_close_cell, None)
+
+
+def _adf_row(out: list[str], stack: ADFStack, row_node: dict[str, Any], depth: int,
+             nest: int = ADF_INLINE_NESTING) -> None:
+    cells = row_node.get("content", [])
+    start = len(out)
+    for i, cell_node in enumerate(cells):
+        cell_start, mark = len(out), len(stack)
+        _adf_children(out, stack, cell_node.get("content", []), depth, nest)
+        if len(stack) == mark:
+            _adf_close_cell(out, stack, cell_start, None)
+            continue
+        stack.insert(mark, (_adf_close_cell, cell_start, None))
+        pending: ADFStack = [(_adf_cell, rest, depth) for rest in cells[i + 1:]]
+        _adf_defer(stack, mark, pending + [(_adf_close_row, start, None)])
+        return
+    _adf_close_row(out, stack, start, None)
+
+
+def _adf_table(out: list[str], stack: ADFStack, node: dict[str, Any], depth: int,
+               nest: int = ADF_INLINE_NESTING) -> None:
+    rows = [row_node for row_node in node.get("content", []) if row_node.get("type") == "tableRow"]
+    start = len(out)
+    for i, row_node in enumerate(rows):
+        mark = len(stack)
+        _adf_row(out, stack, row_node, depth, nest)
+        if len(stack) != mark:
+            pending: ADFStack = [(_adf_row, rest, depth) for rest in rows[i + 1:]]
+            _adf_defer(stack, mark, pending + [(_adf_close_table, start, None)])
+            return
+    _adf_close_table(out, stack, start, None)
+
+
+def _adf_mention(out: list[str], stack: ADFStack, node: dict[str, Any], depth: int) -> None:
+    out.append(f"@{node.get('attrs', {}).get('text', '')}")
+
+
+def _adf_emoji(out: list[str], stack: ADFStack, node: dict[str, Any], depth: int) -> None:
+    out.append(node.get("attrs", {}).get("shortName", ""))
+
+
+def _adf_rule(out: list[str], stack: ADFStack, node: dict[str, Any], depth: int) -> None:
+    out.append("---\n\n")
+
+
+def _adf_hard_break(out: list[str], stack: ADFStack, node: dict[str, Any], depth: int) -> None:
+    out.append("\n")
+
+
+def _adf_close_panel(out: list[str], stack: ADFStack, start: int, label: str) -> None:
+    out[start:] = [f"> **{label}:** {''.join(out[start:]).strip()}\n\n"]
+
+
+def _adf_panel(out: list[str], stack: ADFStack, node: dict[str, Any], depth: int,
+               nest: int = ADF_INLINE_NESTING) -> None:
+    label = node.get("attrs", {}).get("panelType", "info").upper()
+    _adf_open(out, stack, node.get("content", []), depth, nest, _adf_close_panel, label)
+
+
+def _adf_media(out: list[str], stack: ADFStack, node: dict[str, Any], depth: int) -> None:
+    out.append("[Media attachment]\n\n")
+
+
+# Node type -> handler; unknown types render their children
+ADF_HANDLERS: dict[str, Callable[..., None]] = {
+    "text": _adf_text,
+    "paragraph": _adf_paragraph,
+    "heading": _adf_heading,
+    "bulletList": _adf_list,
+    "orderedList": _adf_list,
+    "listItem": _adf_list_item,
+    "codeBlock": _adf_code_block,
+    "blockquote": _adf_blockquote,
+    "table": _adf_table,
+    "mention": _adf_mention,
+    "emoji": _adf_emoji,
+    "rule": _adf_rule,
+    "hardBreak": _adf_hard_break,
+    "panel": _adf_panel,
+    "media": _adf_media,
+    "mediaSingle": _adf_media,
+    "mediaGroup": _adf_media,
+}
+
+# Handlers that only append to the buffer (no nest argument, never defer)
+ADF_LEAF_HANDLERS = {_adf_text, _adf_mention, _adf_emoji, _adf_rule, _adf_hard_break, _adf_media}
+
+EXCESS_NEWLINES_RE = re.compile(r"\n\n\n+")
 
 
 def adf_to_markdown(adf: dict[str, Any] | None) -> str:
@@ -175,136 +621,64 @@ def adf_to_markdown(adf: dict[str, Any] | None) -> str:
     if not adf or not isinstance(adf, dict):
         return ""
     
-    def process_node(node: dict[str, Any], depth: int = 0) -> str:
-        if not isinstance(node, dict):
-            return str(node) if node else ""
-        
-        node_type = node.get("type", "")
-        content = node.get("content", [])
-        text = node.get("text", "")
-        
-        # Text node
-        if node_type == "text":
-            result = text
-            for mark in node.get("marks", []):
-                mark_type = mark.get("type", "")
-                if mark_type == "strong":
-                    result = f"**{result}**"
-                elif mark_type == "em":
-                    result = f"*{result}*"
-                elif mark_type == "code":
-                    result = f"`{result}`"
-                elif mark_type == "link":
-                    href = mark.get("attrs", {}).get("href", "")
-                    result = f"[{result}]({href})"
-            return result
-        
-        # Paragraph
-        elif node_type == "paragraph":
-            inner = "".join(process_node(c, depth) for c in content)
-            return f"{inner}\n\n"
-        
-        # Headings
-        elif node_type == "heading":
-            level = node.get("attrs", {}).get("level", 1)
-            inner = "".join(process_node(c, depth) for c in content)
-            return f"{'#' * level} {inner}\n\n"
-        
-        # Lists
-        elif node_type == "bulletList":
-            items = []
-            for item in content:
-                item_content = "".join(process_node(c, depth + 1) for c in item.get("content", []))
-                items.append(f"{'  ' * depth}- {item_content.strip()}")
-            return "\n".join(items) + "\n\n"
-        
-        elif node_type == "orderedList":
-            items = []
-            for i, item in enumerate(content, 1):
-                item_content = "".join(process_node(c, depth + 1) for c in item.get("content", []))
-                items.append(f"{'  ' * depth}{i}. {item_content.strip()}")
-            return "\n".join(items) + "\n\n"
-        
-        elif node_type == "listItem":
-            return "".join(process_node(c, depth) for c in content)
-        
-        # Code block
-        elif node_type == "codeBlock":
-            language = node.get("attrs", {}).get("language", "")
-            code_text = "".join(process_node(c, depth) for c in content)
-            return f"```{language}\n{code_text}\n```\n\n"
-        
-        # Blockquote
-        elif node_type == "blockquote":
-            inner = "".join(process_node(c, depth) for c in content)
-            lines = inner.strip().split("\n")
-            quoted = "\n".join(f"> {line}" for line in lines)
-            return f"{quoted}\n\n"
-        
-        # Table
-        elif node_type == "table":
-            rows = []
-            for row_node in content:
-                if row_node.get("type") == "tableRow":
-                    cells = []
-                    for cell_node in row_node.get("content", []):
-                        cell_content = "".join(process_node(c, depth) for c in cell_node.get("content", []))
-                        cells.append(cell_content.strip().replace("|", "\\|"))
-                    rows.append("| " + " | ".join(cells) + " |")
-            
-            if rows:
-                header = rows[0]
-                separator = "| " + " | ".join(["---"] * len(rows[0].split("|")[1:-1])) + " |"
-                body = "\n".join(rows[1:]) if len(rows) > 1 else ""
-                return f"{header}\n{separator}\n{body}\n\n"
-            return ""
-        
-        # Mention
-        elif node_type == "mention":
-            mention_text = node.get("attrs", {}).get("text", "")
-            return f"@{mention_text}"
-        
-        # Emoji
-        elif node_type == "emoji":
-            short_name = node.get("attrs", {}).get("shortName", "")
-            return short_name
-        
-        # Rule (horizontal line)
-        elif node_type == "rule":
-            return "---\n\n"
-        
-        # Hard break
-        elif node_type == "hardBreak":
-            return "\n"
-        
-        # Panel/info box
-        elif node_type == "panel":
-            panel_type = node.get("attrs", {}).get("panelType", "info")
-            inner = "".join(process_node(c, depth) for c in content)
-            return f"> **{panel_type.upper()}:** {inner.strip()}\n\n"
-        
-        # Media (images, etc)
-        elif node_type in ("media", "mediaSingle", "mediaGroup"):
-            return "[Media attachment]\n\n"
-        
-        # Default: process children
-        elif content:
-            return "".join(process_node(c, depth) for c in content)
-        
-        return ""
-    
+    out: list[str] = []
+    stack: ADFStack = []
     try:
-        result = "".join(process_node(node) for node in adf.get("content", []))
+        _adf_children(out, stack, adf.get("content", []), 0, ADF_INLINE_NESTING)
+        while stack:
+            op, arg, extra = stack.pop()
+            op(out, stack, arg, extra)
         # Clean up excessive newlines
-        while "\n\n\n" in result:
-            result = result.replace("\n\n\n", "\n\n")
-        return result.strip()
+        return EXCESS_NEWLINES_RE.sub("\n\n", "".join(out)).strip()
     except Exception as e:
         return f"[Error converting description: {e}]"
 
 
+# Jira fields read by parse_issue; requests ask for these instead of "*all"
+# (keep in sync when parse_issue starts reading a new field)
+ISSUE_FIELDS = [
+    "summary",
+    "description",
+    "status",
+    "issuetype",
+    "priority",
+    "assignee",
+    "reporter",
+    "created",
+    "updated",
+    "resolutiondate",
+    "parent",
+    "labels",
+    "issuelinks",
+    "comment",
+    "project",
+]
+
+# Extra (custom) fields from jira.extra_fields: output name -> Jira field id
+EXTRA_FIELDS: dict[str, str] = {}
+
+
+def configure_fields(extra_fields: dict[str, str] | list[str] | None) -> None:
+    """
+    Set the custom fields fetched alongside ISSUE_FIELDS.
+
+    Accepts a mapping of output name to field id ({"story_points":
+    "customfield_10016"}) or a plain list of field ids.
+    """
+    EXTRA_FIELDS.clear()
+    if isinstance(extra_fields, dict):
+        EXTRA_FIELDS.update(extra_fields)
+    elif extra_fields:
+        EXTRA_FIELDS.update((field_id, field_id) for field_id in extra_fields)
+
+
+def request_fields() -> list[str]:
+    """Return the field ids to request from Jira."""
+    return ISSUE_FIELDS + [f for f in EXTRA_FIELDS.values() if f not in ISSUE_FIELDS]
+
+
 def parse_issue(raw_issue: dict[str, Any], hierarchy_level: int) -> dict[str, Any]:
-    """Parse a raw Jira issue into our schema."""
+    """Parse a raw Jira issue into our schema (reads only ISSUE_FIELDS and EXTRA_FIELDS)."""
     fields = raw_issue.get("fields", {})
     
     # Get parent info
@@ -386,7 +760,7 @@ def parse_issue(raw_issue: dict[str, Any], hierarchy_level: int) -> dict[str, An
             "summary": linked.get("fields", {}).get("summary", ""),
         })
     
-    return {
+    parsed = {
         "key": raw_issue.get("key"),
         "id": raw_issue.get("id"),
         "hierarchy_level": hierarchy_level,
@@ -407,10 +781,14 @@ def parse_issue(raw_issue: dict[str, Any], hierarchy_level: int) -> dict[str, An
         "comments": comments,
         "jira_url": f"{JIRA_BASE_URL}/browse/{raw_issue.get('key')}",
     }
+    if EXTRA_FIELDS:
+        # Raw values; custom field shapes vary by field type
+        parsed["custom_fields"] = {name: fields.get(field_id) for name, field_id in EXTRA_FIELDS.items()}
+    return parsed
 
 
 def generate_index_md(issues: list[dict[str, Any]], root_keys: list[str]) -> str:
-    """Generate human-readable INDEX.md."""
+    """Generate human-readable INDEX.md from store cache entries."""
     root_links = ", ".join([f"[{key}]({JIRA_BASE_URL}/browse/{key})" for key in root_keys])
     lines = [
         f"# Jira Issue Hierarchy",
@@ -426,7 +804,7 @@ def generate_index_md(issues: list[dict[str, Any]], root_keys: list[str]) -> str
     # Group by hierarchy level
     by_level: dict[int, list[dict[str, Any]]] = defaultdict(list)
     for issue in issues:
-        by_level[issue.get("hierarchy_level", 0)].append(issue)
+        by_level[issue.get("level", 0)].append(issue)
     
     for level in sorted(by_level.keys()):
         level_issues = by_level[level]
@@ -437,7 +815,7 @@ def generate_index_md(issues: list[dict[str, Any]], root_keys: list[str]) -> str
         # Group by status category
         by_status: dict[str, list[dict[str, Any]]] = defaultdict(list)
         for issue in level_issues:
-            status_cat = issue.get("status", {}).get("category", "Unknown")
+            status_cat = issue.get("status_category", "Unknown")
             by_status[status_cat].append(issue)
         
         for status_cat in ["To Do", "In Progress", "Done", "Unknown"]:
@@ -450,9 +828,8 @@ def generate_index_md(issues: list[dict[str, Any]], root_keys: list[str]) -> str
             for issue in sorted(status_issues, key=lambda x: x.get("key", "")):
                 key = issue.get("key", "")
                 summary = issue.get("summary", "")[:80]
-                status = issue.get("status", {}).get("name", "")
-                assignee = issue.get("assignee", {})
-                assignee_name = assignee.get("name", "Unassigned") if assignee else "Unassigned"
+                status = issue.get("status", "")
+                assignee_name = issue.get("assignee") or "Unassigned"
                 
                 lines.append(f"- [{key}]({JIRA_BASE_URL}/browse/{key}): {summary}")
                 lines.append(f"  - Status: {status} | Assignee: {assignee_name}")
@@ -462,125 +839,426 @@ def generate_index_md(issues: list[dict[str, Any]], root_keys: list[str]) -> str
     return "\n".join(lines)
 
 
-def sync_hierarchy(root_keys: list[str], filter_prefix: str | None = None) -> dict[str, Any]:
-    """Sync the entire issue hierarchy under multiple root issues."""
-    print(f"\n  Root issues: {', '.join(root_keys)}")
-    if filter_prefix:
-        print(f"  Filtering children by prefix: {filter_prefix}")
+async def traverse_hierarchy(
+    engine: AsyncEngine,
+    root_keys: list[str],
+    filter_prefix: str | None,
+    on_children: Callable[[list[dict[str, Any]], int], list[str]],
+) -> int:
+    """
+    Search for descendants of root_keys, level by level but without a barrier.
+
+    Parent keys queue up per child level and a 100-key search is started as
+    soon as a full batch is available, so level N+1 searches overlap with
+    the tail of level N. A partial batch is only sent once nothing still in
+    flight can add parents to it. on_children(issues, level) is called as
+    each search completes and returns the keys to search beneath.
+
+    A failed search is skipped (its subtree goes unexplored) and the rest
+    carry on; returns the number of failed searches.
+    """
+    # child level -> parent keys whose children at that level are still to be fetched
+    pending: dict[int, list[str]] = defaultdict(list)
+    pending[1] = list(root_keys)
+    in_flight: dict[asyncio.Future, int] = {}
+    failed = 0
+
+    def submit(level: int, parent_keys: list[str]) -> None:
+        # Apply filter only at level 1 (immediate children of roots)
+        task = asyncio.ensure_future(engine.call(
+            JIRA_BASE_URL, fetch_children_batch, parent_keys,
+            filter_prefix if level == 1 else None))
+        in_flight[task] = level
+
+    def dispatch() -> None:
+        for level in sorted(pending):
+            keys = pending[level]
+            while len(keys) >= CHILD_BATCH_SIZE:
+                submit(level, keys[:CHILD_BATCH_SIZE])
+                del keys[:CHILD_BATCH_SIZE]
+            upstream_busy = (any(l < level for l in in_flight.values())
+                             or any(pending[l] for l in pending if l < level))
+            if keys and not upstream_busy:
+                submit(level, keys[:])
+                keys.clear()
+
+    dispatch()
+    try:
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                level = in_flight.pop(task)
+                try:
+                    children = task.result()
+                except FetchFailed:
+                    failed += 1
+                    continue
+                child_keys = on_children(children, level)
+                # Safety limit
+                if level >= MAX_DEPTH:
+                    if child_keys:
+                        print(f"    Warning: Reached max depth of {MAX_DEPTH} levels")
+                    continue
+                pending[level + 1].extend(child_keys)
+            dispatch()
+    finally:
+        for task in in_flight:
+            task.cancel()
+    return failed
+
+
+def write_indexes(store: JiraIssueStore, root_keys: list[str]) -> list[dict[str, Any]]:
+    """Generate INDEX.md and index.json from the store's cache; return its entries in index order."""
+    all_issues = store.sorted_entries()
     
-    all_issues: list[dict[str, Any]] = []
-    issues_dir = JIRA_DIR / "issues"
-    issues_dir.mkdir(parents=True, exist_ok=True)
+    index_md = generate_index_md(all_issues, root_keys)
+    save_text(index_md, JIRA_DIR / "INDEX.md")
     
-    # Fetch all root issues
+    # Structured index for programmatic access
+    index_json = {
+        "root_keys": root_keys,
+        "total_issues": len(all_issues),
+        "synced_at": store.meta.get("last_synced") or iso_now(),
+        "issues": [
+            {
+                "key": i["key"],
+                "summary": i["summary"],
+                "level": i["level"],
+                "status": i["status"],
+                "status_category": i["status_category"],
+                "parent": i["parent"],
+            }
+            for i in all_issues
+        ],
+    }
+    save_json(index_json, JIRA_DIR / "index.json")
+    return all_issues
+
+
+def store_issue(store: JiraIssueStore, raw_issue: dict[str, Any], level: int) -> bool:
+    """Parse and store an issue unless the stored copy is current; return whether it was written."""
+    if store.is_fresh(raw_issue["key"], raw_issue.get("fields", {}).get("updated"), level):
+        return False
+    store.put(parse_issue(raw_issue, hierarchy_level=level))
+    return True
+
+
+def is_effort_estimate(raw_issue: dict[str, Any]) -> bool:
+    """True for "Effort Estimate" issues, which are left out of the hierarchy."""
+    return (raw_issue.get("fields", {}).get("issuetype") or {}).get("name") == "Effort Estimate"
+
+
+def fetch_roots(engine: AsyncEngine, root_keys: list[str],
+                store: JiraIssueStore) -> tuple[list[str], list[str]]:
+    """
+    Fetch the root issues concurrently into the store.
+
+    Returns the keys found and the keys whose fetch failed (as opposed to
+    roots that don't exist, which are in neither list).
+    """
     print("    Fetching root issues...")
-    root_parsed_list = []
-    for root_key in root_keys:
-        root_raw = fetch_issue(root_key)
+    found, failed = [], []
+
+    def fetch(key: str) -> dict[str, Any] | None | FetchFailed:
+        try:
+            return fetch_issue(key)
+        except FetchFailed as e:
+            return e
+
+    for root_key, root_raw in zip(root_keys, engine.map(JIRA_BASE_URL, fetch, root_keys)):
+        if isinstance(root_raw, FetchFailed):
+            print(f"    Warning: Root {root_key} couldn't be fetched, keeping its stored subtree")
+            failed.append(root_key)
+            continue
         if not root_raw:
             print(f"    Warning: Root {root_key} not found, skipping")
             continue
-        root_parsed = parse_issue(root_raw, hierarchy_level=0)
-        all_issues.append(root_parsed)
-        root_parsed_list.append(root_parsed)
-        save_json(root_parsed, issues_dir / f"{root_key}.json")
+        store_issue(store, root_raw, 0)
+        found.append(root_raw["key"])
+    return found, failed
+
+
+def sync_hierarchy(root_keys: list[str], filter_prefix: str | None = None,
+                   workers: int = DEFAULT_WORKERS,
+                   store: JiraIssueStore | None = None) -> dict[str, Any]:
+    """
+    Sync the entire issue hierarchy under multiple root issues.
+
+    Root issues and child searches are fetched concurrently, up to
+    `workers` requests in flight, all paced by the shared rate limiter.
+    Issues unchanged since the last sync aren't re-parsed or rewritten,
+    and stored issues that are no longer in the hierarchy are removed.
+    If any request failed, nothing is removed and the previous watermark
+    is kept, so the next sync looks at the missed issues again.
+    """
+    print(f"\n  Root issues: {', '.join(root_keys)}")
+    if filter_prefix:
+        print(f"  Filtering children by prefix: {filter_prefix}")
+    
+    started_at = iso_now()
+    store = store or JiraIssueStore(JIRA_DIR, request_fields())
+    store.issues_dir.mkdir(parents=True, exist_ok=True)
+    engine = AsyncEngine(default_limit=workers)
     
-    if not root_parsed_list:
-        return {"error": "no_roots_found", "issues": 0}
+    # Fetch all root issues
+    found_roots, failed_roots = fetch_roots(engine, root_keys, store)
+    if not found_roots:
+        return {"error": "fetch_failed" if failed_roots else "no_roots_found", "issues": 0}
     
-    # Traverse hierarchy level by level
-    current_level_keys = root_keys
-    level = 0
+    seen_keys = set(found_roots)
+    found_by_level: dict[int, int] = defaultdict(int)
     effort_estimates_filtered = 0
     
-    while current_level_keys:
-        level += 1
-        print(f"    Fetching level {level} children of {len(current_level_keys)} parents...")
-        
-        # Apply filter only at level 1 (immediate children of roots)
-        filter_to_use = filter_prefix if level == 1 else None
-        children = fetch_children(current_level_keys, filter_to_use)
-        
-        if not children:
-            break
-        
-        print(f"    Found {len(children)} issues at level {level}")
-        
+    def on_children(children: list[dict[str, Any]], level: int) -> list[str]:
+        nonlocal effort_estimates_filtered
         next_level_keys = []
         for child_raw in children:
-            child_parsed = parse_issue(child_raw, hierarchy_level=level)
-            
             # Skip "Effort Estimate" issues
-            if child_parsed.get("issue_type", {}).get("name") == "Effort Estimate":
+            if is_effort_estimate(child_raw):
                 effort_estimates_filtered += 1
                 continue
             
-            all_issues.append(child_parsed)
+            key = child_raw.get("key")
+            if key in seen_keys:
+                continue
             
             # Only add to next level if key exists
-            if child_parsed.get("key"):
-                next_level_keys.append(child_parsed["key"])
+            if key:
+                seen_keys.add(key)
+                found_by_level[level] += 1
+                next_level_keys.append(key)
                 # Save individual issue
-                save_json(child_parsed, issues_dir / f"{child_parsed['key']}.json")
+                store_issue(store, child_raw, level)
             else:
                 print(f"    Warning: Issue without key: {child_raw.get('id', 'unknown')}")
-        
-        current_level_keys = next_level_keys
-        
-        # Safety limit
-        if level >= 10:
-            print("    Warning: Reached max depth of 10 levels")
-            break
+        return next_level_keys
     
-    # Generate index files
-    print(f"    Generating index files...")
+    # Traverse hierarchy, overlapping levels
+    print(f"    Fetching descendants ({workers} concurrent searches)...")
+    failed = len(failed_roots)
+    failed += engine.run(traverse_hierarchy(engine, found_roots, filter_prefix, on_children))
     
-    index_md = generate_index_md(all_issues, root_keys)
-    with open(JIRA_DIR / "INDEX.md", "w") as f:
-        f.write(index_md)
+    for lvl in sorted(found_by_level):
+        print(f"    Found {found_by_level[lvl]} issues at level {lvl}")
     
-    # Structured index for programmatic access
-    index_json = {
-        "root_keys": root_keys,
-        "total_issues": len(all_issues),
-        "synced_at": iso_now(),
-        "issues": [
-            {
-                "key": i["key"],
-                "summary": i["summary"],
-                "level": i["hierarchy_level"],
-                "status": i["status"]["name"],
-                "status_category": i["status"]["category"],
-                "parent": i["parent"]["key"] if i["parent"] else None,
-            }
-            for i in all_issues
-        ],
-    }
-    save_json(index_json, JIRA_DIR / "index.json")
+    if failed:
+        # Issues under a failed request weren't seen, not deleted
+        print(f"    Warning: {failed} requests failed; kept stored issues and the previous watermark")
+        removed = []
+    else:
+        removed = store.retain(seen_keys)
+    if removed:
+        print(f"    Removed {len(removed)} issues no longer in the hierarchy")
+    print(f"    {store.cache_report()}")
     
-    # Metadata
-    save_json({
-        "root_keys": root_keys,
-        "last_synced": iso_now(),
-        "total_issues": len(all_issues),
-        "jira_base_url": JIRA_BASE_URL,
-    }, JIRA_DIR / "_meta.json")
+    # Generate index files
+    print(f"    Generating index files...")
+    store.save(
+        root_keys=root_keys,
+        filter_prefix=filter_prefix,
+        last_synced=iso_now(),
+        watermark=store.meta.get("watermark") if failed else started_at,
+        fields=request_fields(),
+        total_issues=len(store.entries),
+        jira_base_url=JIRA_BASE_URL,
+    )
+    all_issues = write_indexes(store, root_keys)
     
     print(f"    Saved {len(all_issues)} issues")
     if effort_estimates_filtered > 0:
         print(f"    Filtered out {effort_estimates_filtered} 'Effort Estimate' issues")
     
-    return {"issues": len(all_issues), "levels": level, "filtered": effort_estimates_filtered}
+    return {
+        "issues": len(all_issues),
+        "levels": max(found_by_level, default=0),
+        "filtered": effort_estimates_filtered,
+        "removed": len(removed),
+        "failed": failed,
+    }
+
 
+def sync_incremental(root_keys: list[str], filter_prefix: str | None = None,
+                     workers: int = DEFAULT_WORKERS,
+                     store: JiraIssueStore | None = None) -> dict[str, Any]:
+    """
+    Patch the local store with issues changed since the last sync.
 
-def main() -> None:
-    """Main entry point."""
+    1. Re-fetch the roots.
+    2. Bulk-fetch the parent of every stored issue (a few bytes per issue)
+       to find issues that were deleted, moved to another project, or
+       re-parented.
+    3. Search "parent in (stored keys) AND updated >= -Nm" to pick up
+       edited and newly added children, and walk the subtrees of any new
+       ones (an issue moved into the tree brings its descendants along).
+    4. Recompute levels from parent links and drop unreachable issues.
+
+    If a root fetch or a search failed, unreachable issues are kept and the
+    watermark stays where it was, so the next run searches the same window.
+    """
+    print(f"\n  Root issues: {', '.join(root_keys)}")
+    if filter_prefix:
+        print(f"  Filtering children by prefix: {filter_prefix}")
+    
+    started_at = iso_now()
+    store = store or JiraIssueStore(JIRA_DIR, request_fields())
+    watermark = datetime.fromisoformat(store.meta["watermark"].replace("Z", "+00:00"))
+    elapsed = datetime.now(timezone.utc) - watermark
+    since_minutes = math.ceil(elapsed.total_seconds() / 60) + WATERMARK_MARGIN_MINUTES
+    print(f"  Changes since: {store.meta['watermark']} (updated >= -{since_minutes}m)")
+    engine = AsyncEngine(default_limit=workers)
+    
+    found_roots, failed_roots = fetch_roots(engine, root_keys, store)
+    if not found_roots:
+        return {"error": "fetch_failed" if failed_roots else "no_roots_found", "issues": 0}
+    failed = len(failed_roots)
+    
+    # Deleted, moved and re-parented issues
+    known = sorted(set(store.entries) - set(found_roots))
+    batches = [known[i:i + CHILD_BATCH_SIZE] for i in range(0, len(known), CHILD_BATCH_SIZE)]
+    print(f"    Checking {len(known)} stored issues for deletes and moves...")
+    deleted = reparented = 0
+    for batch, parents in zip(batches, engine.map(JIRA_BASE_URL, fetch_parent_keys, batches)):
+        if parents is None:
+            failed += 1  # Check failed; keep the batch and hold the watermark
+            continue
+        for key in batch:
+            if key not in parents:
+                store.remove(key)
+                deleted += 1
+            elif parents[key] != store.entries[key]["parent"]:
+                issue = store.get(key)
+                issue["parent"] = {"key": parents[key], "summary": ""} if parents[key] else None
+                store.put(issue)
+                reparented += 1
+    
+    # Changed and new children of everything still in the tree
+    live = sorted(set(store.entries) - set(found_roots))
+    searches = [(found_roots, filter_prefix)]
+    searches += [(live[i:i + CHILD_BATCH_SIZE], None) for i in range(0, len(live), CHILD_BATCH_SIZE)]
+    print(f"    Searching {len(searches)} batches for updated issues...")
+    
+    def search(args: tuple[list[str], str | None]) -> list[dict[str, Any]] | None:
+        parent_keys, prefix = args
+        try:
+            return fetch_children_batch(parent_keys, prefix, updated_within_minutes=since_minutes)
+        except FetchFailed:
+            return None
+    
+    known_keys = set(store.entries)
+    new_keys: set[str] = set()
+    updated = 0
+    effort_estimates_filtered = 0
+    
+    def on_children(children: list[dict[str, Any]], level: int) -> list[str]:
+        # Levels of new issues are provisional; relevel() derives them from parent links
+        nonlocal updated, effort_estimates_filtered
+        next_level_keys = []
+        for child_raw in children:
+            key = child_raw.get("key")
+            if not key:
+                print(f"    Warning: Issue without key: {child_raw.get('id', 'unknown')}")
+                continue
+            
+            # Skip "Effort Estimate" issues (and drop any that became one)
+            if is_effort_estimate(child_raw):
+                effort_estimates_filtered += 1
+                store.remove(key)
+                continue
+            
+            if key in known_keys:
+                # Re-fetched inside the watermark margin but unchanged: a cache hit
+                if store_issue(store, child_raw, store.entries[key]["level"]):
+                    updated += 1
+            elif key not in new_keys:
+                # New to the tree: its existing children need fetching too
+                new_keys.add(key)
+                next_level_keys.append(key)
+                store_issue(store, child_raw, level)
+        return next_level_keys
+    
+    subtree_roots: list[str] = []
+    for results in engine.map(JIRA_BASE_URL, search, searches):
+        if results is None:
+            failed += 1
+            continue
+        subtree_roots.extend(on_children(results, 1))
+    
+    if subtree_roots:
+        print(f"    Fetching subtrees of {len(subtree_roots)} new issues...")
+        failed += engine.run(traverse_hierarchy(engine, subtree_roots, None, on_children))
+    added = len(new_keys)
+    
+    # Roots that failed to fetch still anchor their stored subtrees
+    level_roots = found_roots + [key for key in failed_roots if key in store.entries]
+    removed = store.relevel(level_roots, filter_prefix, MAX_DEPTH, remove=not failed)
+    
+    print(f"    Updated {updated}, added {added}, deleted {deleted}, re-parented {reparented}")
+    if failed:
+        print(f"    Warning: {failed} requests failed; kept unreachable issues and the previous watermark")
+    if removed:
+        print(f"    Removed {len(removed)} issues no longer in the hierarchy")
+    print(f"    {store.cache_report()}")
+    
+    # Generate index files
+    print(f"    Generating index files...")
+    store.save(
+        root_keys=root_keys,
+        filter_prefix=filter_prefix,
+        last_synced=iso_now(),
+        watermark=store.meta["watermark"] if failed else started_at,
+        fields=request_fields(),
+        total_issues=len(store.entries),
+        jira_base_url=JIRA_BASE_URL,
+    )
+    all_issues = write_indexes(store, root_keys)
+    print(f"    {len(all_issues)} issues in store")
+    
+    return {
+        "issues": len(all_issues),
+        "levels": max((i["level"] for i in all_issues), default=0),
+        "filtered": effort_estimates_filtered,
+        "updated": updated,
+        "added": added,
+        "removed": len(removed) + deleted,
+        "failed": failed,
+    }
+
+
+def reindex(root_keys: list[str], database: bool = False) -> dict[str, Any]:
+    """Regenerate index.json and INDEX.md (and the parse cache's catalog, and the database if enabled) from the stored issue files, offline."""
+    store = JiraIssueStore(JIRA_DIR)
+    issues = store.load()
+    if not issues:
+        return {"error": "empty_store", "issues": 0}
+    if database:
+        db = JiraIssueDB(JIRA_DIR / DB_FILE)
+        print(f"    Loaded {db.rebuild(issues.values())} issues into {DB_FILE}")
+        db.close()
+    store.save()
+    all_issues = write_indexes(store, root_keys)
+    print(f"    Regenerated indexes for {len(all_issues)} stored issues")
+    return {
+        "issues": len(all_issues),
+        "levels": max((i["level"] for i in all_issues), default=0),
+    }
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    """Main entry point. Returns the sync result (issue counts) for run_daily.py."""
     parser = argparse.ArgumentParser(description="Sync Jira issue hierarchy")
     parser.add_argument("--root", type=str, action='append', help="Root issue key (can specify multiple times, e.g., --root PROJ-1 --root PROJ-2)")
     parser.add_argument("--filter", type=str, help="Filter children by key prefix (e.g., TEAM-)")
-    parser.add_argument("--full", action="store_true", help="Force full sync (default behaviour)")
+    parser.add_argument("--full", action="store_true", help="Refetch the whole hierarchy instead of only changes")
+    parser.add_argument("--workers", type=int, help=f"Concurrent Jira requests (default: {DEFAULT_WORKERS}; 1 = sequential)")
+    parser.add_argument("--reindex", action="store_true", help="Regenerate index files from the local store without fetching")
+    parser.add_argument("--measure-fields", action="store_true", help="Report bytes and decode time saved by field projection (doubles search requests)")
+    parser.add_argument("--no-index", action="store_true", help="Don't update the search index afterwards")
     parser.add_argument("--debug", action="store_true", help="Show debug information")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    
+    global field_stats
+    if args.measure_fields:
+        field_stats = FieldProjectionStats()
     
     # Verify credentials are set
     if args.debug:
@@ -591,7 +1269,10 @@ def main() -> None:
         print()
     
     config = load_config()
+    configure_http(config.get("http"))
+    configure_storage(config.get("storage"))
     jira_config = config.setdefault("jira", {})
+    configure_fields(jira_config.get("extra_fields"))
     
     # Support both single root_issue (old) and multiple root_issues (new)
     if args.root:
@@ -616,7 +1297,36 @@ def main() -> None:
     
     JIRA_DIR.mkdir(parents=True, exist_ok=True)
     
-    result = sync_hierarchy(root_keys, filter_prefix)
+    if args.reindex:
+        result = reindex(root_keys, jira_config.get("database", False))
+        if "error" in result:
+            print(f"\nReindex failed: {result['error']} (run a sync first)")
+            sys.exit(1)
+        return result
+    
+    workers = args.workers or jira_config.get("workers", DEFAULT_WORKERS)
+    store = JiraIssueStore(JIRA_DIR, request_fields())
+    if jira_config.get("database"):
+        loaded = store.attach_db(JiraIssueDB(JIRA_DIR / DB_FILE))
+        if loaded:
+            print(f"  Database: rebuilt {DB_FILE} from {loaded} stored issues")
+    meta = store.meta
+    if args.full:
+        mode = "full (--full)"
+    elif not meta.get("watermark"):
+        mode = "full (no previous sync)"
+    elif meta.get("root_keys") != root_keys or meta.get("filter_prefix") != filter_prefix:
+        mode = "full (roots or filter changed)"
+    elif meta.get("fields") != request_fields() or store.stale:
+        mode = "full (field list or parse cache changed)"
+    else:
+        mode = "incremental"
+    print(f"  Mode: {mode}")
+    
+    if mode == "incremental":
+        result = sync_incremental(root_keys, filter_prefix, workers, store)
+    else:
+        result = sync_hierarchy(root_keys, filter_prefix, workers, store)
     
     if "error" in result:
         print(f"\nSync failed: {result['error']}")
@@ -631,6 +1341,8 @@ def main() -> None:
     jira_config["last_synced"] = iso_now()
     jira_config["total_issues"] = result.get("issues", 0)
     save_config(config)
+    if config.get("search", {}).get("enabled", True) and not args.no_index:
+        update_index(["jira"])
     
     print()
     print("=" * 60)
@@ -640,10 +1352,19 @@ def main() -> None:
     if filter_prefix:
         print(f"  Filtered by: {filter_prefix}*")
     print(f"  Total issues: {result.get('issues', 0)}")
+    if "updated" in result:
+        print(f"  Changes: {result['updated']} updated, {result['added']} added, {result['removed']} removed")
     if result.get('filtered', 0) > 0:
         print(f"  Effort Estimates excluded: {result.get('filtered', 0)}")
+    if result.get("failed"):
+        print(f"  Failed requests: {result['failed']} (watermark kept; the next sync retries them)")
     print(f"  Hierarchy levels: {result.get('levels', 0)}")
+    print(f"  {write_stats().report()}")
+    if field_stats:
+        field_stats.report()
+    return result
 
 
 if __name__ == "__main__":
-    main()
+    with batched_fsync():
+        main()
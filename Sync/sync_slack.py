@@ -7,12 +7,17 @@ and the user's session token. Replicates the approach used by the slacksnap
 browser extension, but as a standalone script suitable for cron automation.
 
 Usage:
-    python sync_slack.py [--channel CHANNEL_NAME] [--lookback DAYS] [--full] [--debug]
+    python sync_slack.py [--channel CHANNEL_NAME] [--lookback DAYS] [--full]
+                         [--parallel N] [--async] [--warm-directory] [--no-index] [--debug]
 
 Options:
     --channel NAME      Sync a single channel by name (must be in config)
     --lookback DAYS     Override lookback days from config
     --full              Ignore last_synced timestamps; fetch full history window
+    --parallel N        Sync up to N channels concurrently (shared rate budget)
+    --async             Sync channels concurrently with the async engine
+    --warm-directory    Bulk-load all users via users.list into the name cache
+    --no-index          Don't update the search index afterwards (run_daily.py does it once)
     --debug             Show debug information including API responses
 
 Required Environment Variables:
@@ -35,25 +40,42 @@ Token & Cookie Extraction:
 """
 
 import argparse
+import contextlib
+import contextvars
+import functools
+import itertools
 import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import requests
 from dotenv import load_dotenv
 
+from search_index import update_index
+from slack_store import SlackMessageStore
 from utils import (
     SLACK_DIR,
+    AsyncEngine,
+    HTTPSession,
+    batched_fsync,
+    configure_http,
+    configure_storage,
+    get_session,
     load_config,
     save_config,
     save_json,
+    write_stats,
     iso_now,
+    load_json,
+    response_json,
     RateLimiter,
-    with_retry,
+    parse_retry_after,
 )
 
 # Load environment variables
@@ -63,10 +85,35 @@ SLACK_TOKEN = os.getenv("SLACK_SESSION_TOKEN", "")
 SLACK_COOKIE_D = os.getenv("SLACK_COOKIE_D", "")
 SLACK_WORKSPACE_URL = os.getenv("SLACK_WORKSPACE_URL", "https://your-workspace.slack.com").rstrip("/")
 
-# Rate limiters matching slacksnap's approach
-history_limiter = RateLimiter(calls_per_second=1.0)  # 1s between history pages
-thread_limiter = RateLimiter(calls_per_second=1.25)   # 800ms between thread fetches
-user_limiter = RateLimiter(calls_per_second=10.0)     # 100ms between user lookups
+# Slack rate-limit tiers: (requests per minute, burst). Slack documents these
+# as per-method minimums ("Tier 3: 50+ per minute"); the web client gets more
+# headroom, so we run near the observed ceiling and let Retry-After push all
+# workers back together. Override with `slack.tier_limits` in config.json.
+SLACK_TIERS: dict[int, tuple[float, float]] = {
+    2: (20.0, 2.0),
+    3: (100.0, 5.0),
+    4: (600.0, 10.0),
+}
+
+# Tier of each endpoint we call
+ENDPOINT_TIERS: dict[str, int] = {
+    "conversations.history": 3,
+    "conversations.replies": 3,
+    "conversations.info": 3,
+    "users.info": 4,
+    "users.list": 2,
+}
+
+# Concurrent conversations.replies fetches per channel
+DEFAULT_THREAD_WORKERS = 4
+
+# Persistent user/channel name cache
+DIRECTORY_FILE = SLACK_DIR / "_directory.json"
+DEFAULT_DIRECTORY_TTL_HOURS = 24 * 7
+DEFAULT_NEGATIVE_TTL_HOURS = 24
+
+_buckets: dict[str, RateLimiter] = {}
+_buckets_lock = threading.Lock()
 
 
 class SlackTokenError(Exception):
@@ -74,6 +121,14 @@ class SlackTokenError(Exception):
     pass
 
 
+class SlackAPIError(RuntimeError):
+    """Raised when Slack answers a call with a definitive error (e.g. user_not_found)."""
+
+    def __init__(self, endpoint: str, error: str):
+        super().__init__(f"Slack API {endpoint} failed: {error}")
+        self.error = error
+
+
 def check_token() -> None:
     """Verify the Slack session token and cookie are set."""
     if not SLACK_TOKEN:
@@ -92,31 +147,65 @@ def check_token() -> None:
         sys.exit(1)
 
 
-def slack_api(endpoint: str, params: dict[str, str], limiter: RateLimiter,
+def configure_tiers(tier_limits: dict[str, Any] | None) -> None:
+    """Apply `slack.tier_limits` overrides ({"3": [per_minute, burst]})."""
+    for tier, limits in (tier_limits or {}).items():
+        per_minute, burst = limits
+        SLACK_TIERS[int(tier)] = (float(per_minute), float(burst))
+    with _buckets_lock:
+        _buckets.clear()
+
+
+def bucket_for(endpoint: str) -> RateLimiter:
+    """
+    Return the shared token bucket for an endpoint.
+
+    Slack applies tier limits per method, so each endpoint gets its own
+    bucket sized by its tier; every worker calling that endpoint shares it.
+    """
+    with _buckets_lock:
+        bucket = _buckets.get(endpoint)
+        if bucket is None:
+            per_minute, burst = SLACK_TIERS[ENDPOINT_TIERS.get(endpoint, 3)]
+            bucket = RateLimiter(calls_per_second=per_minute / 60.0,
+                                 burst=burst)
+            _buckets[endpoint] = bucket
+        return bucket
+
+
+@functools.cache
+def slack_session() -> HTTPSession:
+    """Return the pooled Slack session, with the d cookie set once."""
+    return get_session(
+        SLACK_WORKSPACE_URL,
+        # data= dicts are sent form-encoded, matching the Slack web client
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+        cookies={"d": SLACK_COOKIE_D},
+    )
+
+
+def slack_api(endpoint: str, params: dict[str, str],
               max_retries: int = 3) -> dict[str, Any]:
     """
     Call a Slack internal API endpoint with rate limiting and retry.
 
     Uses form-encoded POST (matching how the Slack web client and slacksnap
-    call these APIs).
+    call these APIs). Safe to call from worker threads: a rate-limit response
+    defers the endpoint's bucket, pausing every worker until Retry-After.
     """
-    limiter.wait()
+    bucket = bucket_for(endpoint)
 
     url = f"{SLACK_WORKSPACE_URL}/api/{endpoint}"
     params["token"] = SLACK_TOKEN
 
     for attempt in range(1, max_retries + 1):
+        bucket.wait()
         try:
-            response = requests.post(
-                url,
-                data=params,
-                headers={
-                    "Content-Type": "application/x-www-form-urlencoded",
-                },
-                cookies={"d": SLACK_COOKIE_D},
-                timeout=30,
-            )
-            data = response.json()
+            response = slack_session().post(url, data=params)
+            if response.status_code == 429:
+                data = {"ok": False, "error": "ratelimited"}
+            else:
+                data = response_json(response)
 
             if not data.get("ok"):
                 error = data.get("error", "unknown_error")
@@ -129,16 +218,19 @@ def slack_api(endpoint: str, params: dict[str, str], limiter: RateLimiter,
                     )
 
                 if error == "ratelimited":
-                    retry_after = int(data.get("headers", {}).get("Retry-After",
-                                      2 ** attempt * 2))
+                    retry_after = parse_retry_after(
+                        response.headers.get("Retry-After"))
+                    if retry_after is None:
+                        retry_after = float(2 ** attempt * 2)
                     if attempt < max_retries:
-                        print(f"    Rate limited, waiting {retry_after}s "
+                        print(f"    Rate limited on {endpoint}, pausing "
+                              f"{retry_after:.0f}s "
                               f"(attempt {attempt}/{max_retries})...")
-                        time.sleep(retry_after)
+                        bucket.defer(retry_after)
                         continue
                     raise RuntimeError(f"Rate limited after {max_retries} retries")
 
-                raise RuntimeError(f"Slack API {endpoint} failed: {error}")
+                raise SlackAPIError(endpoint, error)
 
             return data
 
@@ -154,16 +246,17 @@ def slack_api(endpoint: str, params: dict[str, str], limiter: RateLimiter,
     raise RuntimeError(f"Failed after {max_retries} attempts")
 
 
-def fetch_messages(channel_id: str, oldest_unix: int,
-                   debug: bool = False) -> list[dict[str, Any]]:
+def iter_message_pages(channel_id: str, oldest_unix: int,
+                       debug: bool = False) -> Iterator[list[dict[str, Any]]]:
     """
-    Fetch all messages from a channel since oldest_unix timestamp.
+    Yield pages of messages from a channel since oldest_unix timestamp.
 
-    Uses conversations.history with cursor-based pagination.
+    Uses conversations.history with cursor-based pagination. Yielding per page
+    lets callers start work on a page before the next one is requested.
     """
-    all_messages: list[dict[str, Any]] = []
     cursor = ""
     page = 0
+    total = 0
 
     while True:
         page += 1
@@ -176,14 +269,16 @@ def fetch_messages(channel_id: str, oldest_unix: int,
         if cursor:
             params["cursor"] = cursor
 
-        data = slack_api("conversations.history", params, history_limiter)
+        data = slack_api("conversations.history", params)
 
         messages = data.get("messages", [])
-        all_messages.extend(messages)
+        total += len(messages)
 
         if debug:
             print(f"      Page {page}: {len(messages)} messages "
-                  f"(total: {len(all_messages)})")
+                  f"(total: {total})")
+
+        yield messages
 
         if not data.get("has_more"):
             break
@@ -192,9 +287,23 @@ def fetch_messages(channel_id: str, oldest_unix: int,
         if not cursor:
             break
 
+
+def fetch_messages(channel_id: str, oldest_unix: int,
+                   debug: bool = False) -> list[dict[str, Any]]:
+    """Fetch all messages from a channel since oldest_unix timestamp."""
+    all_messages: list[dict[str, Any]] = []
+    for messages in iter_message_pages(channel_id, oldest_unix, debug):
+        all_messages.extend(messages)
     return all_messages
 
 
+def is_thread_parent(msg: dict[str, Any]) -> bool:
+    """Return True if the message starts a thread that has replies."""
+    return bool(msg.get("thread_ts")
+                and msg.get("reply_count", 0) > 0
+                and msg.get("ts") == msg["thread_ts"])
+
+
 def fetch_thread_replies(channel_id: str, thread_ts: str,
                          oldest_unix: int) -> list[dict[str, Any]]:
     """Fetch all replies in a thread."""
@@ -205,130 +314,324 @@ def fetch_thread_replies(channel_id: str, thread_ts: str,
         "oldest": str(oldest_unix),
     }
 
-    data = slack_api("conversations.replies", params, thread_limiter)
+    data = slack_api("conversations.replies", params)
     return data.get("messages", [])
 
 
+class SlackDirectory:
+    """
+    Persistent cache of user and channel names, shared across channels and runs.
+
+    Stored at Synced-Data/Slack/_directory.json. Entries expire after
+    `ttl_hours`; IDs that Slack says don't exist are cached as misses for the
+    shorter `negative_ttl_hours` so they aren't looked up on every channel.
+    Thread-safe, so parallel channel syncs can share one instance.
+    """
+
+    def __init__(self, path: Path = DIRECTORY_FILE,
+                 ttl_hours: float = DEFAULT_DIRECTORY_TTL_HOURS,
+                 negative_ttl_hours: float = DEFAULT_NEGATIVE_TTL_HOURS):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.negative_ttl = negative_ttl_hours * 3600
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._data: dict[str, Any] = {"users": {}, "channels": {},
+                                      "users_warmed_at": 0}
+        if path.exists():
+            try:
+                self._data.update(load_json(path))
+            except (OSError, ValueError) as e:
+                print(f"  WARNING: Ignoring unreadable directory cache: {e}")
+
+    def _get(self, kind: str, key: str) -> tuple[bool, str | None]:
+        """Return (found, name); name is None for a cached negative entry."""
+        with self._lock:
+            entry = self._data[kind].get(key)
+            if entry:
+                ttl = self.ttl if entry["name"] is not None else self.negative_ttl
+                if time.time() - entry["cached_at"] < ttl:
+                    self.hits += 1
+                    return True, entry["name"]
+            self.misses += 1
+            return False, None
+
+    def _put(self, kind: str, key: str, name: str | None) -> None:
+        with self._lock:
+            self._data[kind][key] = {"name": name, "cached_at": int(time.time())}
+
+    def get_user(self, user_id: str) -> tuple[bool, str | None]:
+        return self._get("users", user_id)
+
+    def put_user(self, user_id: str, name: str | None) -> None:
+        self._put("users", user_id, name)
+
+    def get_channel(self, channel_id: str) -> tuple[bool, str | None]:
+        return self._get("channels", channel_id)
+
+    def put_channel(self, channel_id: str, name: str | None) -> None:
+        self._put("channels", channel_id, name)
+
+    def users_warm(self) -> bool:
+        """True if a users.list warm-up ran within the TTL."""
+        return time.time() - self._data.get("users_warmed_at", 0) < self.ttl
+
+    def mark_users_warmed(self) -> None:
+        with self._lock:
+            self._data["users_warmed_at"] = int(time.time())
+
+    def save(self) -> None:
+        """Write the cache, dropping entries that have expired."""
+        now = time.time()
+        with self._lock:
+            for kind in ("users", "channels"):
+                self._data[kind] = {
+                    key: entry for key, entry in self._data[kind].items()
+                    if now - entry["cached_at"] < (
+                        self.ttl if entry["name"] is not None
+                        else self.negative_ttl)
+                }
+            save_json(self._data, self.path, machine=True)
+
+
+def user_display_name(user: dict[str, Any]) -> str:
+    """Pick the best display name from a Slack user object."""
+    return (
+        user.get("real_name")
+        or user.get("profile", {}).get("display_name")
+        or user.get("profile", {}).get("real_name")
+        or user.get("name")
+        or "Unknown User"
+    )
+
+
 def fetch_user(user_id: str) -> dict[str, Any] | None:
-    """Fetch a single user's profile."""
+    """
+    Fetch a single user's profile.
+
+    Returns None if Slack reports the user doesn't exist; transient failures
+    (rate limiting, connection errors) propagate.
+    """
     params: dict[str, str] = {"user": user_id}
 
     try:
-        data = slack_api("users.info", params, user_limiter)
+        data = slack_api("users.info", params)
         return data.get("user")
-    except RuntimeError:
+    except SlackAPIError:
         return None
 
 
-def resolve_users(user_ids: set[str], debug: bool = False) -> dict[str, str]:
+def warm_user_directory(directory: SlackDirectory,
+                        debug: bool = False) -> int:
+    """
+    Page through users.list once and load every member into the directory.
+
+    Per-user users.info calls are then only made for IDs the list missed
+    (e.g. users from shared Slack Connect channels).
+    """
+    cursor = ""
+    count = 0
+
+    while True:
+        params: dict[str, str] = {"limit": "200"}
+        if cursor:
+            params["cursor"] = cursor
+
+        data = slack_api("users.list", params)
+        for user in data.get("members", []):
+            if user.get("id"):
+                directory.put_user(user["id"], user_display_name(user))
+                count += 1
+
+        if debug:
+            print(f"      users.list: {count} users so far")
+
+        cursor = data.get("response_metadata", {}).get("next_cursor", "")
+        if not cursor:
+            break
+
+    directory.mark_users_warmed()
+    return count
+
+
+def resolve_users(user_ids: set[str], directory: SlackDirectory,
+                  debug: bool = False) -> dict[str, str]:
     """
     Resolve a set of user IDs to display names.
 
+    Cached names come from the directory; only misses call users.info.
+
     Returns a dict mapping user_id -> display_name.
     """
     user_map: dict[str, str] = {}
-    total = len(user_ids)
+    fetched = 0
 
     if debug:
-        print(f"    Resolving {total} users...")
-
-    for i, user_id in enumerate(user_ids, 1):
-        user = fetch_user(user_id)
-        if user:
-            name = (
-                user.get("real_name")
-                or user.get("profile", {}).get("display_name")
-                or user.get("profile", {}).get("real_name")
-                or user.get("name")
-                or "Unknown User"
-            )
-            user_map[user_id] = name
-        else:
-            user_map[user_id] = "Unknown User"
-
-        # Longer pause every 10 users
-        if i % 10 == 0 and i < total:
-            time.sleep(0.5)
+        print(f"    Resolving {len(user_ids)} users...")
+
+    for user_id in user_ids:
+        found, name = directory.get_user(user_id)
+        if not found:
+            fetched += 1
+            try:
+                user = fetch_user(user_id)
+            except RuntimeError:
+                # Transient failure: don't cache, try again next run
+                user_map[user_id] = "Unknown User"
+                continue
+            name = user_display_name(user) if user else None
+            directory.put_user(user_id, name)
+        user_map[user_id] = name or "Unknown User"
 
     if debug:
-        print(f"    Resolved {len(user_map)} users")
+        print(f"    Resolved {len(user_map)} users ({fetched} looked up)")
 
     return user_map
 
 
 def fetch_channel_info(channel_id: str) -> dict[str, Any] | None:
-    """Fetch a single channel's info."""
+    """
+    Fetch a single channel's info.
+
+    Returns None if Slack reports the channel doesn't exist or isn't visible;
+    transient failures propagate.
+    """
     params: dict[str, str] = {"channel": channel_id}
 
     try:
-        data = slack_api("conversations.info", params, user_limiter)
+        data = slack_api("conversations.info", params)
         return data.get("channel")
-    except RuntimeError:
+    except SlackAPIError:
         return None
 
 
-def resolve_channels(channel_ids: set[str],
+def resolve_channels(channel_ids: set[str], directory: SlackDirectory,
                      debug: bool = False) -> dict[str, str]:
     """
     Resolve a set of channel IDs to channel names.
 
+    Cached names come from the directory; only misses call conversations.info.
+
     Returns a dict mapping channel_id -> channel_name.
     """
     channel_map: dict[str, str] = {}
     if not channel_ids:
         return channel_map
 
+    fetched = 0
+
     if debug:
         print(f"    Resolving {len(channel_ids)} channel references...")
 
     for channel_id in channel_ids:
-        info = fetch_channel_info(channel_id)
-        if info:
-            channel_map[channel_id] = info.get("name", channel_id)
-        else:
-            channel_map[channel_id] = channel_id
+        found, name = directory.get_channel(channel_id)
+        if not found:
+            fetched += 1
+            try:
+                info = fetch_channel_info(channel_id)
+            except RuntimeError:
+                channel_map[channel_id] = channel_id
+                continue
+            name = info.get("name", channel_id) if info else None
+            directory.put_channel(channel_id, name)
+        channel_map[channel_id] = name or channel_id
 
     if debug:
-        print(f"    Resolved {len(channel_map)} channels")
+        print(f"    Resolved {len(channel_map)} channels ({fetched} looked up)")
 
     return channel_map
 
 
-def clean_text(text: str, user_map: dict[str, str] | None = None,
-               channel_map: dict[str, str] | None = None) -> str:
-    """Clean Slack message text, resolving user mentions and channel links."""
-    if not text:
-        return ""
+# Every piece of Slack markup is a <...> token; splitting on this pattern
+# yields [text, token, text, token, ..., text] in one pass over the string
+MARKUP_TOKEN_RE = re.compile(r"<([^<>]*)>")
+SLACK_ID_RE = re.compile(r"[A-Z0-9]+")
+SPECIAL_MENTIONS = ("here", "channel", "everyone")
 
-    # Resolve user mentions <@U12345> -> @DisplayName
-    if user_map:
-        text = re.sub(
-            r"<@([A-Z0-9]+)>",
-            lambda m: "@" + user_map.get(m.group(1), "unknown"),
-            text,
-        )
 
-    # Resolve channel references <#C12345|channel-name> -> #channel-name
-    text = re.sub(r"<#[A-Z0-9]+\|([^>]+)>", r"#\1", text)
-    if channel_map:
-        text = re.sub(
-            r"<#([A-Z0-9]+)>",
-            lambda m: "#" + channel_map.get(m.group(1), m.group(1)),
-            text,
-        )
-    else:
-        text = re.sub(r"<#([A-Z0-9]+)>", r"#\1", text)
+def parse_markup(text: str) -> list[str]:
+    """
+    Split Slack message text into literal text and markup tokens.
+
+    Odd indices of the result are token bodies (the text between < and >),
+    even indices are literal text. Parse once, then collect_refs() and
+    render_markup() both work from the same parts.
+    """
+    return MARKUP_TOKEN_RE.split(text) if text else [""]
+
+
+def collect_refs(parts: list[str], user_ids: set[str],
+                 channel_ids: set[str]) -> None:
+    """Add user mentions (<@U123>) and bare channel refs (<#C123>) to the sets."""
+    for i in range(1, len(parts), 2):
+        token = parts[i]
+        sigil = token[:1]
+        if sigil == "@":
+            if SLACK_ID_RE.fullmatch(token, 1):
+                user_ids.add(token[1:])
+        elif sigil == "#":
+            # <#C123|name> carries its own name; only bare refs need lookup
+            if SLACK_ID_RE.fullmatch(token, 1):
+                channel_ids.add(token[1:])
+
+
+def render_token(token: str, user_map: dict[str, str] | None,
+                 channel_map: dict[str, str] | None) -> str | None:
+    """Render one markup token as plain text, or None to leave it as-is."""
+    sigil = token[:1]
+
+    # User mentions <@U12345> -> @DisplayName
+    if sigil == "@":
+        if user_map and SLACK_ID_RE.fullmatch(token, 1):
+            return "@" + user_map.get(token[1:], "unknown")
+        return None
+
+    # Channel references <#C12345|channel-name> / <#C12345> -> #channel-name
+    if sigil == "#":
+        channel_id, pipe, name = token[1:].partition("|")
+        if not SLACK_ID_RE.fullmatch(channel_id):
+            return None
+        if pipe:
+            return "#" + name if name else None
+        if channel_map:
+            return "#" + channel_map.get(channel_id, channel_id)
+        return "#" + channel_id
+
+    # Special mentions <!here>, <!channel|channel>, <!everyone>
+    if sigil == "!":
+        for special in SPECIAL_MENTIONS:
+            if token.startswith(special, 1):
+                return "@" + special
+        return None
 
-    # Resolve URLs <http://example.com|label> -> [label](http://example.com)
-    text = re.sub(r"<(https?://[^|>]+)\|([^>]+)>", r"[\2](\1)", text)
-    text = re.sub(r"<(https?://[^>]+)>", r"\1", text)
+    # URLs <http://example.com|label> -> [label](http://example.com)
+    if token.startswith(("http://", "https://")):
+        scheme_len = 8 if token[4] == "s" else 7
+        url, pipe, label = token.partition("|")
+        if pipe and label and len(url) > scheme_len:
+            return f"[{label}]({url})"
+        return token if len(token) > scheme_len else None
 
-    # Handle Slack formatting
-    text = re.sub(r"<!here\|?[^>]*>", "@here", text)
-    text = re.sub(r"<!channel\|?[^>]*>", "@channel", text)
-    text = re.sub(r"<!everyone\|?[^>]*>", "@everyone", text)
+    return None
 
-    return text.strip()
+
+def render_markup(parts: list[str], user_map: dict[str, str] | None = None,
+                  channel_map: dict[str, str] | None = None) -> str:
+    """Join parsed parts back into text with every known token rendered."""
+    out = parts[:]
+    for i in range(1, len(out), 2):
+        rendered = render_token(out[i], user_map, channel_map)
+        out[i] = f"<{out[i]}>" if rendered is None else rendered
+    return "".join(out).strip()
+
+
+def clean_text(text: str, user_map: dict[str, str] | None = None,
+               channel_map: dict[str, str] | None = None) -> str:
+    """Clean Slack message text, resolving user mentions and channel links."""
+    if not text:
+        return ""
+    return render_markup(parse_markup(text), user_map, channel_map)
 
 
 def ts_to_iso(ts: str) -> str:
@@ -341,73 +644,75 @@ def ts_to_iso(ts: str) -> str:
         return ts
 
 
-def sync_channel(channel_id: str, channel_name: str, oldest_unix: int,
-                 include_threads: bool = True,
-                 debug: bool = False) -> dict[str, Any]:
+def iter_pages_with_replies(channel_id: str, oldest_unix: int,
+                            include_threads: bool = True,
+                            thread_workers: int = DEFAULT_THREAD_WORKERS,
+                            debug: bool = False,
+                            ) -> Iterator[tuple[list[dict[str, Any]],
+                                                dict[str, list[dict[str, Any]]]]]:
     """
-    Sync a single channel and return structured data.
+    Yield (page, replies_by_thread_ts) for each conversations.history page.
 
-    Returns a dict with channel metadata and enriched messages.
+    Each page's thread fetches go to a pool of `thread_workers` threads as
+    soon as the page arrives, and the page is only yielded once the next one
+    has been requested, so replies download while pagination continues. At
+    most two pages and their replies are held at a time.
     """
-    print(f"    Fetching messages since {datetime.fromtimestamp(oldest_unix, tz=timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}...")
-
-    raw_messages = fetch_messages(channel_id, oldest_unix, debug)
+    pool = ThreadPoolExecutor(max_workers=max(1, thread_workers),
+                              thread_name_prefix="slack-replies")
+    pending: tuple[list[dict[str, Any]], dict[str, Future]] | None = None
 
-    if not raw_messages:
-        print(f"    No messages found")
-        return {"channel": channel_name, "channel_id": channel_id,
-                "messages": [], "message_count": 0}
-
-    print(f"    Found {len(raw_messages)} messages")
+    def collect(page: list[dict[str, Any]], futures: dict[str, Future]):
+        return page, {ts: future.result() for ts, future in futures.items()}
 
+    try:
+        for page in iter_message_pages(channel_id, oldest_unix, debug):
+            futures: dict[str, Future] = {}
+            if include_threads:
+                for msg in page:
+                    if is_thread_parent(msg):
+                        futures[msg["thread_ts"]] = pool.submit(
+                            fetch_thread_replies, channel_id,
+                            msg["thread_ts"], oldest_unix)
+            if pending:
+                yield collect(*pending)
+            pending = (page, futures)
+        if pending:
+            yield collect(*pending)
+    finally:
+        # On error (e.g. expired token) drop queued fetches instead of
+        # waiting for them to fail one by one
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def enrich_page(page: list[dict[str, Any]],
+                replies_by_thread: dict[str, list[dict[str, Any]]],
+                directory: SlackDirectory,
+                debug: bool = False) -> list[dict[str, Any]]:
+    """Resolve names and build enriched messages for one history page."""
     # Collect user IDs and channel IDs from messages
     user_ids: set[str] = set()
     channel_ids: set[str] = set()
-    thread_replies_cache: dict[str, list[dict[str, Any]]] = {}
 
-    for msg in raw_messages:
+    # Parse each text once; the parts are reused when rendering below
+    markup: dict[int, list[str]] = {}
+    for msg in itertools.chain(page, *replies_by_thread.values()):
         if msg.get("user"):
             user_ids.add(msg["user"])
-
-        msg_text = msg.get("text", "")
-
-        # Collect user mentions
-        mentions = re.findall(r"<@([A-Z0-9]+)>", msg_text)
-        user_ids.update(mentions)
-
-        # Collect channel references without pipe alias: <#C12345>
-        chan_refs = re.findall(r"<#([A-Z0-9]+)>", msg_text)
-        channel_ids.update(chan_refs)
-
-        # Fetch thread replies
-        if (include_threads and msg.get("thread_ts")
-                and msg.get("reply_count", 0) > 0
-                and msg["ts"] == msg["thread_ts"]):
-            replies = fetch_thread_replies(channel_id, msg["thread_ts"],
-                                           oldest_unix)
-            thread_replies_cache[msg["thread_ts"]] = replies
-
-            for reply in replies:
-                if reply.get("user"):
-                    user_ids.add(reply["user"])
-                reply_text = reply.get("text", "")
-                reply_mentions = re.findall(r"<@([A-Z0-9]+)>", reply_text)
-                user_ids.update(reply_mentions)
-                reply_chan_refs = re.findall(r"<#([A-Z0-9]+)>", reply_text)
-                channel_ids.update(reply_chan_refs)
-
-    if debug:
-        print(f"    Threads fetched: {len(thread_replies_cache)}")
+        parts = parse_markup(msg.get("text", ""))
+        markup[id(msg)] = parts
+        collect_refs(parts, user_ids, channel_ids)
 
     # Resolve user IDs to names
-    user_map = resolve_users(user_ids, debug)
+    user_map = resolve_users(user_ids, directory, debug)
 
     # Resolve channel IDs to names
-    channel_map = resolve_channels(channel_ids, debug)
+    channel_map = resolve_channels(channel_ids, directory, debug)
 
     # Build enriched messages
     enriched: list[dict[str, Any]] = []
-    for msg in raw_messages:
+    # Slack returns newest first; emit each page oldest first
+    for msg in reversed(page):
         # Skip thread replies that appear in the main timeline
         # (they show up as both a reply and a standalone message)
         if (msg.get("thread_ts") and msg.get("thread_ts") != msg.get("ts")
@@ -415,7 +720,7 @@ def sync_channel(channel_id: str, channel_name: str, oldest_unix: int,
             continue
 
         sender = user_map.get(msg.get("user", ""), "Unknown User")
-        text = clean_text(msg.get("text", ""), user_map, channel_map)
+        text = render_markup(markup[id(msg)], user_map, channel_map)
 
         message_data: dict[str, Any] = {
             "ts": msg.get("ts", ""),
@@ -438,14 +743,14 @@ def sync_channel(channel_id: str, channel_name: str, oldest_unix: int,
 
         # Add thread replies
         if msg.get("thread_ts") and msg["ts"] == msg.get("thread_ts"):
-            replies_raw = thread_replies_cache.get(msg["thread_ts"], [])
+            replies_raw = replies_by_thread.get(msg["thread_ts"], [])
             for reply in replies_raw:
                 if reply["ts"] == msg["ts"]:
                     continue  # Skip parent message
                 reply_sender = user_map.get(reply.get("user", ""),
                                             "Unknown User")
-                reply_text = clean_text(reply.get("text", ""), user_map,
-                                        channel_map)
+                reply_text = render_markup(markup[id(reply)], user_map,
+                                           channel_map)
                 message_data["replies"].append({
                     "ts": reply.get("ts", ""),
                     "user_id": reply.get("user", ""),
@@ -456,20 +761,156 @@ def sync_channel(channel_id: str, channel_name: str, oldest_unix: int,
 
         enriched.append(message_data)
 
-    # Sort chronologically
-    enriched.sort(key=lambda m: float(m.get("ts", "0")))
+    return enriched
+
+
+def sync_channel(channel_id: str, channel_name: str, oldest_unix: int,
+                 directory: SlackDirectory, store: SlackMessageStore,
+                 include_threads: bool = True,
+                 thread_workers: int = DEFAULT_THREAD_WORKERS,
+                 debug: bool = False) -> dict[str, Any]:
+    """
+    Sync a single channel into its message store.
+
+    Streams page by page: fetch, expand thread replies, enrich, then append
+    to the store, so memory stays bounded by a couple of pages however long
+    the history is.
+
+    Returns a dict with channel metadata and message counts.
+    """
+    print(f"    Fetching messages since {datetime.fromtimestamp(oldest_unix, tz=timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}...")
+
+    message_count = added = updated = threads = 0
+    with contextlib.closing(iter_pages_with_replies(
+            channel_id, oldest_unix, include_threads, thread_workers,
+            debug)) as pages:
+        for page, replies_by_thread in pages:
+            enriched = enrich_page(page, replies_by_thread, directory, debug)
+            page_added, page_updated = store.merge(enriched)
+            message_count += len(enriched)
+            added += page_added
+            updated += page_updated
+            threads += len(replies_by_thread)
+
+    if not message_count:
+        print(f"    No messages found")
+    elif debug:
+        print(f"    Threads fetched: {threads}")
 
     return {
         "channel": channel_name,
         "channel_id": channel_id,
-        "messages": enriched,
-        "message_count": len(enriched),
+        "message_count": message_count,
+        "added": added,
+        "updated": updated,
     }
 
 
+class ChannelCheckpoints:
+    """
+    Per-channel last-synced timestamps in config.json.
 
-def main() -> None:
-    """Main entry point."""
+    Each channel's checkpoint is written (atomically, via save_config) as soon
+    as that channel finishes, so a crash or expired token later in the run
+    keeps the progress of every channel that already completed.
+    """
+
+    def __init__(self, config: dict[str, Any]):
+        self.config = config
+        self._lock = threading.Lock()
+
+    def get(self, channel_id: str) -> str | None:
+        with self._lock:
+            return self.config["slack"].get("last_synced_channels", {}).get(
+                channel_id)
+
+    def mark(self, channel_id: str, synced_at: str) -> None:
+        with self._lock:
+            last_synced_channels = self.config["slack"].setdefault(
+                "last_synced_channels", {})
+            last_synced_channels[channel_id] = synced_at
+            save_config(self.config)
+
+
+def sync_one_channel(channel_cfg: dict[str, Any], slack_config: dict[str, Any],
+                     directory: SlackDirectory,
+                     checkpoints: ChannelCheckpoints, stop: threading.Event,
+                     lookback_days: int, full: bool = False,
+                     include_threads: bool = True,
+                     thread_workers: int = DEFAULT_THREAD_WORKERS,
+                     debug: bool = False) -> dict[str, Any] | None:
+    """
+    Sync, save and checkpoint one configured channel.
+
+    Returns a result row for the summary, or None if the run was stopped
+    (expired token) before this channel started.
+    """
+    if stop.is_set():
+        return None
+
+    channel_name = channel_cfg.get("name", "unknown")
+    channel_id = channel_cfg.get("id", "")
+
+    print(f"\n  [{channel_name}] (ID: {channel_id})")
+
+    # Determine oldest timestamp
+    lookback_dt = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+    oldest = lookback_dt
+    if not full:
+        last_synced = checkpoints.get(channel_id)
+        if last_synced:
+            # Use last sync time, but cap at lookback_days
+            try:
+                last_dt = datetime.fromisoformat(
+                    last_synced.replace("Z", "+00:00"))
+                oldest = max(last_dt, lookback_dt)
+            except (ValueError, TypeError):
+                pass
+
+    oldest_unix = int(oldest.timestamp())
+    # Checkpoint from when the fetch started, so messages posted while the
+    # channel is syncing are picked up next run
+    started_at = iso_now()
+
+    try:
+        channel_dir = SLACK_DIR / channel_name
+        channel_dir.mkdir(parents=True, exist_ok=True)
+
+        store = SlackMessageStore(channel_dir, channel_name, channel_id)
+        migrated = store.migrate_legacy()
+        if migrated:
+            print(f"    Imported {migrated} messages from legacy messages.json")
+
+        channel_data = sync_channel(
+            channel_id, channel_name, oldest_unix, directory, store,
+            include_threads=include_threads,
+            thread_workers=thread_workers, debug=debug,
+        )
+        store.save_index()
+
+        checkpoints.mark(channel_id, started_at)
+
+        print(f"    [{channel_name}] Stored {channel_data['added']} new, "
+              f"{channel_data['updated']} updated "
+              f"({store.index['total_messages']} total)")
+        return {"channel": channel_name,
+                "messages": channel_data["message_count"], "status": "OK"}
+
+    except SlackTokenError as e:
+        print(f"    ERROR: {e}")
+        # Token is expired; no point continuing with other channels
+        stop.set()
+        return {"channel": channel_name, "messages": 0,
+                "status": "FAIL(expired_token)"}
+
+    except Exception as e:
+        print(f"    ERROR: {e}")
+        return {"channel": channel_name, "messages": 0,
+                "status": f"FAIL({e})"}
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    """Main entry point. Returns per-channel statuses for run_daily.py."""
     parser = argparse.ArgumentParser(description="Sync Slack channel messages")
     parser.add_argument("--channel", type=str,
                         help="Sync a single channel by name")
@@ -477,13 +918,23 @@ def main() -> None:
                         help="Override lookback days")
     parser.add_argument("--full", action="store_true",
                         help="Ignore last_synced; use full lookback window")
+    parser.add_argument("--parallel", type=int, default=1, metavar="N",
+                        help="Sync up to N channels concurrently")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Sync channels concurrently with the async engine")
+    parser.add_argument("--warm-directory", action="store_true",
+                        help="Bulk-load all users via users.list before syncing")
+    parser.add_argument("--no-index", action="store_true",
+                        help="Don't update the search index afterwards")
     parser.add_argument("--debug", action="store_true",
                         help="Show debug information")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     check_token()
 
     config = load_config()
+    configure_http(config.get("http"))
+    configure_storage(config.get("storage"))
     slack_config = config.setdefault("slack", {})
 
     # Get channel list from config
@@ -498,6 +949,8 @@ def main() -> None:
 
     lookback_days = args.lookback or slack_config.get("lookback_days", 7)
     include_threads = slack_config.get("include_threads", True)
+    thread_workers = slack_config.get("thread_workers", DEFAULT_THREAD_WORKERS)
+    configure_tiers(slack_config.get("tier_limits"))
 
     # Filter to single channel if specified
     if args.channel:
@@ -515,90 +968,82 @@ def main() -> None:
     print(f"  Channels: {len(channels)}")
     print(f"  Lookback: {lookback_days} days")
     print(f"  Threads: {'yes' if include_threads else 'no'}")
+    if args.parallel > 1:
+        print(f"  Parallel: {args.parallel} channels")
 
     SLACK_DIR.mkdir(parents=True, exist_ok=True)
-    total_messages = 0
-    results: list[dict[str, Any]] = []
+
+    directory = SlackDirectory(
+        ttl_hours=slack_config.get("directory_ttl_hours",
+                                   DEFAULT_DIRECTORY_TTL_HOURS),
+        negative_ttl_hours=slack_config.get("directory_negative_ttl_hours",
+                                            DEFAULT_NEGATIVE_TTL_HOURS),
+    )
+    if ((args.warm_directory or slack_config.get("directory_warmup", False))
+            and not directory.users_warm()):
+        print("\n  Warming user directory from users.list...")
+        try:
+            print(f"    Loaded {warm_user_directory(directory, args.debug)} users")
+        except SlackTokenError as e:
+            print(f"    ERROR: {e}")
+            # Every channel would fail the same way; report it like the sync does
+            return {"messages": 0, "channels": {}, "token_expired": True}
+        except RuntimeError as e:
+            print(f"    WARNING: Warm-up failed, falling back to per-user lookups: {e}")
+
+    checkpoints = ChannelCheckpoints(config)
+    stop = threading.Event()
+    runnable: list[dict[str, Any]] = []
 
     for channel_cfg in channels:
         channel_name = channel_cfg.get("name", "unknown")
-        channel_id = channel_cfg.get("id", "")
-        enabled = channel_cfg.get("enabled", True)
-
-        if not enabled:
+        if not channel_cfg.get("enabled", True):
             print(f"\n  [{channel_name}] Skipped (disabled)")
-            continue
-
-        if not channel_id:
+        elif not channel_cfg.get("id", ""):
             print(f"\n  [{channel_name}] Skipped (no channel ID)")
-            continue
-
-        print(f"\n  [{channel_name}] (ID: {channel_id})")
-
-        # Determine oldest timestamp
-        if args.full:
-            oldest = datetime.now(timezone.utc) - timedelta(days=lookback_days)
         else:
-            last_synced = slack_config.get("last_synced_channels", {}).get(
-                channel_id)
-            if last_synced:
-                # Use last sync time, but cap at lookback_days
-                try:
-                    last_dt = datetime.fromisoformat(
-                        last_synced.replace("Z", "+00:00"))
-                    lookback_dt = (datetime.now(timezone.utc)
-                                   - timedelta(days=lookback_days))
-                    oldest = max(last_dt, lookback_dt)
-                except (ValueError, TypeError):
-                    oldest = (datetime.now(timezone.utc)
-                              - timedelta(days=lookback_days))
-            else:
-                oldest = (datetime.now(timezone.utc)
-                          - timedelta(days=lookback_days))
-
-        oldest_unix = int(oldest.timestamp())
-
-        try:
-            channel_data = sync_channel(
-                channel_id, channel_name, oldest_unix,
-                include_threads=include_threads, debug=args.debug,
-            )
-
-            msg_count = channel_data.get("message_count", 0)
-            total_messages += msg_count
-            results.append({"channel": channel_name, "messages": msg_count,
-                            "status": "OK"})
-
-            # Save channel data
-            channel_dir = SLACK_DIR / channel_name
-            channel_dir.mkdir(parents=True, exist_ok=True)
-
-            save_json(channel_data, channel_dir / "messages.json")
-
-            # Track last synced time per channel
-            last_synced_channels = slack_config.setdefault(
-                "last_synced_channels", {})
-            last_synced_channels[channel_id] = iso_now()
-
-            print(f"    Saved {msg_count} messages")
+            runnable.append(channel_cfg)
+
+    def run(channel_cfg: dict[str, Any]) -> dict[str, Any] | None:
+        return sync_one_channel(
+            channel_cfg, slack_config, directory, checkpoints, stop,
+            lookback_days=lookback_days, full=args.full,
+            include_threads=include_threads, thread_workers=thread_workers,
+            debug=args.debug,
+        )
 
+    results: list[dict[str, Any]] = []
+    if args.use_async:
+        engine = AsyncEngine(default_limit=max(
+            args.parallel, slack_config.get("async_concurrency", 4)))
+        results = [r for r in engine.map(SLACK_WORKSPACE_URL, run, runnable) if r]
+    elif args.parallel > 1:
+        with ThreadPoolExecutor(max_workers=args.parallel,
+                                thread_name_prefix="slack-channel") as pool:
+            # Each channel runs in a copy of this context, so its output and
+            # write counts stay with this sync when run_daily runs it
+            futures = [pool.submit(contextvars.copy_context().run, run, channel_cfg)
+                       for channel_cfg in runnable]
+            for future in futures:
+                result = future.result()
+                if result:
+                    results.append(result)
+    else:
+        for i, channel_cfg in enumerate(runnable):
+            result = run(channel_cfg)
+            if result is None:
+                break
+            results.append(result)
             # Delay between channels
-            if len(channels) > 1:
+            if result["status"] == "OK" and i < len(runnable) - 1:
                 time.sleep(2.5)
 
-        except SlackTokenError as e:
-            print(f"    ERROR: {e}")
-            results.append({"channel": channel_name, "messages": 0,
-                            "status": "FAIL(expired_token)"})
-            # Token is expired; no point continuing with other channels
-            print("\n  Stopping: Slack token needs to be refreshed")
-            break
+    if stop.is_set():
+        print("\n  Stopping: Slack token needs to be refreshed")
 
-        except Exception as e:
-            print(f"    ERROR: {e}")
-            results.append({"channel": channel_name, "messages": 0,
-                            "status": f"FAIL({e})"})
-            continue
+    total_messages = sum(r["messages"] for r in results)
+
+    directory.save()
 
     # Update config with sync metadata
     slack_config["last_synced"] = iso_now()
@@ -613,6 +1058,9 @@ def main() -> None:
         "workspace_url": SLACK_WORKSPACE_URL,
     }, SLACK_DIR / "_meta.json")
 
+    if config.get("search", {}).get("enabled", True) and not args.no_index:
+        update_index(["slack"])
+
     print()
     print("=" * 60)
     print("Sync Complete!")
@@ -620,7 +1068,15 @@ def main() -> None:
     for r in results:
         print(f"  {r['channel']}: {r['messages']} messages ({r['status']})")
     print(f"  Total: {total_messages} messages")
+    print(f"  Directory cache: {directory.hits} hits, {directory.misses} misses")
+    print(f"  {write_stats().report()}")
+    return {
+        "messages": total_messages,
+        "channels": {r["channel"]: r["status"] for r in results},
+        "token_expired": stop.is_set(),
+    }
 
 
 if __name__ == "__main__":
-    main()
+    with batched_fsync():
+        main()
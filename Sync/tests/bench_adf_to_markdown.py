@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark adf_to_markdown over large synthetic ADF documents.
+
+Each case is converted `--number` times per round, and the best of
+`--repeat` rounds is reported, with the size of its ADF (as JSON) and the
+throughput. The documents are generated from a fixed seed, so runs are
+comparable across changes to the converter.
+
+Usage:
+    python tests/bench_adf_to_markdown.py [--repeat N] [--number N] [--case NAME ...]
+
+Cases:
+    descriptions        300 issue descriptions: headings, marked-up prose,
+                        nested lists, a table, panels, code and quotes
+    comment_threads     2,000 short comments, as in a long comment thread
+    flat_paragraphs     One document of 2,000 paragraphs
+    nested_lists        Bullet lists 7 levels deep, 3 items per level
+    wide_table          A 300 x 6 table
+    deep_quotes         Blockquotes nested 200 deep (past ADF_INLINE_NESTING)
+    blank_line_runs     Text with long runs of newlines to collapse
+"""
+
+import argparse
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sync_jira import adf_to_markdown  # noqa: E402
+
+WORDS = ("shield generator bunker relay power trooper walker shuttle sensor "
+         "array exhaust port reactor hangar deflector tractor beam").split()
+
+
+def text(rng: random.Random, words: int) -> dict[str, Any]:
+    node: dict[str, Any] = {"type": "text", "text": " ".join(rng.choices(WORDS, k=words)) + " "}
+    roll = rng.random()
+    if roll < 0.1:
+        node["marks"] = [{"type": "strong"}]
+    elif roll < 0.15:
+        node["marks"] = [{"type": "code"}]
+    elif roll < 0.2:
+        node["marks"] = [{"type": "link", "attrs": {"href": "https://jira.example.com/browse/DS-1"}}]
+    return node
+
+
+def paragraph(rng: random.Random, spans: int = 4) -> dict[str, Any]:
+    content = [text(rng, rng.randint(3, 12)) for _ in range(spans)]
+    if rng.random() < 0.2:
+        content.append({"type": "mention", "attrs": {"text": "Moff Jerjerrod"}})
+    return {"type": "paragraph", "content": content}
+
+
+def bullet_list(rng: random.Random, depth: int, width: int) -> dict[str, Any]:
+    items = []
+    for _ in range(width):
+        content: list[Any] = [paragraph(rng, 2)]
+        if depth > 1:
+            content.append(bullet_list(rng, depth - 1, width))
+        items.append({"type": "listItem", "content": content})
+    return {"type": rng.choice(["bulletList", "orderedList"]), "content": items}
+
+
+def table(rng: random.Random, rows: int, cols: int) -> dict[str, Any]:
+    return {"type": "table", "content": [
+        {"type": "tableRow", "content": [
+            {"type": "tableHeader" if r == 0 else "tableCell", "content": [paragraph(rng, 1)]}
+            for _ in range(cols)
+        ]}
+        for r in range(rows)
+    ]}
+
+
+def description(rng: random.Random) -> dict[str, Any]:
+    content: list[Any] = []
+    for section in range(rng.randint(2, 5)):
+        content.append({"type": "heading", "attrs": {"level": 2}, "content": [text(rng, 3)]})
+        content.extend(paragraph(rng) for _ in range(rng.randint(1, 4)))
+        roll = rng.random()
+        if roll < 0.4:
+            content.append(bullet_list(rng, rng.randint(1, 3), rng.randint(2, 5)))
+        elif roll < 0.55:
+            content.append(table(rng, rng.randint(2, 8), rng.randint(2, 5)))
+        elif roll < 0.7:
+            content.append({"type": "panel", "attrs": {"panelType": "warning"}, "content": [paragraph(rng)]})
+        elif roll < 0.85:
+            content.append({"type": "codeBlock", "attrs": {"language": "bash"},
+                            "content": [{"type": "text", "text": "./deploy.sh --env prod\n" * 5}]})
+        else:
+            content.append({"type": "blockquote", "content": [paragraph(rng), paragraph(rng)]})
+    return {"type": "doc", "version": 1, "content": content}
+
+
+def deep_quotes(rng: random.Random, depth: int) -> dict[str, Any]:
+    node = paragraph(rng, 20)
+    for _ in range(depth):
+        node = {"type": "blockquote", "content": [node, paragraph(rng, 1)]}
+    return {"type": "doc", "content": [node]}
+
+
+def cases() -> dict[str, list[dict[str, Any]]]:
+    rng = random.Random(13)
+    doc = lambda *content: {"type": "doc", "version": 1, "content": list(content)}  # noqa: E731
+    return {
+        "descriptions": [description(rng) for _ in range(300)],
+        "comment_threads": [doc(paragraph(rng, rng.randint(1, 5))) for _ in range(2000)],
+        "flat_paragraphs": [doc(*(paragraph(rng, 8) for _ in range(2000)))],
+        "nested_lists": [doc(bullet_list(rng, 7, 3))],
+        "wide_table": [doc(table(rng, 300, 6))],
+        "deep_quotes": [deep_quotes(rng, 200)],
+        "blank_line_runs": [doc(*({"type": "paragraph", "content": [
+            {"type": "text", "text": "x" + "\n" * 200}]} for _ in range(500)))],
+    }
+
+
+def bench(docs: list[dict[str, Any]], repeat: int, number: int) -> float:
+    """Best time in seconds to convert all docs once."""
+    run: Callable[[], None] = lambda: [adf_to_markdown(d) for d in docs]  # noqa: E731
+    return min(timeit.repeat(run, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    all_cases = cases()
+    parser = argparse.ArgumentParser(description="Benchmark adf_to_markdown")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds; the best is reported (default: 5)")
+    parser.add_argument("--number", type=int, default=3, help="Conversions per round (default: 3)")
+    parser.add_argument("--case", nargs="+", choices=sorted(all_cases), help="Run only these cases")
+    args = parser.parse_args()
+
+    print(f"{'case':18s} {'docs':>6s} {'ADF':>9s} {'time':>10s} {'throughput':>12s}")
+    for name, docs in all_cases.items():
+        if args.case and name not in args.case:
+            continue
+        size = sum(len(json.dumps(d)) for d in docs)
+        seconds = bench(docs, args.repeat, args.number)
+        print(f"{name:18s} {len(docs):6d} {size / 1e6:7.2f}MB {seconds * 1000:8.1f}ms "
+              f"{size / 1e6 / seconds:8.1f}MB/s")
+
+
+if __name__ == "__main__":
+    main()
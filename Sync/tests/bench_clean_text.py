@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark Slack message cleaning: the single-pass markup tokenizer
+(parse_markup + collect_refs + render_markup) against the regex pipeline it
+replaced, which scanned each message twice for IDs and then ran nine
+re.sub passes to render it.
+
+Both paths collect the user and channel IDs of every message and then
+render every message, as sync_channel does. The corpus is generated from a
+fixed seed, so runs are comparable across changes. The best of `--repeat`
+rounds is reported.
+
+Usage:
+    python tests/bench_clean_text.py [--messages N] [--repeat N]
+"""
+
+import argparse
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sync_slack import collect_refs, parse_markup, render_markup  # noqa: E402
+
+WORDS = ("shield generator bunker relay power trooper walker shuttle sensor "
+         "array exhaust port reactor hangar deflector tractor beam").split()
+USERS = [f"U{i:08d}" for i in range(200)]
+CHANNELS = [f"C{i:08d}" for i in range(40)]
+
+
+def regex_clean_text(text: str, user_map: dict[str, str] | None = None,
+                     channel_map: dict[str, str] | None = None) -> str:
+    """clean_text as it was before the tokenizer: one re.sub pass per kind of markup."""
+    if not text:
+        return ""
+
+    if user_map:
+        text = re.sub(
+            r"<@([A-Z0-9]+)>",
+            lambda m: "@" + user_map.get(m.group(1), "unknown"),
+            text,
+        )
+
+    text = re.sub(r"<#[A-Z0-9]+\|([^>]+)>", r"#\1", text)
+    if channel_map:
+        text = re.sub(
+            r"<#([A-Z0-9]+)>",
+            lambda m: "#" + channel_map.get(m.group(1), m.group(1)),
+            text,
+        )
+    else:
+        text = re.sub(r"<#([A-Z0-9]+)>", r"#\1", text)
+
+    text = re.sub(r"<(https?://[^|>]+)\|([^>]+)>", r"[\2](\1)", text)
+    text = re.sub(r"<(https?://[^>]+)>", r"\1", text)
+
+    text = re.sub(r"<!here\|?[^>]*>", "@here", text)
+    text = re.sub(r"<!channel\|?[^>]*>", "@channel", text)
+    text = re.sub(r"<!everyone\|?[^>]*>", "@everyone", text)
+
+    return text.strip()
+
+
+def regex_collect_refs(text: str, user_ids: set[str], channel_ids: set[str]) -> None:
+    """ID collection as it was before the tokenizer: two re.findall scans per message."""
+    user_ids.update(re.findall(r"<@([A-Z0-9]+)>", text))
+    channel_ids.update(re.findall(r"<#([A-Z0-9]+)>", text))
+
+
+def message(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(3, 30)):
+        roll = rng.random()
+        if roll < 0.08:
+            parts.append(f"<@{rng.choice(USERS)}>")
+        elif roll < 0.11:
+            channel = rng.choice(CHANNELS)
+            parts.append(f"<#{channel}|ops-{channel[-2:]}>" if rng.random() < 0.5 else f"<#{channel}>")
+        elif roll < 0.14:
+            url = f"https://jira.example.com/browse/DS-{rng.randint(1, 9999)}"
+            parts.append(f"<{url}|DS ticket>" if rng.random() < 0.5 else f"<{url}>")
+        elif roll < 0.15:
+            parts.append(rng.choice(["<!here>", "<!channel>", "<!everyone>", "<!here|here>"]))
+        elif roll < 0.2:
+            parts.append(rng.choice([":rocket:", ":white_check_mark:", ":eyes:"]))
+        else:
+            parts.append(rng.choice(WORDS))
+    return " ".join(parts)
+
+
+def corpus(messages: int) -> list[str]:
+    rng = random.Random(5)
+    return [message(rng) for _ in range(messages)]
+
+
+def regex_pipeline(texts: list[str]) -> list[str]:
+    user_ids: set[str] = set()
+    channel_ids: set[str] = set()
+    for text in texts:
+        regex_collect_refs(text, user_ids, channel_ids)
+    user_map = {uid: f"User {uid[-3:]}" for uid in user_ids}
+    channel_map = {cid: f"chan-{cid[-2:]}" for cid in channel_ids}
+    return [regex_clean_text(text, user_map, channel_map) for text in texts]
+
+
+def tokenizer_pipeline(texts: list[str]) -> list[str]:
+    user_ids: set[str] = set()
+    channel_ids: set[str] = set()
+    parsed = [parse_markup(text) for text in texts]
+    for parts in parsed:
+        collect_refs(parts, user_ids, channel_ids)
+    user_map = {uid: f"User {uid[-3:]}" for uid in user_ids}
+    channel_map = {cid: f"chan-{cid[-2:]}" for cid in channel_ids}
+    return [render_markup(parts, user_map, channel_map) for parts in parsed]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Slack message cleaning")
+    parser.add_argument("--messages", type=int, default=100_000, help="Corpus size (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds; the best is reported (default: 5)")
+    args = parser.parse_args()
+
+    texts = corpus(args.messages)
+    if regex_pipeline(texts) != tokenizer_pipeline(texts):
+        sys.exit("ERROR: the two pipelines disagree on this corpus")
+    size = sum(len(text) for text in texts)
+    print(f"{len(texts)} messages, {size / 1e6:.1f}MB of text")
+
+    results = {}
+    for name, pipeline in (("regex", regex_pipeline), ("tokenizer", tokenizer_pipeline)):
+        results[name] = min(timeit.repeat(lambda: pipeline(texts), number=1, repeat=args.repeat))
+        print(f"{name:10s} {results[name] * 1000:8.1f}ms {size / 1e6 / results[name]:8.1f}MB/s")
+    print(f"speedup    {results['regex'] / results['tokenizer']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
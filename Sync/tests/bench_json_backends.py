@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark the JSON backends behind utils.json_loads/json_dumps (orjson,
+msgspec and the standard library) on API-shaped payloads.
+
+The corpus is built from the pages in golden/json/, repeated with varied
+keys, ids and text from a fixed seed: Jira search pages of 50 issues,
+Slack history pages of 100 messages and GitHub search pages of 100 PRs.
+For each installed backend it reports the best of `--repeat` rounds to
+decode every page, and to encode every page indented (as save_json
+writes) and compact (storage.compact).
+
+Usage:
+    python tests/bench_json_backends.py [--pages N] [--repeat N]
+"""
+
+import argparse
+import copy
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import utils  # noqa: E402
+from utils import JSON_BACKENDS, json_dumps, json_loads, select_json_backend  # noqa: E402
+
+GOLDEN_DIR = Path(__file__).parent / "golden" / "json"
+WORDS = ("shield generator bunker relay power trooper walker shuttle sensor "
+         "réacteur überwachung 日本語 café 🚀 ✅").split()
+
+
+def load(name: str) -> dict[str, Any]:
+    return json.loads((GOLDEN_DIR / f"{name}.json").read_text(encoding="utf-8"))
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def jira_page(rng: random.Random, template: dict[str, Any], start: int) -> dict[str, Any]:
+    issues = []
+    for i in range(50):
+        issue = copy.deepcopy(template["issues"][i % 2])
+        issue["id"] = str(10000 + start + i)
+        issue["key"] = f"DS-{start + i}"
+        issue["fields"]["summary"] = sentence(rng, 8)
+        issues.append(issue)
+    return {**template, "startAt": start, "total": 50 * 100, "issues": issues}
+
+
+def slack_page(rng: random.Random, template: dict[str, Any], page: int) -> dict[str, Any]:
+    messages = []
+    for i in range(100):
+        msg = copy.deepcopy(template["messages"][i % 3])
+        msg["ts"] = f"{1714554000 + page * 1000 + i}.{rng.randint(0, 999999):06d}"
+        msg["text"] = sentence(rng, rng.randint(3, 40))
+        messages.append(msg)
+    return {**template, "messages": messages}
+
+
+def github_page(rng: random.Random, template: dict[str, Any], page: int) -> dict[str, Any]:
+    items = []
+    for i in range(100):
+        item = copy.deepcopy(template["items"][i % 2])
+        item["number"] = page * 100 + i
+        item["title"] = sentence(rng, 6)
+        items.append(item)
+    return {**template, "total_count": 100 * 10, "items": items}
+
+
+def corpus(pages: int) -> list[dict[str, Any]]:
+    rng = random.Random(16)
+    jira, slack, github = load("jira_search"), load("slack_history"), load("github_search")
+    return ([jira_page(rng, jira, p * 50) for p in range(pages)]
+            + [slack_page(rng, slack, p) for p in range(pages)]
+            + [github_page(rng, github, p) for p in range(pages)])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the JSON backends")
+    parser.add_argument("--pages", type=int, default=20, help="Pages per API (default: 20)")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds; the best is reported (default: 5)")
+    args = parser.parse_args()
+
+    pages = corpus(args.pages)
+    raw = [json.dumps(page, ensure_ascii=False).encode("utf-8") for page in pages]
+    pretty_size = sum(len(json.dumps(page, indent=2, ensure_ascii=False).encode()) for page in pages)
+    compact_size = sum(len(data) for data in raw)
+    print(f"{len(pages)} pages: {pretty_size / 1e6:.2f}MB indented, {compact_size / 1e6:.2f}MB compact")
+
+    previous = utils._json_backend
+    print(f"{'backend':8s} {'decode':>9s} {'indented':>10s} {'compact':>9s}")
+    for backend in JSON_BACKENDS:
+        if select_json_backend(backend) != backend:
+            continue
+        best = lambda run: min(timeit.repeat(run, number=1, repeat=args.repeat))  # noqa: E731
+        decode = best(lambda: [json_loads(data) for data in raw])
+        pretty = best(lambda: [json_dumps(page) for page in pages])
+        compact = best(lambda: [json_dumps(page, compact=True) for page in pages])
+        print(f"{backend:8s} {decode * 1000:7.1f}ms {pretty * 1000:8.1f}ms {compact * 1000:7.1f}ms")
+    utils._json_backend = previous
+
+
+if __name__ == "__main__":
+    main()
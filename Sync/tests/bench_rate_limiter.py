@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark RateLimiter throughput against the fixed-interval limiter it
+replaced, at the same quota.
+
+Requests are simulated with sleeps (no network), so the numbers show how
+much of the quota each limiter lets a workload use:
+
+    bursty      One worker making `--burst` calls back to back, then doing
+                50ms of other work (parsing, writing), repeated
+    steady      One worker calling as fast as it is allowed
+    concurrent  `--workers` threads sharing one limiter, 5ms per call
+
+Usage:
+    python tests/bench_rate_limiter.py [--rate N] [--burst N] [--seconds S] [--workers N]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import RateLimiter  # noqa: E402
+
+
+class IntervalLimiter:
+    """RateLimiter as it was: a minimum interval between calls, no burst."""
+
+    def __init__(self, calls_per_second: float = 1.0):
+        self.min_interval = 1.0 / calls_per_second
+        self.last_call = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.time()
+            elapsed = now - self.last_call
+            if elapsed < self.min_interval:
+                time.sleep(self.min_interval - elapsed)
+            self.last_call = time.time()
+
+
+def bursty(wait: Callable[[], None], seconds: float, burst: int, workers: int) -> int:
+    calls = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(burst):
+            wait()
+            calls += 1
+        time.sleep(0.05)
+    return calls
+
+
+def steady(wait: Callable[[], None], seconds: float, burst: int, workers: int) -> int:
+    calls = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        wait()
+        calls += 1
+    return calls
+
+
+def concurrent(wait: Callable[[], None], seconds: float, burst: int, workers: int) -> int:
+    counts = [0] * workers
+    deadline = time.perf_counter() + seconds
+
+    def worker(i: int) -> None:
+        while time.perf_counter() < deadline:
+            wait()
+            time.sleep(0.005)
+            counts[i] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark RateLimiter throughput")
+    parser.add_argument("--rate", type=float, default=100.0, help="Quota in calls/second (default: 100)")
+    parser.add_argument("--burst", type=int, default=5, help="Bucket size, and calls per burst (default: 5)")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Duration of each run (default: 3)")
+    parser.add_argument("--workers", type=int, default=8, help="Threads in the concurrent case (default: 8)")
+    args = parser.parse_args()
+
+    print(f"Quota {args.rate:g} req/s, burst {args.burst}, {args.seconds:g}s per run")
+    print(f"{'case':12s} {'interval':>12s} {'bucket':>12s}")
+    for name, workload in (("bursty", bursty), ("steady", steady), ("concurrent", concurrent)):
+        rates = []
+        for limiter in (IntervalLimiter(args.rate), RateLimiter(args.rate, burst=args.burst)):
+            started = time.perf_counter()
+            calls = workload(limiter.wait, args.seconds, args.burst, args.workers)
+            rates.append(calls / (time.perf_counter() - started))
+        print(f"{name:12s} {rates[0]:8.1f}/s   {rates[1]:8.1f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""Make the Sync modules importable from the tests (they live one directory up)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
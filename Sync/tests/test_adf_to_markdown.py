@@ -0,0 +1,94 @@
+"""
+Golden-file tests for adf_to_markdown.
+
+Each golden/adf/<case>.json holds an ADF document and <case>.md the Markdown
+it converts to (plus a trailing newline). The expected output was produced
+by the previous recursive converter, so these pin its behaviour for every
+node type: text marks, paragraphs, headings, bullet/ordered/nested lists,
+code blocks, quotes, tables, mentions, emoji, rules, hard breaks, panels,
+media, unknown and non-dict nodes.
+
+Nodes nested deeper than ADF_INLINE_NESTING are rendered from an explicit
+stack instead of by direct calls. The deep_* cases nest each node type that
+has a close op (bullet and ordered list items, table cells, quotes, panels,
+and paragraphs, headings and code blocks) 40 levels deep, with siblings
+after every level, and deep_mixed_nesting mixes them. Every case is also
+rendered with the nesting budget forced down to 0-2, which sends nearly
+every node through the stack, and must give the same output.
+
+To regenerate after an intended change in output:
+    UPDATE_GOLDEN=1 python -m pytest tests/test_adf_to_markdown.py
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+import sync_jira
+from sync_jira import adf_to_markdown
+
+GOLDEN_DIR = Path(__file__).parent / "golden" / "adf"
+CASES = sorted(path.stem for path in GOLDEN_DIR.glob("*.json"))
+
+# Container handlers take the nesting budget as a default argument
+NESTING_HANDLERS = [
+    value for name, value in vars(sync_jira).items()
+    if name.startswith("_adf_") and getattr(value, "__defaults__", None) == (sync_jira.ADF_INLINE_NESTING,)
+]
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_golden(case: str) -> None:
+    adf = json.loads((GOLDEN_DIR / f"{case}.json").read_text(encoding="utf-8"))
+    expected_path = GOLDEN_DIR / f"{case}.md"
+    actual = adf_to_markdown(adf) + "\n"
+    if os.environ.get("UPDATE_GOLDEN"):
+        expected_path.write_text(actual, encoding="utf-8")
+    assert actual == expected_path.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("budget", [0, 1, 2])
+@pytest.mark.parametrize("case", CASES)
+def test_golden_on_the_explicit_stack(case: str, budget: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sync_jira, "ADF_INLINE_NESTING", budget)
+    for handler in NESTING_HANDLERS:
+        monkeypatch.setattr(handler, "__defaults__", (budget,))
+    adf = json.loads((GOLDEN_DIR / f"{case}.json").read_text(encoding="utf-8"))
+    expected = (GOLDEN_DIR / f"{case}.md").read_text(encoding="utf-8")
+    assert adf_to_markdown(adf) + "\n" == expected
+
+
+def test_every_container_handler_takes_a_nesting_budget() -> None:
+    containers = {h for h in sync_jira.ADF_HANDLERS.values() if h not in sync_jira.ADF_LEAF_HANDLERS}
+    assert containers <= set(NESTING_HANDLERS)
+
+
+def test_every_handled_node_type_has_a_golden_case() -> None:
+    from sync_jira import ADF_HANDLERS
+
+    seen: set[str] = set()
+
+    def walk(node: object) -> None:
+        if isinstance(node, dict):
+            seen.add(node.get("type", ""))
+            for child in node.get("content", []):
+                walk(child)
+
+    for case in CASES:
+        walk(json.loads((GOLDEN_DIR / f"{case}.json").read_text(encoding="utf-8")))
+    assert set(ADF_HANDLERS) <= seen
+
+
+@pytest.mark.parametrize("value", [None, {}, {"content": []}, "not a dict"])
+def test_empty_input(value: object) -> None:
+    assert adf_to_markdown(value) == ""  # type: ignore[arg-type]
+
+
+def test_deep_nesting_does_not_hit_recursion_limit() -> None:
+    node = {"type": "paragraph", "content": [{"type": "text", "text": "deep"}]}
+    for _ in range(5000):
+        node = {"type": "blockquote", "content": [node]}
+    markdown = adf_to_markdown({"type": "doc", "content": [node]})
+    assert markdown == "> " * 5000 + "deep"
@@ -0,0 +1,45 @@
+"""
+Golden tests for Slack message cleaning.
+
+golden/slack/clean_text.json holds message texts with the output of the
+regex pipeline that clean_text used before the single-pass tokenizer, with
+and without user/channel maps: mentions, channel links, URLs, special
+mentions, emoji, escaped and unclosed markup, and non-ASCII text. clean_text
+and the parse_markup/collect_refs/render_markup path sync_channel uses must
+both reproduce it.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from bench_clean_text import regex_clean_text, regex_collect_refs
+from sync_slack import clean_text, collect_refs, parse_markup, render_markup
+
+GOLDEN = json.loads((Path(__file__).parent / "golden" / "slack" / "clean_text.json")
+                    .read_text(encoding="utf-8"))
+USER_MAP = GOLDEN["user_map"]
+CHANNEL_MAP = GOLDEN["channel_map"]
+CASES = {case["name"]: case for case in GOLDEN["cases"]}
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_golden(name: str) -> None:
+    case = CASES[name]
+    # The golden output is still what the regex pipeline produces
+    assert regex_clean_text(case["text"], USER_MAP, CHANNEL_MAP) == case["expected"]
+    assert clean_text(case["text"], USER_MAP, CHANNEL_MAP) == case["expected"]
+    assert clean_text(case["text"]) == case["expected_without_maps"]
+    parts = parse_markup(case["text"])
+    assert render_markup(parts, USER_MAP, CHANNEL_MAP) == case["expected"]
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_collect_refs_matches_regex_scan(name: str) -> None:
+    text = CASES[name]["text"]
+    expected: tuple[set[str], set[str]] = (set(), set())
+    regex_collect_refs(text, *expected)
+    actual: tuple[set[str], set[str]] = (set(), set())
+    collect_refs(parse_markup(text), *actual)
+    assert actual == expected
@@ -0,0 +1,47 @@
+"""Tests for CuratedIndex: team member parsing and files that can't be read."""
+
+from pathlib import Path
+
+from curated_index import CuratedIndex
+
+
+def make_index(tmp_path: Path, files: dict[str, bytes]) -> CuratedIndex:
+    root = tmp_path / "Curated"
+    for rel, data in files.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_bytes(data)
+    return CuratedIndex(root, tmp_path / "index.json")
+
+
+def test_team_members_match_parse_team_members(tmp_path: Path) -> None:
+    index = make_index(tmp_path, {
+        "Teams/Plain.md": b"# Plain\n\n## Members\n- [[Ann]]\n- [[Bo|Bo B]]\n\n## Links\n- [[Other]]\n",
+        "Teams/Counted.md": b"## Members (2)\n- [[Ann#Lead]] and [[Bo]]\n",
+        "Teams/Split.md": b"## Members\n- [[Ann]]\n## Members (contractors)\n- [[Cy]]\n## Notes\n- [[Di]]\n",
+        "Teams/Empty.md": b"# No members section\n- [[Ann]]\n",
+    }).refresh()
+    assert index.team_members("Plain") == ["Ann", "Bo"]
+    assert index.team_members("Counted") == ["Ann#Lead"]
+    assert index.team_members("Split") == ["Ann", "Cy"]
+    assert index.team_members("Empty") == []
+    assert index.team_members("Missing") is None
+
+
+def test_refresh_skips_files_it_cannot_read(tmp_path: Path) -> None:
+    index = make_index(tmp_path, {
+        "Teams/T.md": b"## Members\n- [[Ann]]\n",
+        "People/Ann.md": b"---\ngithub: ann\n---\nCaf\xe9 \xff\n",
+        "People/Gone.md": b"Deleted between the scan and the read\n",
+    })
+    scan = index._scan
+
+    def scan_then_delete():
+        found = scan()
+        (index.root / "People" / "Gone.md").unlink()
+        return found
+
+    index._scan = scan_then_delete
+    index.refresh()
+    assert index.team_members("T") == ["Ann"]
+    assert index.person("Ann") == {"github": "ann"}
+    assert index.get("People/Gone.md") is None
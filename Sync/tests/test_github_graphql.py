@@ -0,0 +1,150 @@
+"""
+Tests for the GraphQL search backend against a local stub of GitHub's
+/graphql endpoint.
+
+The stub serves PR search results for a fixed set of authors, a page of
+SEARCH_PAGE_SIZE nodes at a time with hasNextPage/endCursor, and mixes in
+an empty node per page the way GitHub returns non-PR results. A query
+naming the "ghost" author gets a GraphQL error with search: null, as GitHub
+answers for a deleted account, and "down" anywhere in the query gets a 502.
+"""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import pytest
+
+import sync_github
+from utils import RateLimiter
+
+PAGE_SIZE = 3
+
+PRS = {
+    "alice": [7, 8, 9, 10, 11, 12, 13],
+    "bob": [20],
+    "carol": [],
+}
+
+
+def pr_node(author: str, number: int) -> dict[str, Any]:
+    return {
+        "number": number,
+        "title": f"PR {number}",
+        "url": f"https://github.com/acme/repo/pull/{number}",
+        "createdAt": "2024-05-01T09:00:00Z",
+        "mergedAt": "2024-05-02T09:00:00Z",
+        "additions": 1,
+        "deletions": 0,
+        "author": {"login": author.upper() if number % 2 else author},
+        "repository": {"nameWithOwner": "acme/repo"},
+        "labels": {"nodes": []},
+        "comments": {"totalCount": 0},
+        "reviews": {"totalCount": 0},
+    }
+
+
+class StubGraphQL(BaseHTTPRequestHandler):
+    queries: list[dict[str, Any]] = []
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        variables = body["variables"]
+        self.queries.append(variables)
+        query = variables["q"]
+        if "down" in query:
+            self.reply(502, {"message": "Bad gateway"})
+            return
+        rate_limit = {"cost": 1, "remaining": 4000, "resetAt": "2030-01-01T00:00:00Z"}
+        authors = re.findall(r"author:(\S+)", query)
+        if "ghost" in authors:
+            self.reply(200, {
+                "data": {"rateLimit": rate_limit, "search": None},
+                "errors": [{"message": "The listed users cannot be searched"}],
+            })
+            return
+        hits = [pr_node(a, n) for a in authors for n in PRS.get(a, [])]
+        start = int(variables["after"] or 0)
+        end = start + variables["first"]
+        nodes = hits[start:end]
+        if nodes:
+            nodes.insert(1, {})  # A non-PR result
+        self.reply(200, {"data": {
+            "rateLimit": rate_limit,
+            "search": {
+                "issueCount": len(hits),
+                "pageInfo": {"hasNextPage": end < len(hits), "endCursor": str(end)},
+                "nodes": nodes,
+            },
+        }})
+
+    def reply(self, status: int, payload: dict[str, Any]) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def stub(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[dict[str, Any]]]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGraphQL)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    monkeypatch.setattr(sync_github, "GITHUB_TOKEN", "ghp_test")
+    monkeypatch.setattr(sync_github, "GRAPHQL_URL", f"http://127.0.0.1:{server.server_port}/graphql")
+    monkeypatch.setattr(sync_github, "SEARCH_PAGE_SIZE", PAGE_SIZE)
+    monkeypatch.setattr(sync_github, "graphql_rate_limiter", RateLimiter(calls_per_second=1000, burst=1000))
+    monkeypatch.setattr(sync_github, "graphql_budget", sync_github.GraphQLBudget())
+    StubGraphQL.queries = []
+    yield StubGraphQL.queries
+    server.shutdown()
+    server.server_close()
+
+
+def test_search_pages_follow_cursors(stub: list[dict[str, Any]]) -> None:
+    pages = list(sync_github.graphql_search_pages("is:pr author:alice"))
+    assert [count for count, _ in pages] == [7, 7, 7]
+    assert [[node["number"] for node in nodes] for _, nodes in pages] == [
+        [7, 8, 9], [10, 11, 12], [13],
+    ]
+    assert [query["after"] for query in stub] == [None, "3", "6"]
+    assert sync_github.graphql_budget.requests == 3
+    assert sync_github.graphql_budget.cost == 3
+
+
+def test_search_pages_raise_on_graphql_error(stub: list[dict[str, Any]]) -> None:
+    with pytest.raises(sync_github.SearchFailed):
+        list(sync_github.graphql_search_pages("is:pr author:ghost"))
+
+
+def test_search_pages_raise_on_http_error(stub: list[dict[str, Any]]) -> None:
+    with pytest.raises(sync_github.SearchFailed):
+        list(sync_github.graphql_search_pages("is:pr author:down"))
+
+
+def test_fetch_merged_prs_fans_out_by_author(stub: list[dict[str, Any]]) -> None:
+    prs = sync_github.fetch_merged_prs(
+        "acme", ["alice", "bob", "carol"], "2024-05-01", backend="graphql"
+    )
+    assert {handle: [pr["number"] for pr in items] for handle, items in prs.items()} == {
+        "alice": [7, 8, 9, 10, 11, 12, 13],
+        "bob": [20],
+        "carol": [],
+    }
+    assert len(stub) == 3  # One search for the batch, three pages
+
+
+def test_fetch_merged_prs_splits_a_failed_batch(stub: list[dict[str, Any]]) -> None:
+    prs = sync_github.fetch_merged_prs(
+        "acme", ["alice", "bob", "ghost", "carol"], "2024-05-01", backend="graphql"
+    )
+    assert sorted(prs) == ["alice", "bob", "carol"]
+    assert [pr["number"] for pr in prs["alice"]] == [7, 8, 9, 10, 11, 12, 13]
+    assert [pr["number"] for pr in prs["bob"]] == [20]
@@ -0,0 +1,64 @@
+"""
+Round-trip tests for the JSON backends behind utils.json_loads/json_dumps.
+
+golden/json/ holds a Jira search page, a Slack conversations.history page
+and a GitHub search page, with non-ASCII text, emoji, escapes, control
+characters, nulls, floats and large ints. Every installed backend must
+decode them to the same data and encode that data to the same bytes as the
+standard library, in both the indented form save_json writes and the
+compact form, so switching backends never rewrites a file.
+"""
+
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import utils
+from utils import JSON_BACKENDS, json_dumps, json_loads, save_json, select_json_backend
+
+GOLDEN_DIR = Path(__file__).parent / "golden" / "json"
+PAYLOADS = sorted(path.stem for path in GOLDEN_DIR.glob("*.json"))
+INSTALLED = {"orjson": utils.orjson is not None, "msgspec": utils.msgspec is not None, "json": True}
+
+
+@pytest.fixture(params=JSON_BACKENDS)
+def backend(request: pytest.FixtureRequest) -> Iterator[str]:
+    if not INSTALLED[request.param]:
+        pytest.skip(f"{request.param} is not installed")
+    previous = utils._json_backend
+    assert select_json_backend(request.param) == request.param
+    yield request.param
+    utils._json_backend = previous
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_backend_matches_stdlib(backend: str, payload: str) -> None:
+    raw = (GOLDEN_DIR / f"{payload}.json").read_bytes()
+    data = json.loads(raw)
+    assert json_loads(raw) == data
+    assert json_loads(raw.decode("utf-8")) == data
+
+    pretty = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    compact = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    assert json_dumps(data) == pretty
+    assert json_dumps(data, compact=True) == compact
+    assert json_loads(json_dumps(data)) == data
+    assert json_loads(json_dumps(data, compact=True)) == data
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_save_json_output_is_the_same_for_every_backend(
+    backend: str, payload: str, tmp_path: Path
+) -> None:
+    raw = (GOLDEN_DIR / f"{payload}.json").read_bytes()
+    # The golden files were written by json.dump(indent=2, ensure_ascii=False)
+    assert save_json(json.loads(raw), tmp_path / "out.json")
+    assert (tmp_path / "out.json").read_bytes() == raw
+
+
+def test_unencodable_values_fall_back_to_stdlib(backend: str) -> None:
+    data = {"big": 2 ** 70, "nested": [{"n": -(2 ** 65)}]}
+    assert json_dumps(data) == json.dumps(data, indent=2).encode("utf-8")
+    assert json_loads(json_dumps(data, compact=True)) == data
@@ -0,0 +1,145 @@
+"""
+Tests for RateLimiter on a fake clock.
+
+The clock replaces utils.time: sleep() advances monotonic() and time()
+instead of blocking, and every sleep is recorded, so each test checks the
+exact delays wait() asks for.
+"""
+
+import pytest
+import requests
+
+import utils
+from utils import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.epoch = 1_700_000_000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.epoch + self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+    def take_sleeps(self) -> list[float]:
+        sleeps, self.sleeps = self.sleeps, []
+        return sleeps
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(utils, "time", fake)
+    return fake
+
+
+def response(status: int = 200, **headers: str) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers.update({name.replace("_", "-"): value for name, value in headers.items()})
+    return resp
+
+
+def test_burst_then_refill_rate(clock: FakeClock) -> None:
+    limiter = RateLimiter(calls_per_second=2.0, burst=5)
+    for _ in range(5):
+        limiter.wait()
+    assert clock.take_sleeps() == []  # The burst goes straight through
+    for _ in range(3):
+        limiter.wait()
+    assert clock.take_sleeps() == [0.5, 0.5, 0.5]  # Then one call per 1/rate
+
+    clock.now += 10  # Idle long enough to refill, but only up to the burst
+    for _ in range(6):
+        limiter.wait()
+    assert clock.take_sleeps() == [0.5]
+
+
+def test_burst_of_one_is_a_fixed_interval(clock: FakeClock) -> None:
+    limiter = RateLimiter(calls_per_second=4.0)
+    for _ in range(4):
+        limiter.wait()
+    assert clock.take_sleeps() == [0.25, 0.25, 0.25]
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_retry_after_defers_every_waiter(clock: FakeClock, status: int) -> None:
+    limiter = RateLimiter(calls_per_second=10.0, burst=3)
+    limiter.wait()
+    limiter.observe(response(status, Retry_After="30"))
+    limiter.wait()
+    assert clock.take_sleeps() == [30.0]
+    # Resumes with an empty bucket, not a fresh burst
+    limiter.wait()
+    limiter.wait()
+    assert clock.take_sleeps() == [0.1, 0.1]
+
+
+def test_retry_after_on_success_is_ignored(clock: FakeClock) -> None:
+    limiter = RateLimiter(calls_per_second=10.0, burst=3)
+    limiter.observe(response(200, Retry_After="30"))
+    limiter.wait()
+    assert clock.take_sleeps() == []
+
+
+def test_defer_keeps_a_later_slot(clock: FakeClock) -> None:
+    limiter = RateLimiter(calls_per_second=1.0)
+    limiter.defer(60)
+    limiter.defer(5)
+    limiter.wait()
+    assert clock.take_sleeps() == [60.0]
+
+
+def test_remaining_quota_is_spread_over_the_window(clock: FakeClock) -> None:
+    limiter = RateLimiter(calls_per_second=10.0)
+    reset = str(int(clock.time() + 60))
+    limiter.observe(response(X_RateLimit_Remaining="30", X_RateLimit_Reset=reset))
+    assert limiter.rate == pytest.approx(0.5)
+    limiter.wait()
+    limiter.wait()
+    assert clock.take_sleeps() == [2.0]
+
+
+def test_reset_accepts_iso_timestamps(clock: FakeClock) -> None:
+    limiter = RateLimiter(calls_per_second=10.0)
+    reset = utils.datetime.fromtimestamp(clock.time() + 100, utils.timezone.utc)
+    limiter.observe(response(X_RateLimit_Remaining="50",
+                             X_RateLimit_Reset=reset.isoformat().replace("+00:00", "Z")))
+    assert limiter.rate == pytest.approx(0.5)
+
+
+def test_exhausted_quota_pauses_until_reset(clock: FakeClock) -> None:
+    limiter = RateLimiter(calls_per_second=10.0)
+    limiter.wait()
+    limiter.observe(response(X_RateLimit_Remaining="0",
+                             X_RateLimit_Reset=str(int(clock.time() + 20))))
+    limiter.wait()
+    assert clock.take_sleeps() == [pytest.approx(20.0)]
+
+
+def test_near_limit_halves_and_recovery_restores_the_rate(clock: FakeClock) -> None:
+    limiter = RateLimiter(calls_per_second=8.0)
+    limiter.observe(response(X_RateLimit_NearLimit="true"))
+    limiter.observe(response(X_RateLimit_NearLimit="true"))
+    assert limiter.rate == 2.0
+    rates = []
+    for _ in range(8):
+        limiter.observe(response())
+        rates.append(limiter.rate)
+    assert rates[:3] == [2.5, 3.125, 3.90625]
+    assert rates[-1] == 8.0  # Capped at calls_per_second
+
+
+def test_rate_is_clamped_to_one_percent(clock: FakeClock) -> None:
+    limiter = RateLimiter(calls_per_second=10.0)
+    limiter.observe(response(X_RateLimit_Remaining="1",
+                             X_RateLimit_Reset=str(int(clock.time() + 3600))))
+    assert limiter.rate == pytest.approx(0.1)
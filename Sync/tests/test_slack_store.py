@@ -0,0 +1,52 @@
+"""Tests for SlackMessageStore recovering from a run that stopped before save_index()."""
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+from slack_store import SlackMessageStore, ts_day
+
+DAY_1 = datetime(2024, 5, 1, 9, tzinfo=timezone.utc).timestamp()
+DAY_2 = datetime(2024, 5, 2, 9, tzinfo=timezone.utc).timestamp()
+
+
+def message(unix: float, text: str) -> dict:
+    return {"ts": f"{unix:.6f}", "text": text, "replies": []}
+
+
+def window_texts(store: SlackMessageStore) -> list[str]:
+    return [msg["text"] for msg in store.iter_window(DAY_1 - 1)]
+
+
+def test_segment_appended_without_saving_the_index_is_read_back(tmp_path: Path) -> None:
+    store = SlackMessageStore(tmp_path, "general", "C1")
+    store.merge([message(DAY_1, "one")])
+    store.save_index()
+    # Appended to a new day, then the run stopped before save_index()
+    store.merge([message(DAY_2, "two"), message(DAY_2 + 60, "three")])
+
+    store = SlackMessageStore(tmp_path, "general", "C1")
+    assert window_texts(store) == ["one", "two", "three"]
+    # The next run re-fetches the same, unchanged messages
+    assert store.merge([message(DAY_2, "two"), message(DAY_2 + 60, "three")]) == (0, 0)
+    store.save_index()
+
+    day = store.index["days"][ts_day(f"{DAY_2:.6f}")]
+    assert (day["messages"], day["lines"]) == (2, 2)
+    assert day["first_ts"] == f"{DAY_2:.6f}"
+    assert day["last_ts"] == f"{DAY_2 + 60:.6f}"
+    assert store.index["total_messages"] == 3
+
+
+def test_stale_index_entry_is_refreshed_by_an_unchanged_merge(tmp_path: Path) -> None:
+    store = SlackMessageStore(tmp_path, "general", "C1")
+    store.merge([message(DAY_1, "one")])
+    store.save_index()
+    store.merge([message(DAY_1 + 60, "two")])  # Not followed by save_index()
+
+    store = SlackMessageStore(tmp_path, "general", "C1")
+    assert store.merge([message(DAY_1 + 60, "two")]) == (0, 0)
+    store.save_index()
+    day = store.index["days"][ts_day(f"{DAY_1:.6f}")]
+    assert day["messages"] == 2
+    assert day["last_ts"] == f"{DAY_1 + 60:.6f}"
+    assert window_texts(store) == ["one", "two"]
@@ -2,21 +2,43 @@
 Shared utilities for AI-Context sync scripts.
 
 Provides:
-- Rate limiting for API calls
+- Pooled keep-alive HTTP sessions shared by all sync scripts
+- Async request engine with per-host concurrency limits
+- Token-bucket rate limiting that adapts to rate-limit headers
 - Retry decorator for transient failures
 - ISO timestamp utilities
 - Config file management
+- Atomic skip-if-unchanged file writes with optional batched fsync
+- JSON encoding/decoding through the fastest installed backend
 """
 
+import asyncio
+import contextvars
 import functools
 import json
+import os
+import re
 import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Any, Callable, TypeVar
+from typing import Any, Callable, Coroutine, Iterable, Iterator, TypeVar
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+
+# Optional fast JSON backends (pip install orjson); stdlib json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
 T = TypeVar("T")
 
@@ -29,59 +51,499 @@ JIRA_DIR = DATA_DIR / "Jira"
 GITHUB_DIR = DATA_DIR / "GitHub"
 CURATED_DIR = SYNC_DIR.parent / "Curated-Context"
 
+# Jira issue keys as they appear in PR titles, messages and notes
+JIRA_KEY_RE = re.compile(r"[A-Z][A-Z0-9]+-\d+")
+
+
+# HTTP defaults; override with the "http" section of config.json
+HTTP_DEFAULTS: dict[str, Any] = {
+    "timeout": 30,      # seconds, applied to every request without its own
+    "pool_size": 20,    # keep-alive connections per host
+    "gzip": True,       # negotiate compressed responses
+}
+
+_sessions: dict[str, "HTTPSession"] = {}
+_sessions_lock = threading.Lock()
+
+# Set by shared_config(); serialises config.json writes from concurrent syncs
+_shared_config: dict[str, Any] | None = None
+_config_lock = threading.Lock()
+
+# Fastest installed JSON backend until configure_storage() says otherwise
+_json_backend = "orjson" if orjson else "msgspec" if msgspec else "json"
+_json_encode_errors: tuple[type[Exception], ...] = (TypeError, ValueError, OverflowError)
+if msgspec:
+    _json_encode_errors += (msgspec.EncodeError,)
+
+# Output file settings; override with the "storage" section of config.json
+STORAGE_DEFAULTS: dict[str, Any] = {
+    "fsync": "off",         # "off", "batch" (once per run, see batched_fsync) or "each"
+    "json_backend": "auto", # "auto" (fastest installed), "orjson", "msgspec" or "json"
+    "compact": False,       # write machine-only files (issues/*.json, ...) unindented
+}
+
+JSON_BACKENDS = ["orjson", "msgspec", "json"]
+
 
 def iso_now() -> str:
     """Return current UTC time as ISO 8601 string with Z suffix."""
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
+def select_json_backend(name: str = "auto") -> str:
+    """
+    Pick the JSON backend used by json_loads/json_dumps and return its name.
+
+    "auto" takes the first installed of JSON_BACKENDS. A named backend that
+    isn't installed falls back to the stdlib with a warning.
+    """
+    installed = {"orjson": orjson is not None, "msgspec": msgspec is not None, "json": True}
+    if name == "auto":
+        name = next(b for b in JSON_BACKENDS if installed[b])
+    elif not installed.get(name):
+        print(f"WARNING: JSON backend '{name}' not available, using json")
+        name = "json"
+    global _json_backend
+    _json_backend = name
+    return name
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Decode JSON with the selected backend."""
+    if _json_backend == "orjson":
+        return orjson.loads(data)
+    if _json_backend == "msgspec":
+        return msgspec.json.decode(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any, compact: bool = False) -> bytes:
+    """
+    Encode JSON as UTF-8 with the selected backend.
+
+    The default pretty form is byte-identical across backends (two-space
+    indent, non-ASCII kept as is) for the data the syncs write; the fast
+    backends spell exponent floats (1e16) differently from json (1e+16).
+    compact drops the indentation and spaces.
+    """
+    try:
+        if _json_backend == "orjson":
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | (0 if compact else orjson.OPT_INDENT_2))
+        if _json_backend == "msgspec":
+            encoded = msgspec.json.encode(data)
+            return encoded if compact else msgspec.json.format(encoded, indent=2)
+    except _json_encode_errors:
+        pass  # e.g. ints beyond 64 bits: let json handle it
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def response_json(response: requests.Response) -> Any:
+    """Decode an HTTP response body with the selected backend (instead of response.json())."""
+    return json_loads(response.content)
+
+
+def load_json(path: Path) -> Any:
+    """Read and decode a JSON file with the selected backend."""
+    return json_loads(path.read_bytes())
+
+
 def load_config() -> dict[str, Any]:
-    """Load config from config.json, or return empty dict if missing."""
+    """
+    Load config from config.json, or return empty dict if missing.
+
+    Inside shared_config(), every call returns the same dict instead.
+    """
+    if _shared_config is not None:
+        return _shared_config
     if CONFIG_FILE.exists():
-        with open(CONFIG_FILE, encoding="utf-8") as f:
-            return json.load(f)
+        return load_json(CONFIG_FILE)
     return {}
 
 
 def save_config(config: dict[str, Any]) -> None:
-    """Save config to config.json with consistent formatting."""
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=2)
-        f.write("\n")
+    """
+    Save config to config.json with consistent formatting.
+
+    Written atomically (see write_if_changed), so a crash mid-write never
+    leaves a truncated config (and lost checkpoints) behind.
+    """
+    with _config_lock:
+        write_if_changed(CONFIG_FILE, (json.dumps(config, indent=2) + "\n").encode("utf-8"))
+
+
+@contextmanager
+def shared_config() -> Iterator[dict[str, Any]]:
+    """
+    Load config.json once for every sync run inside the block (run_daily.py).
+
+    Each sync updates only its own section of the shared dict, so syncs
+    running concurrently in one process never save over each other's
+    changes with a stale copy.
+    """
+    global _shared_config
+    _shared_config = load_config()
+    try:
+        yield _shared_config
+    finally:
+        _shared_config = None
+
+
+class WriteStats:
+    """Files written vs. left untouched by write_if_changed."""
+
+    def __init__(self):
+        self.written = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def report(self) -> str:
+        return f"Files: {self.written} written, {self.skipped} unchanged"
+
+
+# Counts for the running sync. run_daily runs the syncs concurrently in one
+# process, so each step swaps in its own with track_writes(); the ContextVar
+# follows it into the async engine's worker threads.
+_write_stats: contextvars.ContextVar[WriteStats] = contextvars.ContextVar(
+    "write_stats", default=WriteStats())
+
+# Files written inside batched_fsync(), by every sync in the process
+_fsync_pending: list[Path] | None = None
+_fsync_lock = threading.Lock()
+
+
+def write_stats() -> WriteStats:
+    """The write counts of the current sync."""
+    return _write_stats.get()
+
+
+def track_writes() -> WriteStats:
+    """Count writes made from here on in this context separately; returns the new counts."""
+    stats = WriteStats()
+    _write_stats.set(stats)
+    return stats
+
+
+def configure_storage(storage_config: dict[str, Any] | None) -> None:
+    """Apply the config.json "storage" section."""
+    STORAGE_DEFAULTS.update(storage_config or {})
+    select_json_backend(STORAGE_DEFAULTS["json_backend"])
+
+
+def write_if_changed(path: Path, content: bytes) -> bool:
+    """
+    Replace path with content, unless it already holds exactly that.
+
+    Identical files are left untouched (mtime included), so the vault
+    index and the nightly git backup only see real changes. Writes go to a
+    temp file that is renamed over the target, so readers never see a
+    half-written file. Returns True if the file was written.
+    """
+    try:
+        # Size first: most changed files differ in length, no read needed
+        if path.stat().st_size == len(content) and path.read_bytes() == content:
+            stats = write_stats()
+            with stats._lock:
+                stats.skipped += 1
+            return False
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
 
+    tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+        if STORAGE_DEFAULTS["fsync"] == "each":
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
 
-def save_json(data: dict[str, Any], path: Path) -> None:
-    """Save data to JSON file, creating parent directories if needed."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+    stats = write_stats()
+    with stats._lock:
+        stats.written += 1
+    with _fsync_lock:
+        if _fsync_pending is not None:
+            _fsync_pending.append(path)
+    return True
+
+
+@contextmanager
+def batched_fsync() -> Iterator[None]:
+    """
+    Collect the files written inside the block and, if storage.fsync is
+    "batch", fsync them all once at the end (then their directories, so
+    the renames are durable too) instead of paying for a flush per file.
+    """
+    global _fsync_pending
+    with _fsync_lock:
+        _fsync_pending = []
+    try:
+        yield
+    finally:
+        with _fsync_lock:
+            pending, _fsync_pending = _fsync_pending, None
+        if STORAGE_DEFAULTS["fsync"] == "batch":
+            for path in pending:
+                with open(path, "rb") as f:
+                    os.fsync(f.fileno())
+            for directory in {path.parent for path in pending}:
+                fd = os.open(directory, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+
+
+def save_json(data: dict[str, Any], path: Path, machine: bool = False) -> bool:
+    """
+    Save data to JSON file, creating parent directories if needed.
+
+    Serialized once and written with write_if_changed; returns True if
+    the file changed. machine marks files only the scripts read, which
+    are written compact when storage.compact is set.
+    """
+    compact = machine and STORAGE_DEFAULTS["compact"]
+    return write_if_changed(path, json_dumps(data, compact=compact) + b"\n")
+
+
+def save_text(text: str, path: Path) -> bool:
+    """Save a text file (e.g. INDEX.md) with write_if_changed; returns True if it changed."""
+    return write_if_changed(path, text.encode("utf-8"))
+
+
+class HTTPSession(requests.Session):
+    """
+    requests.Session with a default timeout and a sized connection pool.
+
+    Reusing one session per host keeps TCP+TLS connections alive across
+    calls, and auth/headers are set once instead of rebuilt per request.
+    """
+
+    def __init__(self, timeout: float, pool_size: int, gzip: bool = True):
+        super().__init__()
+        self.timeout = timeout
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.headers["Accept-Encoding"] = "gzip, deflate" if gzip else "identity"
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def configure_http(http_config: dict[str, Any] | None) -> None:
+    """Apply the config.json "http" section to sessions created afterwards."""
+    HTTP_DEFAULTS.update(http_config or {})
+
+
+def get_session(
+    base_url: str,
+    auth: tuple[str, str] | None = None,
+    headers: dict[str, str] | None = None,
+    cookies: dict[str, str] | None = None,
+) -> HTTPSession:
+    """
+    Return the shared session for base_url's host, creating it on first use.
+
+    auth, headers and cookies are applied only when the session is created.
+    """
+    host = urlsplit(base_url).netloc
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = HTTPSession(
+                timeout=HTTP_DEFAULTS["timeout"],
+                pool_size=HTTP_DEFAULTS["pool_size"],
+                gzip=HTTP_DEFAULTS["gzip"],
+            )
+            session.auth = auth
+            session.headers.update(headers or {})
+            for name, value in (cookies or {}).items():
+                session.cookies.set(name, value)
+            _sessions[host] = session
+        return session
+
+
+class AsyncEngine:
+    """
+    Overlap blocking API calls on an asyncio loop, bounded per host.
+
+    Each call runs the existing synchronous function (jira_get, slack_api,
+    ...) in a worker thread, so its RateLimiter, with_retry and
+    pooled session behave exactly as in a sequential run; the engine only
+    decides how many are in flight per host. If any call raises, calls that
+    haven't started are cancelled and the error propagates.
+
+    Usage:
+        engine = AsyncEngine(default_limit=4)
+        issues = engine.map(JIRA_BASE_URL, fetch_issue, keys)
+    """
+
+    def __init__(self, limits: dict[str, int] | None = None,
+                 default_limit: int = 4):
+        self.limits = {self._host(h): n for h, n in (limits or {}).items()}
+        self.default_limit = default_limit
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    @staticmethod
+    def _host(base_url: str) -> str:
+        return urlsplit(base_url).netloc or base_url
+
+    def _semaphore(self, base_url: str) -> asyncio.Semaphore:
+        host = self._host(base_url)
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(
+                self.limits.get(host, self.default_limit))
+        return self._semaphores[host]
+
+    async def call(self, base_url: str, func: Callable[..., T],
+                   *args: Any, **kwargs: Any) -> T:
+        """Run func(*args, **kwargs) in a thread once base_url's host has a free slot."""
+        async with self._semaphore(base_url):
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def gather(self, base_url: str, func: Callable[..., T],
+                     items: Iterable[Any]) -> list[T]:
+        """Call func(item) for every item; results keep the input order."""
+        tasks = [asyncio.ensure_future(self.call(base_url, func, item))
+                 for item in items]
+        if not tasks:
+            return []
+        try:
+            done, pending = await asyncio.wait(
+                tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()  # type: ignore[misc]
+            return [task.result() for task in tasks]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Synchronous entry point: run a coroutine using this engine on a fresh event loop."""
+        # Semaphores belong to the loop they were first used on
+        self._semaphores.clear()
+        return asyncio.run(coro)
+
+    def map(self, base_url: str, func: Callable[..., T],
+            items: Iterable[Any]) -> list[T]:
+        """Call func(item) for every item concurrently and return the results in order."""
+        return self.run(self.gather(base_url, func, items))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def parse_reset_time(value: str | None) -> float | None:
+    """Parse an X-RateLimit-Reset header (epoch seconds or ISO 8601) into epoch seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
 
 
 class RateLimiter:
     """
-    Thread-safe rate limiter using minimum interval between calls.
-    
+    Thread-safe token-bucket rate limiter that adapts to server signals.
+
+    Tokens refill at `calls_per_second` up to `burst`, so short bursts go
+    through immediately and sustained load settles at the refill rate
+    (burst=1 gives the classic fixed minimum interval). wait() reserves a
+    slot under the lock and sleeps outside it, so concurrent workers queue
+    without serialising on each other's sleeps.
+
+    observe() feeds response headers back in: Retry-After pauses every
+    waiter, and X-RateLimit-Remaining/Reset (GitHub, Jira) or
+    X-RateLimit-NearLimit (Jira) slow the refill rate to what the server
+    says is left, recovering towards `calls_per_second` as headroom returns.
+
     Usage:
-        limiter = RateLimiter(calls_per_second=1.0)
+        limiter = RateLimiter(calls_per_second=1.0, burst=5)
         for item in items:
             limiter.wait()
-            make_api_call(item)
+            response = make_api_call(item)
+            limiter.observe(response)
     """
 
-    def __init__(self, calls_per_second: float = 1.0):
-        self.min_interval = 1.0 / calls_per_second
-        self.last_call = 0.0
+    def __init__(self, calls_per_second: float = 1.0, burst: float = 1.0):
+        self.base_rate = calls_per_second
+        self.rate = calls_per_second
+        self.burst = max(burst, 1.0)
+        # Theoretical arrival time of the next token (GCRA formulation)
+        self._next_at = 0.0
         self._lock = threading.Lock()
 
     def wait(self) -> None:
-        """Wait if necessary to respect rate limit."""
+        """Wait if necessary to respect rate limit, then consume a token."""
         with self._lock:
-            now = time.time()
-            elapsed = now - self.last_call
-            if elapsed < self.min_interval:
-                time.sleep(self.min_interval - elapsed)
-            self.last_call = time.time()
+            interval = 1.0 / self.rate
+            now = time.monotonic()
+            next_at = max(self._next_at, now)
+            start_at = next_at - (self.burst - 1.0) * interval
+            self._next_at = next_at + interval
+        delay = start_at - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def defer(self, seconds: float) -> None:
+        """Hand out no tokens for `seconds` (e.g. from a Retry-After header)."""
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            # Resume with an empty bucket rather than a full burst
+            self._next_at = max(self._next_at,
+                                resume_at + (self.burst - 1.0) / self.rate)
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate, clamped to 1%..100% of calls_per_second."""
+        with self._lock:
+            self.rate = min(self.base_rate, max(rate, self.base_rate / 100))
+
+    def observe(self, response: requests.Response) -> None:
+        """Adapt to the rate-limit headers on a response."""
+        headers = response.headers
+
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None and response.status_code in (429, 503):
+            self.defer(retry_after)
+            return
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_at = parse_reset_time(headers.get("X-RateLimit-Reset"))
+        if remaining is not None and reset_at is not None:
+            try:
+                left = float(remaining)
+            except ValueError:
+                return
+            window = max(reset_at - time.time(), 1.0)
+            if left <= 0:
+                self.defer(window)
+            else:
+                # Spread what's left over the rest of the window
+                self.set_rate(left / window)
+        elif headers.get("X-RateLimit-NearLimit", "").lower() == "true":
+            self.set_rate(self.rate / 2)
+        elif self.rate < self.base_rate:
+            self.set_rate(self.rate * 1.25)
 
 
 def with_retry(
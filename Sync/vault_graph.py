@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Wikilink graph of the vault (Curated-Context, Memory and Raw-Materials).
+
+Every file under those directories is a node; every [[wikilink]] in a
+markdown file is an edge. The graph is kept in a SQLite index,
+Synced-Data/_vault_graph.db, so backlinks and neighbourhoods are indexed
+lookups instead of a re-read of every note:
+
+    notes   path (relative to the repo root), name key, mtime, size and
+            content hash of each file
+    links   one row per distinct target per source note, with its count
+
+refresh() stats every file and re-reads only those whose mtime or size
+changed; a file whose content hash is unchanged (touched, or restored
+from git) keeps its links without being re-parsed. Deleted files are
+dropped with their links.
+
+Links resolve the way Obsidian resolves them: by file name, ignoring case,
+any folder prefix, the alias (`|Alias`) and the heading or block
+(`#Heading`). Markdown notes are named without their .md extension,
+attachments with it. If several files share a name, the one with the
+shortest path wins. Links inside code spans and fenced code blocks are
+ignored. Targets with no file are reported by `unresolved`, which is the
+list of stubs still to create (see Guidelines/wikilink-guidelines.md).
+
+Usage:
+    python vault_graph.py refresh
+    python vault_graph.py backlinks NOTE
+    python vault_graph.py links NOTE
+    python vault_graph.py neighbours NOTE [--depth N]
+    python vault_graph.py unresolved [--limit N]
+
+NOTE is a note name ("Admiral Piett") or a path relative to the repo root.
+Queries refresh the index first; pass --no-refresh to skip that. Add
+--json to print results as JSON.
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from utils import DATA_DIR, SYNC_DIR, json_dumps
+
+VAULT_ROOT = SYNC_DIR.parent
+VAULT_DIRS = ["Curated-Context", "Memory", "Raw-Materials"]
+GRAPH_FILE = DATA_DIR / "_vault_graph.db"
+
+# Bump when the schema or link parsing changes, to force a full rebuild
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE notes (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    name_key TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT
+);
+CREATE INDEX idx_notes_name ON notes(name_key);
+
+CREATE TABLE links (
+    source_id INTEGER NOT NULL,
+    target TEXT NOT NULL,
+    target_key TEXT NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE INDEX idx_links_source ON links(source_id);
+CREATE INDEX idx_links_target ON links(target_key);
+"""
+
+# [[Target]], [[Target|Alias]], [[Target#Heading]], ![[embed.png]]
+WIKILINK_RE = re.compile(r"\[\[([^\]|#^]*)")
+CODE_RE = re.compile(r"```.*?```|`[^`\n]*`", re.DOTALL)
+
+# First note with a given name key, as Obsidian picks it
+CANONICAL_SQL = "SELECT path FROM notes WHERE name_key = ? ORDER BY length(path), path LIMIT 1"
+
+
+def name_key(name: str) -> str:
+    """Resolution key of a link target or file name: basename, lowercased, without .md."""
+    name = name.strip().rsplit("/", 1)[-1]
+    if name.lower().endswith(".md"):
+        name = name[:-3]
+    return name.lower()
+
+
+def file_key(path: str) -> str:
+    """Name key a file is linked by: notes without .md, attachments with their extension."""
+    return name_key(path) if path.endswith(".md") else path.rsplit("/", 1)[-1].lower()
+
+
+def parse_links(text: str) -> dict[str, tuple[str, int]]:
+    """Map each linked name key to (target as first written, link count); code is ignored."""
+    links: dict[str, tuple[str, int]] = {}
+    for target in WIKILINK_RE.findall(CODE_RE.sub("", text)):
+        target = target.strip()
+        if target:
+            key = name_key(target)
+            first, count = links.get(key, (target, 0))
+            links[key] = (first, count + 1)
+    return links
+
+
+class VaultGraph:
+    """Incrementally maintained wikilink graph over the vault directories."""
+
+    def __init__(self, path: Path | None = None, root: Path | None = None,
+                 dirs: list[str] | None = None):
+        self.path = path or GRAPH_FILE
+        self.root = root or VAULT_ROOT
+        self.dirs = dirs or VAULT_DIRS
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            with self.conn:
+                self.conn.execute("DROP TABLE IF EXISTS notes")
+                self.conn.execute("DROP TABLE IF EXISTS links")
+                self.conn.executescript(SCHEMA)
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.parsed = self.unchanged = self.removed = 0
+
+    def _scan(self) -> dict[str, os.stat_result]:
+        """Stat every file under the vault directories, skipping hidden ones."""
+        found: dict[str, os.stat_result] = {}
+        prefix = len(str(self.root)) + 1
+        stack = [str(self.root / d) for d in self.dirs]
+        while stack:
+            directory = stack.pop()
+            try:
+                listing = os.scandir(directory)
+            except FileNotFoundError:
+                continue
+            with listing:
+                for entry in listing:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                    else:
+                        found[entry.path[prefix:].replace(os.sep, "/")] = entry.stat()
+        return found
+
+    def refresh(self) -> "VaultGraph":
+        """Bring the index in line with the files on disk, re-parsing only changed notes."""
+        found = self._scan()
+        known = {row[0]: row[1:] for row in self.conn.execute(
+            "SELECT path, id, mtime_ns, size, hash FROM notes")}
+        with self.conn:
+            for path in known.keys() - found.keys():
+                note_id = known[path][0]
+                self.conn.execute("DELETE FROM links WHERE source_id = ?", (note_id,))
+                self.conn.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+                self.removed += 1
+            for path, stat in found.items():
+                previous = known.get(path)
+                if previous and previous[1] == stat.st_mtime_ns and previous[2] == stat.st_size:
+                    continue
+                self._update(path, stat, previous)
+        return self
+
+    def _update(self, path: str, stat: os.stat_result, previous: tuple | None) -> None:
+        """Record a new or changed file, re-parsing its links if its content changed."""
+        is_note = path.endswith(".md")
+        content_hash = None
+        links: dict[str, tuple[str, int]] = {}
+        if is_note:
+            data = (self.root / path).read_bytes()
+            content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+            if previous and previous[3] == content_hash:
+                self.conn.execute("UPDATE notes SET mtime_ns = ?, size = ? WHERE id = ?",
+                                  (stat.st_mtime_ns, stat.st_size, previous[0]))
+                self.unchanged += 1
+                return
+            links = parse_links(data.decode("utf-8", errors="replace"))
+        if previous:
+            note_id = previous[0]
+            self.conn.execute("UPDATE notes SET mtime_ns = ?, size = ?, hash = ? WHERE id = ?",
+                              (stat.st_mtime_ns, stat.st_size, content_hash, note_id))
+            self.conn.execute("DELETE FROM links WHERE source_id = ?", (note_id,))
+        else:
+            note_id = self.conn.execute(
+                "INSERT INTO notes (path, name_key, mtime_ns, size, hash) VALUES (?, ?, ?, ?, ?)",
+                (path, file_key(path), stat.st_mtime_ns, stat.st_size, content_hash)).lastrowid
+        self.conn.executemany("INSERT INTO links VALUES (?, ?, ?, ?)", [
+            (note_id, target, key, count) for key, (target, count) in links.items()
+        ])
+        if is_note:
+            self.parsed += 1
+
+    def close(self) -> None:
+        """Close the database."""
+        self.conn.close()
+
+    def resolve(self, name: str) -> str | None:
+        """Return the path a note name (or a path) refers to, or None."""
+        if self.conn.execute("SELECT 1 FROM notes WHERE path = ?", (name,)).fetchone():
+            return name
+        row = self.conn.execute(CANONICAL_SQL, (name_key(name),)).fetchone()
+        return row[0] if row else None
+
+    def backlinks(self, path: str) -> list[dict[str, Any]]:
+        """Notes linking to path, with how many times each links to it."""
+        key = file_key(path)
+        if self.conn.execute(CANONICAL_SQL, (key,)).fetchone() != (path,):
+            return []  # Shadowed by a same-named file with a shorter path
+        rows = self.conn.execute("""
+            SELECT n.path, l.count FROM links l JOIN notes n ON n.id = l.source_id
+            WHERE l.target_key = ? ORDER BY n.path
+        """, (key,))
+        return [{"path": p, "count": c} for p, c in rows]
+
+    def links(self, path: str) -> list[dict[str, Any]]:
+        """Links out of path: target as written, count, and the resolved path (None if unresolved)."""
+        rows = self.conn.execute(f"""
+            SELECT l.target, l.count, ({CANONICAL_SQL.replace('?', 'l.target_key')})
+            FROM links l JOIN notes n ON n.id = l.source_id
+            WHERE n.path = ? ORDER BY l.target
+        """, (path,))
+        return [{"target": t, "count": c, "path": p} for t, c, p in rows]
+
+    def neighbours(self, path: str, depth: int = 1) -> dict[str, int]:
+        """Notes within depth links of path in either direction, mapped to their distance."""
+        distances = {path: 0}
+        frontier = [path]
+        for distance in range(1, depth + 1):
+            next_frontier = []
+            for node in frontier:
+                adjacent = [l["path"] for l in self.links(node) if l["path"]]
+                adjacent += [b["path"] for b in self.backlinks(node)]
+                for other in adjacent:
+                    if other not in distances:
+                        distances[other] = distance
+                        next_frontier.append(other)
+            frontier = next_frontier
+        return distances
+
+    def unresolved(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Link targets with no file, most linked first, with the notes linking to them."""
+        sql = """
+            SELECT MIN(l.target), SUM(l.count), GROUP_CONCAT(n.path, '\n')
+            FROM links l JOIN notes n ON n.id = l.source_id
+            WHERE NOT EXISTS (SELECT 1 FROM notes WHERE name_key = l.target_key)
+            GROUP BY l.target_key ORDER BY SUM(l.count) DESC, MIN(l.target)
+        """
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [{"target": t, "count": c, "sources": sorted(s.split("\n"))}
+                for t, c, s in self.conn.execute(sql)]
+
+    def report(self) -> str:
+        """Summarise the index and what refresh() did."""
+        notes = self.conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+        links = self.conn.execute("SELECT COALESCE(SUM(count), 0) FROM links").fetchone()[0]
+        return (f"Vault graph: {notes} files, {links} links "
+                f"({self.parsed} parsed, {self.unchanged} unchanged, {self.removed} removed)")
+
+
+def main() -> None:
+    """Query the vault's wikilink graph."""
+    parser = argparse.ArgumentParser(description="Query the vault wikilink graph")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--no-refresh", action="store_true",
+                        help="Query the index as it is, without checking for changed files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("refresh", help="Update the index from changed files")
+    for name, help_text in (("backlinks", "Notes linking to NOTE"),
+                            ("links", "Links out of NOTE")):
+        commands.add_parser(name, help=help_text).add_argument("note")
+    neighbours = commands.add_parser("neighbours", help="Notes within N links of NOTE")
+    neighbours.add_argument("note")
+    neighbours.add_argument("--depth", type=int, default=1)
+    unresolved = commands.add_parser("unresolved", help="Link targets with no file (stubs to create)")
+    unresolved.add_argument("--limit", type=int)
+    args = parser.parse_args()
+
+    graph = VaultGraph()
+    if args.command == "refresh" or not args.no_refresh:
+        started = time.perf_counter()
+        graph.refresh()
+        print(f"{graph.report()} in {(time.perf_counter() - started) * 1000:.0f}ms",
+              file=sys.stderr)
+    if args.command == "refresh":
+        return
+
+    started = time.perf_counter()
+    if args.command == "unresolved":
+        result: Any = graph.unresolved(args.limit)
+    else:
+        path = graph.resolve(args.note)
+        if path is None:
+            print(f"ERROR: No file named '{args.note}' in {', '.join(VAULT_DIRS)}", file=sys.stderr)
+            sys.exit(1)
+        if args.command == "backlinks":
+            result = graph.backlinks(path)
+        elif args.command == "links":
+            result = graph.links(path)
+        else:
+            result = [{"path": p, "distance": d}
+                      for p, d in sorted(graph.neighbours(path, args.depth).items(),
+                                         key=lambda item: (item[1], item[0]))]
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    graph.close()
+
+    if args.json:
+        sys.stdout.write(json_dumps(result).decode() + "\n")
+        return
+    for row in result:
+        if args.command == "unresolved":
+            print(f"{row['target']} ({row['count']} links from {len(row['sources'])} notes)")
+        elif args.command == "links":
+            print(f"{row['target']} -> {row['path'] or '(unresolved)'}"
+                  + (f" x{row['count']}" if row["count"] > 1 else ""))
+        elif args.command == "backlinks":
+            print(row["path"] + (f" x{row['count']}" if row["count"] > 1 else ""))
+        else:
+            print(f"{row['distance']}  {row['path']}")
+    print(f"\n{len(result)} results ({elapsed_ms:.1f}ms)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()